@@ -39,6 +39,9 @@ sys.modules["ait"].DEFAULT_CMD_TOPIC = "__commands__"  # type: ignore[attr-defin
 # Name of the ZMQ topic / stream used for making telemetry packets available to the script API
 sys.modules["ait"].DEFAULT_TLM_TOPIC = "__tlmpkts__"  # type: ignore[attr-defined]
 
+# Name of the ZMQ topic on which the server publishes its stats, if enabled
+sys.modules["ait"].DEFAULT_STATS_TOPIC = "__stats__"  # type: ignore[attr-defined]
+
 # Number of seconds to sleep after ZmqSocket.connect() call, affects clients
 sys.modules["ait"].DEFAULT_CMD_ZMQ_SLEEP = 1  # type: ignore[attr-defined]
 
@@ -584,35 +584,41 @@ class TlmMonitor(gevent.Greenlet):
             while True:
                 gevent.sleep(0)
                 msg = self._sub.recv_multipart()
-                topic, message = serv_utils.decode_message(msg)
-                message = pickle.loads(message)
+                topic, messages = serv_utils.decode_messages(msg)
 
-                if topic is None or message is None:
+                if topic is None or messages is None:
                     log.error(f"{self} received invalid topic or message. Skipping")
                     continue
 
-                if not isinstance(message, tuple):
-                    log.error(
-                        "TlmMonitor received message that it is unable to process "
-                        "Messages must be tagged packet data tuples (uid, data)."
-                    )
-                    continue
-
-                if message[0] not in self._defns:
-                    log.error(f"Skipping packet with id {message[0]}")
-                    continue
-
-                pkt = tlm.Packet(defn=self._defns[message[0]], data=message[1])
-
-                pkt_name = pkt._defn.name
-                if pkt_name in self._pktbufs:
-                    self._pktbufs[pkt_name].appendleft(pkt)
+                for message in messages:
+                    self._process(message)
 
         except Exception as e:
             log.error("Exception raised in TlmMonitor while receiving messages")
             log.error(f"API telemetry is no longer being received from server. {e}")
             raise e
 
+    def _process(self, message):
+        if isinstance(message, bytes):
+            message = pickle.loads(message)
+
+        if not isinstance(message, tuple):
+            log.error(
+                "TlmMonitor received message that it is unable to process "
+                "Messages must be tagged packet data tuples (uid, data)."
+            )
+            return
+
+        if message[0] not in self._defns:
+            log.error(f"Skipping packet with id {message[0]}")
+            return
+
+        pkt = tlm.Packet(defn=self._defns[message[0]], data=message[1])
+
+        pkt_name = pkt._defn.name
+        if pkt_name in self._pktbufs:
+            self._pktbufs[pkt_name].appendleft(pkt)
+
 
 class Instrument(object):
     def __init__(self, cmdport=None, packets=None):
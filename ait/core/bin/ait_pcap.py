@@ -41,6 +41,22 @@ def main():
                 "appended to the name."
             ),
         },
+        "--merge": {
+            "action": "store_true",
+            "help": (
+                "Creates a new file (see --output) containing the "
+                "packets of the given pcap files merged in timestamp "
+                "order."
+            ),
+        },
+        "--dedupe": {
+            "type": float,
+            "default": None,
+            "help": (
+                "With --merge, drop packets whose payload duplicates "
+                "that of a packet up to this many seconds earlier"
+            ),
+        },
         "--times": {
             "action": "store_true",
             "help": "Lists time ranges available in pcap file(s)",
@@ -70,6 +86,20 @@ def main():
             "default": 2,
             "help": "Number of seconds allowed between time ranges",
         },
+        "--jobs": {
+            "type": int,
+            "default": 1,
+            "help": "Number of worker processes to scan pcap files with",
+        },
+        "--no-index": {
+            "action": "store_true",
+            "help": (
+                "With --query or --times, scan each pcap file rather "
+                "than use its index.  Otherwise an index is saved in a "
+                ".idx file next to each pcap file whose directory is "
+                "writable, which later queries of that file reuse."
+            ),
+        },
         "file": {
             "nargs": "+",
             "metavar": "</path/to/pcap>",
@@ -115,11 +145,25 @@ def main():
                 "Start and end time must be formatted as YYYY-MM-DDThh:mm:ssZ"
             )
 
-        pcap.query(starttime, endtime, output, *pcapfiles)
+        pcap.query(
+            starttime,
+            endtime,
+            output,
+            *pcapfiles,
+            index=not args.no_index,
+            jobs=args.jobs,
+        )
+
+    # if using pcap.merge
+    elif args.merge:
+        if args.output is None:
+            ap.error("--merge requires --output")
+
+        pcap.merge(pcapfiles, args.output, args.dedupe)
 
     # if using pcap.times
     elif args.times:
-        times = pcap.times(pcapfiles, args.tol)
+        times = pcap.times(pcapfiles, args.tol, index=not args.no_index, jobs=args.jobs)
 
         if len(times) == 1:
             for start, stop in list(times.values())[0]:
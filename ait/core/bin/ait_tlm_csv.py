@@ -34,6 +34,10 @@ Reads the telemetry contained in the given pcap file and writes it in a csv file
                         format: YYYY-MM-DDThh:mm:ssZ
   --etime ETIME         Datetime in file to end collecting the data values. Defaults to end of pcap. Expected format:
                         YYYY-MM-DDThh:mm:ssZ
+  --jobs JOBS           Number of worker processes to read pcap files with. Rows from multiple files are then written
+                        in time order.
+  --no-index            Without --time_field, scan each pcap file rather than use its index. Otherwise an index is
+                        saved in a .idx file next to each pcap file whose directory is writable.
 
 Examples:
 
@@ -44,8 +48,11 @@ Examples:
 
 import argparse
 import csv
+import functools
+import pickle
 import sys
 import os
+import tempfile
 from datetime import datetime
 
 from ait.core import log, tlm, pcap, dmc
@@ -102,6 +109,26 @@ def main():
         ),
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes to read pcap files with. Rows from "
+            "multiple files are then written in time order."
+        ),
+    )
+
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help=(
+            "Without --time_field, scan each pcap file rather than use its "
+            "index. Otherwise an index is saved in a .idx file next to each "
+            "pcap file whose directory is writable."
+        ),
+    )
+
     parser.add_argument(
         "pcap", nargs="*", help=("PCAP file(s) containing telemetry packets")
     )
@@ -154,14 +181,39 @@ def main():
         sys.exit(2)
 
     if args.stime:
-        start = datetime.strptime(args.stime, dmc.ISO_8601_Format)
+        args.start = datetime.strptime(args.stime, dmc.ISO_8601_Format)
     else:
-        start = dmc.GPS_Epoch
+        args.start = dmc.GPS_Epoch
 
     if args.etime:
-        stop = datetime.strptime(args.etime, dmc.ISO_8601_Format)
+        args.stop = datetime.strptime(args.etime, dmc.ISO_8601_Format)
+    else:
+        args.stop = datetime.utcnow()
+
+    # Compare integer nanosecond timestamps, rather than creating a
+    # datetime for every packet, when possible: always for ground
+    # receipt time and for time fields decoded directly from a TIME32,
+    # TIME40 or TIME64 (see dtype.Time32Type.unpack_gps()).
+    args.time_type = None
+    args.time_offset = 0
+
+    if args.ground_time:
+        args.start_ns = dmc.to_unix_ns(args.start)
+        args.stop_ns = dmc.to_unix_ns(args.stop)
     else:
-        stop = datetime.utcnow()
+        args.start_ns = dmc.to_gps_ns(args.start)
+        args.stop_ns = dmc.to_gps_ns(args.stop)
+        fld = defn.fieldmap.get(args.time_field)
+
+        if (
+            fld is not None
+            and hasattr(fld.type, "unpack_gps")
+            and fld.dntoeu is None
+            and fld.expr is None
+            and fld.when is None
+        ):
+            args.time_type = fld.type
+            args.time_offset = defn.layout[fld.name].start
 
     # Append time to beginning of each row
     if not args.ground_time:
@@ -185,55 +237,33 @@ def main():
 
     rowcnt = 0
 
-    for filename in args.pcap:
-        log.debug("Processing %s" % filename)
-
-        with pcap.open(filename, "rb") as stream:
-            header, data = stream.read()
-
-            while data:
-                packet = tlm.Packet(defn, data)
-
-                comp_time = (
-                    header.timestamp
-                    if args.ground_time
-                    else getattr(packet, args.time_field)
-                )
-                if start < comp_time < stop:
-                    row = []
-                    for field in fields:
-                        try:
-                            # check if raw value requested
-                            _raw = False
-                            names = field.split(".")
-                            if len(names) == 2 and names[0] == "raw":
-                                field = names[1]
-                                _raw = True
-
-                            field_val = packet._getattr(field, raw=_raw)
-
-                            if hasattr(field_val, "name"):
-                                field_val = field_val.name
-                            else:
-                                field_val = str(field_val)
-
-                        except KeyError:
-                            log.debug("%s not found in Packet" % field)
-                            field_val = None
-                        except ValueError:
-                            # enumeration not found. just get the raw value
-                            field_val = packet._getattr(field, raw=True)
-
-                        row.append(field_val)
-
-                    if args.ground_time:
-                        row = [comp_time] + row
-
+    if args.jobs == 1 or len(args.pcap) < 2:
+        for filename in args.pcap:
+            for _key, row in rows(filename, defn, fields, args):
+                if row is not None:
                     rowcnt += 1
                     output(csv_writer, row)
 
                 npackets += 1
-                header, data = stream.read()
+    else:
+        # Each worker writes the rows for one pcap file to a temporary
+        # file, which are then merged in time order.
+        tmpdir = os.path.dirname(os.path.abspath(args.csv))
+
+        with tempfile.TemporaryDirectory(dir=tmpdir) as tmpdir:
+            func = functools.partial(
+                write_rows, defn=defn, fields=fields, args=args, tmpdir=tmpdir
+            )
+            sources = []
+
+            for tmpname, first, count in pcap.map_files(func, args.pcap, args.jobs):
+                if first is not None:
+                    sources.append((first, functools.partial(read_rows, tmpname)))
+                npackets += count
+
+            for row in pcap.merge_iters(sources):
+                rowcnt += 1
+                output(csv_writer, row)
 
     log.debug("Parsed %s packets." % npackets)
 
@@ -245,6 +275,106 @@ def main():
     log.end()
 
 
+def rows(filename, defn, fields, args):
+    """Yields a (time, row) tuple for each packet in the given pcap
+    file, where time is the packet time compared to the --stime and
+    --etime range (in nanoseconds, if possible) and row is the list of
+    CSV values for the packet, or None if it is not in the range.
+    """
+    log.debug("Processing %s" % filename)
+
+    if args.ground_time:
+        # Only read packets in the time range (see pcap.PCapIndex).
+        records = pcap.packets(
+            filename, args.start_ns, args.stop_ns, index=not args.no_index
+        )
+    else:
+        records = pcap.packets(filename)
+
+    for header, data in records:
+        if not data:
+            break
+
+        packet = tlm.Packet(defn, data)
+
+        if args.ground_time:
+            comp = header.ts_ns
+            in_range = args.start_ns < comp < args.stop_ns
+        elif args.time_type is not None:
+            comp = args.time_type.unpack_gps(data, args.time_offset, ns=True)
+            in_range = args.start_ns < comp < args.stop_ns
+        else:
+            comp = getattr(packet, args.time_field)
+            in_range = args.start < comp < args.stop
+
+        if not in_range:
+            yield comp, None
+            continue
+
+        row = []
+        for field in fields:
+            try:
+                # check if raw value requested
+                _raw = False
+                names = field.split(".")
+                if len(names) == 2 and names[0] == "raw":
+                    field = names[1]
+                    _raw = True
+
+                field_val = packet._getattr(field, raw=_raw)
+
+                if hasattr(field_val, "name"):
+                    field_val = field_val.name
+                else:
+                    field_val = str(field_val)
+
+            except KeyError:
+                log.debug("%s not found in Packet" % field)
+                field_val = None
+            except ValueError:
+                # enumeration not found. just get the raw value
+                field_val = packet._getattr(field, raw=True)
+
+            row.append(field_val)
+
+        if args.ground_time:
+            row = [header.timestamp] + row
+
+        yield comp, row
+
+
+def write_rows(filename, defn, fields, args, tmpdir):
+    """Pickles the (time, row) tuples for the packets in the given pcap
+    file in the time range (see rows()) to a new temporary file in
+    tmpdir and returns a (tmpname, first, npackets) tuple, where first
+    is the time of the first row (or None) and npackets the number of
+    packets processed.
+    """
+    fd, tmpname = tempfile.mkstemp(suffix=".rows", dir=tmpdir)
+    first = None
+    npackets = 0
+
+    with open(fd, "wb") as stream:
+        for comp, row in rows(filename, defn, fields, args):
+            if row is not None:
+                if first is None:
+                    first = comp
+                pickle.dump((comp, row), stream, pickle.HIGHEST_PROTOCOL)
+            npackets += 1
+
+    return tmpname, first, npackets
+
+
+def read_rows(tmpname):
+    """Yields the (time, row) tuples written by write_rows()."""
+    with open(tmpname, "rb") as stream:
+        while True:
+            try:
+                yield pickle.load(stream)
+            except EOFError:
+                break
+
+
 def output(csv_writer, row):
     if csv_writer:
         csv_writer.writerow(row)
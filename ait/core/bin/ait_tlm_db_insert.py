@@ -96,13 +96,13 @@ def main():
 
         for filename in args.file:
             log.info("Processing %s" % filename)
-            with pcap.open(filename) as stream:
+            with pcap.open(filename, mmap=True) as stream:
                 for header, pkt_data in stream:
 
                     try:
                         packet = tlm.Packet(defn, pkt_data)
 
-                        time = header.timestamp
+                        time = header.ts_ns
                         if args.use_current_time:
                             time = None
 
@@ -22,14 +22,18 @@ loggers.
 
 import calendar
 import json
+import math
 import os
 import socket
+import sys
 import time
 
 from bottle import request, Bottle
 import gevent
+import gevent.lock
 import gevent.monkey
 import gevent.pool
+import gevent.queue
 import gevent.socket
 
 from ait.core import pcap, log
@@ -132,6 +136,69 @@ class SocketStreamCapturer(object):
                     each transformation in order supplied with the output of
                     the previous being used as the input for the next.
 
+                buffered (optional)
+                    *True* or *False* flag specifying whether captured data
+                    should be buffered in memory and written to the log
+                    file in bulk, rather than flushed packet by packet.
+                    Buffered data is written when any of the
+                    **flush_nbytes**, **flush_npackets**, or
+                    **flush_nseconds** thresholds is reached (see
+                    :class:`ait.core.pcap.PCapStream`), when no data is
+                    captured for **flush_nseconds**, and when the log file
+                    is rotated or closed.
+
+                    Default::
+
+                        False
+
+                recv_batch (optional)
+                    The maximum number of datagrams to read from the socket
+                    each time it becomes readable. If greater than 1, all
+                    available datagrams (up to **recv_batch**) are read into
+                    a preallocated ring of buffers with ``recv_into`` and
+                    written to each handler's log file together (see
+                    :func:`capture_packets`), rather than one
+                    ``recv`` and write per wakeup. As this and **rcvbuf**
+                    configure the capturer's socket, they are taken from the
+                    handler(s) with which the capturer is created.
+
+                    Default::
+
+                        1
+
+                rcvbuf (optional)
+                    The size in bytes of the socket's kernel receive buffer
+                    (``SO_RCVBUF``). A larger buffer absorbs bursts of
+                    datagrams while captured data is written.
+
+                    Default::
+
+                        The operating system default
+
+                queue_size (optional)
+                    If given, captured data is put on a queue of at most
+                    **queue_size** packets for this handler and its
+                    **pre_write_transforms** and log file writes are run by
+                    a dedicated writer greenlet (in gevent's thread pool),
+                    so that a slow disk or transform does not delay reading
+                    the socket for every handler.
+
+                    Default::
+
+                        None (data is written as it is read)
+
+                queue_overflow (optional)
+                    What to do with captured data when the handler's queue
+                    (see **queue_size**) is full: *block* reading the socket
+                    until the writer catches up, or *drop-oldest* or
+                    *drop-newest* queued packet. Dropped packets are counted
+                    in the handler's statistics (see
+                    :func:`dump_all_handler_stats`).
+
+                    Default::
+
+                        'block'
+
             address:
                 The address to which a socket connection should be made. What is
                 considered a valid address depends on the **conn_type** value.
@@ -202,6 +269,26 @@ class SocketStreamCapturer(object):
             # TODO: Make this configurable
             self._buffer_size = 65565
 
+        rcvbuf = max(int(h.get("rcvbuf", 0)) for h in capture_handlers)
+        if rcvbuf:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+
+        # With MSG_TRUNC, Linux returns the full length of datagrams
+        # that do not fit the buffer, so they can be counted.
+        self.truncated = 0
+        self._recv_flags = 0
+        if conn_type != "tcp" and sys.platform.startswith("linux"):
+            self._recv_flags = socket.MSG_TRUNC
+
+        self._buffers = None
+        recv_batch = max(int(h.get("recv_batch", 1)) for h in capture_handlers)
+        if recv_batch > 1:
+            # Reads stop, rather than wait, once no more data is available.
+            self.socket.settimeout(0.0)
+            self._buffers = [
+                memoryview(bytearray(self._buffer_size)) for _ in range(recv_batch)
+            ]
+
         self._init_log_file_handlers()
 
     @property
@@ -217,29 +304,255 @@ class SocketStreamCapturer(object):
             h["reads"] += 1
             h["data_read"] += len(data)
 
+            if h.get("queue", None) is not None:
+                self._enqueue(h, [data])
+                continue
+
             d = data
             if "pre_write_transforms" in h:
                 for data_transform in h["pre_write_transforms"]:
                     d = data_transform(d)
             h["logger"].write(d)
 
+    def capture_packets(self):
+        """Write all available packet data to the logger's log file.
+
+        Reads datagrams into the preallocated buffers until none are
+        available (or the buffers are full) and writes them to each
+        handler's log file with a single write (see
+        :func:`ait.core.pcap.PCapStream.write_many`). Returns the number
+        of datagrams read.
+        """
+        packets = []
+
+        for buf in self._buffers:
+            try:
+                nbytes = self.socket.recv_into(buf, 0, self._recv_flags)
+            except BlockingIOError:
+                break
+
+            if nbytes > len(buf):
+                self.truncated += 1
+                nbytes = len(buf)
+
+            packets.append(buf[:nbytes])
+
+            if nbytes == 0 and self.conn_type == "tcp":
+                break
+
+        if not packets:
+            return 0
+
+        data_read = sum(len(p) for p in packets)
+
+        for h in self.capture_handlers:
+            h["reads"] += len(packets)
+            h["data_read"] += data_read
+
+            if h.get("queue", None) is not None:
+                # Queued data outlives the (reused) buffers.
+                self._enqueue(h, [bytes(p) for p in packets])
+                continue
+
+            data = packets
+            if h.get("pre_write_transforms"):
+                data = []
+                for d in packets:
+                    d = bytes(d)
+                    for data_transform in h["pre_write_transforms"]:
+                        d = data_transform(d)
+                    data.append(d)
+            h["logger"].write_many(data)
+
+        return len(packets)
+
     def clean_up(self):
         """Clean up the socket and log file handles."""
         self.socket.close()
         for h in self.capture_handlers:
+            self._stop_writer(h)
             h["logger"].close()
 
+    def _start_writer(self, handler):
+        """Create the handler's queue and writer greenlet, if it has a
+        **queue_size**
+        """
+        handler["dropped"] = 0
+
+        if handler.get("queue_size", None) is None:
+            return
+
+        overflow = handler.get("queue_overflow", "block")
+        if overflow not in ("block", "drop-oldest", "drop-newest"):
+            raise ValueError(
+                'Invalid queue overflow policy "{}" for handler "{}"'.format(
+                    overflow, handler["name"]
+                )
+            )
+
+        handler["queue"] = gevent.queue.Queue(int(handler["queue_size"]))
+        handler["writer_lock"] = gevent.lock.Semaphore()
+        handler["writer"] = gevent.spawn(self._writer_loop, handler)
+
+    def _stop_writer(self, handler):
+        """Write the handler's queued data and stop its writer greenlet"""
+        if handler.get("queue", None) is not None:
+            handler["queue"].put(None)
+            handler["writer"].join()
+            handler["queue"] = None
+
+    def _enqueue(self, handler, data):
+        """Queue captured data for the handler's writer greenlet, applying
+        its **queue_overflow** policy when the queue is full
+        """
+        queue = handler["queue"]
+        overflow = handler.get("queue_overflow", "block")
+
+        for d in data:
+            if overflow == "block":
+                queue.put(d)
+                continue
+
+            try:
+                queue.put_nowait(d)
+            except gevent.queue.Full:
+                handler["dropped"] += 1
+                if overflow == "drop-oldest":
+                    queue.get_nowait()
+                    queue.put_nowait(d)
+
+    def _writer_loop(self, handler):
+        """Write the handler's queued data to its log file until stopped
+        (see :func:`_stop_writer`)
+        """
+        queue = handler["queue"]
+        threadpool = gevent.get_hub().threadpool
+        timeout = None
+        if handler.get("buffered", False):
+            timeout = handler.get("flush_nseconds", None) or 1.0
+
+        while True:
+            try:
+                data = [queue.get(timeout=timeout)]
+            except gevent.queue.Empty:
+                # Write buffered data rather than holding it while idle.
+                with handler["writer_lock"]:
+                    threadpool.apply(handler["logger"].flush)
+                continue
+
+            while data[-1] is not None and not queue.empty():
+                data.append(queue.get_nowait())
+
+            stop = data[-1] is None
+            if stop:
+                data.pop()
+
+            if data:
+                with handler["writer_lock"]:
+                    try:
+                        threadpool.apply(self._write_data, (handler, data))
+                    except Exception as e:
+                        log.error(
+                            'Handler "{}" failed to write captured data: {}'.format(
+                                handler["name"], e
+                            )
+                        )
+
+            if stop:
+                break
+
+    def _write_data(self, handler, data):
+        """Transform and write a list of captured data to the handler's
+        log file (in a writer thread)
+        """
+        if handler.get("pre_write_transforms"):
+            transformed = []
+            for d in data:
+                for data_transform in handler["pre_write_transforms"]:
+                    d = data_transform(d)
+                transformed.append(d)
+            data = transformed
+
+        handler["logger"].write_many(data)
+
     def socket_monitor_loop(self):
         """Monitor the socket and log captured data."""
         try:
             while True:
-                gevent.socket.wait_read(self.socket.fileno())
-
-                self._handle_log_rotations()
-                self.capture_packet()
+                try:
+                    gevent.socket.wait_read(
+                        self.socket.fileno(), timeout=self._wait_timeout()
+                    )
+                except socket.timeout:
+                    # Write buffered data, and rotate log files when due,
+                    # while the socket is idle.
+                    self._flush_loggers()
+                    if time.monotonic() >= self._next_rotation:
+                        self._handle_log_rotations()
+                    continue
+
+                if time.monotonic() >= self._next_rotation:
+                    self._handle_log_rotations()
+
+                if self._buffers is not None:
+                    self.capture_packets()
+                else:
+                    self.capture_packet()
         finally:
             self.clean_up()
 
+    def _flush_loggers(self):
+        """Write any buffered data in each buffered handler's log file"""
+        for h in self.capture_handlers:
+            # Queued handlers are flushed by their writer.
+            if h.get("buffered", False) and h.get("queue", None) is None:
+                h["logger"].flush()
+
+    def _flush_timeout(self):
+        """Return the number of seconds the socket may be idle before
+        buffered data is written, or None if no handler is buffered
+        """
+        timeouts = [
+            h.get("flush_nseconds", None) or 1.0
+            for h in self.capture_handlers
+            if h.get("buffered", False) and h.get("queue", None) is None
+        ]
+        return min(timeouts) if timeouts else None
+
+    def _wait_timeout(self):
+        """Return the number of seconds to wait for data before buffered
+        data must be written or a log file rotated, or None
+        """
+        timeout = self._flush_timeout()
+
+        if self._next_rotation != math.inf:
+            remaining = max(self._next_rotation - time.monotonic(), 0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        return timeout
+
+    def kernel_drops(self):
+        """Return the number of datagrams the kernel dropped for this
+        capturer's socket because its receive buffer (see **rcvbuf**)
+        was full, or None if unavailable (only UDP sockets on Linux are
+        supported)
+        """
+        if self.conn_type != "udp":
+            return None
+
+        try:
+            inode = str(os.fstat(self.socket.fileno()).st_ino)
+            for filename in ("/proc/net/udp", "/proc/net/udp6"):
+                with open(filename) as stream:
+                    for line in stream:
+                        fields = line.split()
+                        if len(fields) > 12 and fields[9] == inode:
+                            return int(fields[-1])
+        except (OSError, TypeError, ValueError):
+            pass
+
+        return None
+
     def add_handler(self, handler):
         """Add an additional handler
 
@@ -252,8 +565,10 @@ class SocketStreamCapturer(object):
         handler["logger"] = self._get_logger(handler)
         handler["reads"] = 0
         handler["data_read"] = 0
+        self._start_writer(handler)
 
         self.capture_handlers.append(handler)
+        self._schedule_rotations()
 
     def remove_handler(self, name):
         """Remove a handler given a name
@@ -271,8 +586,10 @@ class SocketStreamCapturer(object):
                 index = i
 
         if index is not None:
-            self.capture_handlers[index]["logger"].close()
-            del self.capture_handlers[index]
+            handler = self.capture_handlers.pop(index)
+            self._stop_writer(handler)
+            handler["logger"].close()
+            self._schedule_rotations()
 
     def dump_handler_config_data(self):
         """Return capture handler configuration data.
@@ -296,7 +613,17 @@ class SocketStreamCapturer(object):
             }, ...]
 
         """
-        ignored_keys = ["logger", "log_rot_time", "reads", "data_read"]
+        ignored_keys = [
+            "logger",
+            "log_rot_time",
+            "log_rot_deadline",
+            "reads",
+            "data_read",
+            "queue",
+            "writer",
+            "writer_lock",
+            "dropped",
+        ]
         config_data = []
         for h in self.capture_handlers:
             config_data.append(
@@ -324,10 +651,23 @@ class SocketStreamCapturer(object):
                 'data_read_length': The total length of the data received
 
                 'approx_data_rate': The approximate data rate for this handler
+
+                'truncated': The number of datagrams truncated because
+                    they were larger than the capturer's read buffer
+
+                'kernel_drops': The number of datagrams dropped by the
+                    kernel because the socket's receive buffer was full
+                    (see :func:`kernel_drops`)
+
+                'dropped': The number of packets dropped because the
+                    handler's queue was full (see **queue_overflow**)
+
+                'queued': The number of packets in the handler's queue
             }, ...]
 
         """
         stats = []
+        kernel_drops = self.kernel_drops()
         for h in self.capture_handlers:
             now = calendar.timegm(time.gmtime())
             rot_time = calendar.timegm(h["log_rot_time"])
@@ -342,6 +682,10 @@ class SocketStreamCapturer(object):
                     "reads": h["reads"],
                     "data_read_length": "{} bytes".format(h["data_read"]),
                     "approx_data_rate": approx_data_rate,
+                    "truncated": self.truncated,
+                    "kernel_drops": kernel_drops,
+                    "dropped": h.get("dropped", 0),
+                    "queued": h["queue"].qsize() if h.get("queue") else 0,
                 }
             )
 
@@ -349,9 +693,78 @@ class SocketStreamCapturer(object):
 
     def _handle_log_rotations(self):
         """Rotate each handler's log file if necessary"""
+        now = time.monotonic()
         for h in self.capture_handlers:
+            deadline = h.get("log_rot_deadline", None)
+            if deadline is None or now < deadline:
+                continue
+
             if self._should_rotate_log(h):
                 self._rotate_log(h)
+            else:
+                # The system clock was set back since the log was opened.
+                h["log_rot_deadline"] = self._rotation_deadline(h)
+
+        self._schedule_rotations()
+
+    def _schedule_rotations(self):
+        """Set the time.monotonic() time at which the next log rotation is
+        due, so the capture loop can check for rotations with a single
+        comparison
+        """
+        deadlines = [
+            h["log_rot_deadline"]
+            for h in self.capture_handlers
+            if h.get("log_rot_deadline", None) is not None
+        ]
+        self._next_rotation = min(deadlines) if deadlines else math.inf
+
+    def _rotation_deadline(self, handler):
+        """Return the time.monotonic() time at which the handler's log
+        file is due to be rotated, or None if it is never rotated
+        """
+        if not handler.get("rotate_log", False):
+            return None
+
+        return time.monotonic() + (self._rotation_time(handler) - time.time())
+
+    def _rotation_time(self, handler):
+        """Return the time, in seconds since the epoch, at which the
+        handler's log file is due to be rotated
+
+        This is the first time at which :func:`_should_rotate_log` holds,
+        i.e., the start of the **rotate_log_index** time unit
+        **rotate_log_delta** units after the log file was opened or,
+        if sooner, the start of the next larger time unit (e.g., the
+        next month when rotating every N days).
+        """
+        try:
+            index = self._decode_time_rotation_index(
+                handler.get("rotate_log_index", "day")
+            )
+        except ValueError:
+            index = 2
+
+        delta = handler.get("rotate_log_delta", 1)
+        fields = list(handler["log_rot_time"][:6])
+
+        def unit_start(i, n):
+            """Return the start of the time unit at index i, n units after
+            the log file was opened, in seconds since the epoch
+            """
+            start = fields[: i + 1] + [1, 1, 0, 0, 0][i:]
+            start[i] += n
+            if i == 1:
+                years, month = divmod(start[1] - 1, 12)
+                start[0] += years
+                start[1] = month + 1
+            return calendar.timegm(start)
+
+        rotation_time = unit_start(index, delta)
+        if index > 0:
+            rotation_time = min(rotation_time, unit_start(index - 1, 1))
+
+        return rotation_time
 
     def _should_rotate_log(self, handler):
         """Determine if a log file rotation is necessary"""
@@ -415,8 +828,15 @@ class SocketStreamCapturer(object):
 
     def _rotate_log(self, handler):
         """Rotate a handlers log file"""
-        handler["logger"].close()
-        handler["logger"] = self._get_logger(handler)
+        if handler.get("queue", None) is not None:
+            # Wait for the writer to finish any write to the current log file.
+            with handler["writer_lock"]:
+                handler["logger"].close()
+                handler["logger"] = self._get_logger(handler)
+        else:
+            handler["logger"].close()
+            handler["logger"] = self._get_logger(handler)
+        self._schedule_rotations()
 
     def _get_log_file(self, handler):
         """Generate log file path for a given handler
@@ -450,12 +870,21 @@ class SocketStreamCapturer(object):
             os.makedirs(os.path.dirname(log_file))
 
         handler["log_rot_time"] = time.gmtime()
-        return pcap.open(log_file, mode="a")
+        handler["log_rot_deadline"] = self._rotation_deadline(handler)
+        buffering = {
+            name: handler[name]
+            for name in ("buffered", "flush_nbytes", "flush_npackets", "flush_nseconds")
+            if name in handler
+        }
+        return pcap.open(log_file, mode="a", **buffering)
 
     def _init_log_file_handlers(self):
         """Initialize log file handles"""
         for handler in self.capture_handlers:
             handler["logger"] = self._get_logger(handler)
+            self._start_writer(handler)
+
+        self._schedule_rotations()
 
 
 class StreamCaptureManager(object):
@@ -108,6 +108,12 @@ class ArgDefn(json.SlotSerializer, object):
         Definition.
         """
         value = self.type.decode(bytes)
+        return self._decode_enum(value)
+
+    def _decode_enum(self, value):
+        """Returns the enumeration name for the given decoded value, if
+        any, otherwise the value itself.
+        """
         if self._enum is not None:
             for name, val in self._enum.items():
                 if value == val:
@@ -115,6 +121,12 @@ class ArgDefn(json.SlotSerializer, object):
                     break
         return value
 
+    def unpack_from(self, buffer, offset):
+        """Decodes this AIT Argument starting at byte offset in the
+        given buffer, without copying it out of the buffer first.
+        """
+        return self._decode_enum(self.type.unpack_from(buffer, offset))
+
     def encode(self, value):
         """Encodes the given value according to this AIT Argument
         Definition.
@@ -126,6 +138,19 @@ class ArgDefn(json.SlotSerializer, object):
             value = self.enum[value]
         return self.type.encode(*value) if type(value) in [tuple, list] else self.type.encode(value)
 
+    def pack_into(self, buffer, offset, value):
+        """Encodes the given value according to this AIT Argument
+        Definition directly into the writable buffer, starting at byte
+        offset.
+        """
+        if not self.type:
+            return
+
+        if type(value) == str and self.enum and value in self.enum:
+            value = self.enum[value]
+
+        self.type.pack_into(buffer, offset, value)
+
     def slice(self, offset=0):
         """Returns a Python slice object (e.g. for array indexing) indicating
         the start and stop byte position of this Command argument.  The
@@ -174,6 +199,105 @@ class ArgDefn(json.SlotSerializer, object):
         return valid
 
 
+class CmdDecoder(object):
+    """CmdDecoder - Command Decoder
+
+    A CmdDecoder decodes the arguments of encoded commands for a
+    single Command Definition.  It is built once per CmdDefn (see
+    CmdDefn.decoder) and used by CmdDict.decode() and
+    CmdDict.decode_stream().
+
+    The byte offset of each non-fixed argument is computed once, so
+    decoding unpacks each argument in place, without slicing.
+    """
+
+    __slots__ = ["_args", "argdefns"]
+
+    def __init__(self, defn):
+        """Creates a new CmdDecoder for the given Command Definition."""
+        self._args = [
+            (arg.unpack_from, arg.slice(3).start)
+            for arg in defn.argdefns
+            if not arg.fixed
+        ]
+        self.argdefns = defn.argdefns
+
+    def decode(self, buffer, offset=0):
+        """Decodes the (non-fixed) argument values of the command
+        encoded at byte offset in the given buffer and returns them as
+        a list.
+        """
+        return [
+            unpack_from(buffer, offset + start) for unpack_from, start in self._args
+        ]
+
+
+class CmdEncoder(object):
+    """CmdEncoder - Command Encoder
+
+    A CmdEncoder encodes commands for a single Command Definition.  It
+    is built once per CmdDefn (see CmdDefn.encoder) and used by
+    Cmd.encode() and CmdDict.encode_many().
+
+    The opcode, argument size and fixed arguments are the same for
+    every command, so they are encoded once into a template buffer.
+    Encoding a command copies the (padded) template and packs only
+    the non-fixed arguments into it.
+    """
+
+    __slots__ = ["_args", "_padded", "_template", "argdefns"]
+
+    def __init__(self, defn):
+        """Creates a new CmdEncoder for the given Command Definition."""
+        try:
+            opcode = struct.pack(">H", defn.opcode)
+        except struct.error:
+            msg = f"The opcode: {hex(defn.opcode)} for command {defn.name} "
+            msg += "does not fit in an unsigned int. Check your Cmd Dictionary."
+            raise ValueError(msg)
+
+        offset = len(opcode)
+        template = bytearray(offset + 1 + defn.argsize)
+        template[0:offset] = opcode
+        template[offset] = defn.argsize
+        offset += 1
+
+        self._args = []
+        for arg in defn.argdefns:
+            start = arg.slice(offset).start
+            if arg.fixed:
+                arg.pack_into(template, start, arg.value)
+            else:
+                self._args.append((arg.pack_into, start))
+
+        self._padded = {}
+        self._template = bytes(template)
+        self.argdefns = defn.argdefns
+
+    def encode(self, args, pad=106):
+        """Encodes a command with the given (non-fixed) argument values
+        to binary and returns a bytearray.  See Cmd.encode().
+        """
+        try:
+            template = self._padded[pad]
+        except KeyError:
+            template = self._template
+            if pad > len(template):
+                template += bytes(pad - len(template))
+            self._padded[pad] = template
+
+        if len(args) < len(self._args):
+            msg = "Expected %d arguments, but received %d."
+            raise TypeError(msg % (len(self._args), len(args)))
+
+        encoded = bytearray(template)
+
+        for (pack_into, start), value in zip(self._args, args):
+            pack_into(encoded, start, value)
+
+        return encoded
+
+
 class Cmd(object):
     """Cmd - Command
 
@@ -244,31 +368,7 @@ class Cmd(object):
         52050J, Section 3.2.3.4).  This leaves 53 words (106 bytes) for
         the command itself.
         """
-        try:
-            opcode = struct.pack(">H", self.defn.opcode)
-        except struct.error:
-            msg = f"The opcode: {hex(self.defn.opcode)} for command {self.name} "
-            msg += "does not fit in an unsigned int. Check your Cmd Dictionary."
-            raise ValueError(msg)
-
-        offset = len(opcode)
-        size = max(offset + self.defn.argsize, pad)
-        encoded = bytearray(size)
-
-        encoded[0:offset] = opcode
-        encoded[offset] = self.defn.argsize
-        offset += 1
-        index = 0
-
-        for defn in self.defn.argdefns:
-            if defn.fixed:
-                value = defn.value
-            else:
-                value = self.args[index]
-                index += 1
-            encoded[defn.slice(offset)] = defn.encode(value)
-
-        return encoded
+        return self.defn.encoder.encode(self.args, pad)
 
     def validate(self, messages=None):
         """Returns True if the given Command is valid, False otherwise.
@@ -287,7 +387,17 @@ class CmdDefn(json.SlotSerializer, object):
     opcode are required.  All others are optional.
     """
 
-    __slots__ = ("name", "_opcode", "subsystem", "ccsds", "title", "desc", "argdefns")
+    __slots__ = (
+        "name",
+        "_opcode",
+        "subsystem",
+        "ccsds",
+        "title",
+        "desc",
+        "argdefns",
+        "_decoder",
+        "_encoder",
+    )
 
     def __init__(self, *args, **kwargs):
         """Creates a new Command Definition."""
@@ -295,6 +405,9 @@ class CmdDefn(json.SlotSerializer, object):
             name = slot[1:] if slot.startswith("_") else slot
             setattr(self, slot, kwargs.get(name, None))
 
+        self._decoder = None
+        self._encoder = None
+
         if self.ccsds:
             import ait.core.ccsds as ccsds
 
@@ -306,6 +419,27 @@ class CmdDefn(json.SlotSerializer, object):
     def __repr__(self):
         return util.toRepr(self)
 
+    def __getstate__(self):
+        return {
+            name: getattr(self, name)
+            for name in CmdDefn.__slots__
+            if name not in ("_decoder", "_encoder")
+        }
+
+    def __setstate__(self, state):
+        # Caches pickled before __getstate__() was defined hold the
+        # default (None, slots) state.
+        if isinstance(state, tuple):
+            state = state[1]
+
+        for s in CmdDefn.__slots__:
+            setattr(self, s, state.get(s, None))
+
+    def __jsonOmit__(self, key, val):  # noqa
+        if key in ("decoder", "encoder"):
+            return True
+        return super(CmdDefn, self).__jsonOmit__(key, val)
+
     @property
     def args(self):
         """The argument definitions to this command (excludes fixed
@@ -313,6 +447,30 @@ class CmdDefn(json.SlotSerializer, object):
         """
         return filter(lambda a: not a.fixed, self.argdefns)
 
+    @property
+    def decoder(self):
+        """The CmdDecoder for this command, built on first use and
+        rebuilt whenever argdefns is reassigned (see encoder).
+        """
+        decoder = self._decoder
+        if decoder is None or decoder.argdefns is not self.argdefns:
+            decoder = self._decoder = createCmdDecoder(self)  # noqa
+
+        return decoder
+
+    @property
+    def encoder(self):
+        """The CmdEncoder for this command, built on first use and
+        rebuilt whenever argdefns is reassigned.  Reassign argdefns
+        (rather than modifying the list in place) when adding or
+        removing arguments.
+        """
+        encoder = self._encoder
+        if encoder is None or encoder.argdefns is not self.argdefns:
+            encoder = self._encoder = createCmdEncoder(self)  # noqa
+
+        return encoder
+
     @property
     def nargs(self):
         """The number of arguments to this command (excludes fixed
@@ -398,6 +556,11 @@ class CmdDict(dict):
     interface mapping Command names to Command Definitions.
     """
 
+    # The maximum number of encoded commands remembered by encode_many().
+    EncodeCacheSize = 4096
+
+    _encoded = None
+
     def __init__(self, *args, **kwargs):
         """Creates a new Command Dictionary from the given command dictionary
         filename.
@@ -413,6 +576,8 @@ class CmdDict(dict):
 
     def add(self, defn):
         """Adds the given Command Definition to this Command Dictionary."""
+        self._encoded = None
+
         if defn.name not in self:
             self[defn.name] = defn
         else:
@@ -452,24 +617,134 @@ class CmdDict(dict):
         """Decodes the given bytes according to this AIT Command
         Definition.
         """
-        opcode = struct.unpack(">H", bytes[0:2])[0]
-        name = None
-        args = []
-
-        if opcode in self.opcodes:
-            defn = self.opcodes[opcode]
-            name = defn.name
-            stop = 3
-
-            for arg in defn.argdefns:
-                start = stop
-                stop = start + arg.nbytes
-                if arg.fixed:
-                    pass  # FIXME: Confirm fixed bytes are as expected?
+        defn = self._lookup(bytes, 0)
+        return createCmd(defn, *defn.decoder.decode(bytes))  # noqa
+
+    def decode_stream(self, buffer, offset=0, pad=0, create=True, names=None):
+        """Decodes the encoded commands placed back-to-back in the given
+        buffer (e.g. a bytes, bytearray or memoryview), starting at
+        byte offset, and yields each one in turn.
+
+        Each command occupies its encoded size (see CmdDefn.nbytes) or,
+        if larger, ``pad`` bytes, i.e. the same ``pad`` given to
+        Cmd.encode() or encode_many().  Arguments are unpacked in place,
+        without slicing or copying the buffer.
+
+        If ``create`` is ``True``, a Cmd is yielded for each command,
+        otherwise a lightweight ``(name, args)`` tuple.  If ``names``
+        is given (e.g. a set of command names), only those commands are
+        yielded, and the arguments of all other commands are never
+        decoded, which makes counting and filtering cheap.
+
+        A TypeError is raised for an unrecognized opcode and a
+        ValueError if the last command in the buffer is truncated.
+        """
+        end = len(buffer)
+        opcodes = self.opcodes
+
+        while offset < end:
+            if offset + 3 > end:
+                raise ValueError("Truncated command at byte %d." % offset)
+
+            defn = opcodes.get(buffer[offset] << 8 | buffer[offset + 1], None)
+            if defn is None:
+                defn = self._lookup(buffer, offset)  # Raises TypeError
+            size = 3 + buffer[offset + 2]
+
+            if offset + size > end:
+                msg = "Truncated %s command at byte %d." % (defn.name, offset)
+                raise ValueError(msg)
+
+            if names is None or defn.name in names:
+                args = defn.decoder.decode(buffer, offset)
+                if create:
+                    yield createCmd(defn, *args)  # noqa
+                else:
+                    yield defn.name, args
+
+            offset += size if size > pad else pad
+
+    def _lookup(self, buffer, offset):
+        """Returns the Command Definition for the opcode encoded at byte
+        offset in the given buffer.
+        """
+        opcode = struct.unpack_from(">H", buffer, offset)[0]
+        defn = self.opcodes.get(opcode, None)
+
+        if defn is None:
+            raise TypeError("Unrecognized command opcode: 0x%04X" % opcode)
+
+        return defn
+
+    def encode_many(self, cmds, pad=106, contiguous=False):
+        """Encodes each of the given commands to binary.
+
+        Each command may be a string (e.g. ``"NAME arg1 arg2"``, as
+        accepted by create()), a tuple or list of the command name
+        followed by its positional arguments, or a Cmd.  Returns a list
+        of bytearrays, or, if ``contiguous`` is ``True``, a single
+        bytearray with the encoded commands one after the other.  See
+        Cmd.encode() for ``pad``.
+
+        Commands are created (see create()) and validated as they are
+        encoded, and ValueError is raised for an invalid command.
+        Commands given as strings or tuples are parsed, validated and
+        encoded only once.  The encoded bytes are remembered (up to
+        EncodeCacheSize commands) so that repeated commands, common in
+        sequences, are simply copied.
+        """
+        cache = self._encoded
+        if cache is None:
+            cache = self._encoded = {}
+
+        encoded = []
+
+        for item in cmds:
+            if isinstance(item, Cmd):
+                encoded.append(self._encode_valid(item, pad))
+                continue
+
+            # Argument types are part of the key, since e.g. 1, 1.0
+            # and True are equal but may not all be valid.
+            if type(item) is str:
+                key = item, pad
+            else:
+                key = tuple(item), tuple(type(arg) for arg in item), pad
+
+            try:
+                data = cache.get(key)
+            except TypeError:  # Unhashable, e.g. an array argument
+                key = data = None
+
+            if data is None:
+                if type(item) is str:
+                    cmd = self.create(item)
                 else:
-                    args.append(arg.decode(bytes[start:stop]))
+                    cmd = self.create(item[0], *item[1:])
+
+                data = bytes(self._encode_valid(cmd, pad))
+
+                if key is not None:
+                    if len(cache) >= self.EncodeCacheSize:
+                        cache.clear()
+                    cache[key] = data
+
+            encoded.append(data)
+
+        if contiguous:
+            return bytearray().join(encoded)
+
+        return [bytearray(data) for data in encoded]
+
+    def _encode_valid(self, cmd, pad):
+        """Encodes the given Cmd, raising ValueError if it is invalid."""
+        messages = []
+
+        if not cmd.validate(messages):
+            msg = "Invalid command '%s': %s" % (cmd, " ".join(messages))
+            raise ValueError(msg)
 
-        return self.create(name, *args)
+        return cmd.encode(pad)
 
     def load(self, content):
         """Loads Command Definitions from the given YAML content into
@@ -192,6 +192,11 @@ class GenericBackend(object):
         """Insert a record into the database."""
         pass
 
+    def insert_many(self, packets, **kwargs):
+        """Insert several records into the database, without times."""
+        for packet in packets:
+            self.insert(packet, **kwargs)
+
     @abstractmethod
     def query(self, query, **kwargs):
         """Query the database instance and return results."""
@@ -325,30 +330,57 @@ class InfluxDBBackend(GenericBackend):
 
             time
                 Optional parameter specifying the time value to use when inserting
-                the record into the database. Default case does not provide a time
-                value so Influx defaults to the current time when inserting the
-                record.
+                the record into the database, as a datetime or an integer number
+                of nanoseconds since the Unix epoch (e.g. PCapPacketHeader.ts_ns),
+                which is passed to Influx as is. Default case does not provide a
+                time value so Influx defaults to the current time when inserting
+                the record.
 
             tags
                 Optional kwargs argument for specifying a dictionary of tags to
                 include when adding the values. Defaults to nothing.
 
         """
+        data = self._point(packet, time, **kwargs)
+        if data is not None:
+            self._conn.write_points([data])
+
+    def insert_many(self, packets, **kwargs):
+        """Insert several packets into the database with a single write
+
+        Arguments
+            packets
+                The :class:`ait.core.tlm.Packet` instances to insert into
+                the database, each with the current time
+
+            tags
+                Optional kwargs argument for specifying a dictionary of tags to
+                include when adding the values. Defaults to nothing.
+        """
+        points = [self._point(packet, **kwargs) for packet in packets]
+        points = [data for data in points if data is not None]
+        if points:
+            self._conn.write_points(points)
+
+    def _point(self, packet, time=None, **kwargs):
+        """Returns the Influx point for packet (see insert()), or None
+        if the packet has no fields to insert."""
         fields = {}
         pd = packet._defn
+        values = pd.decoder.decode_all(packet, values="raw")
 
         for defn in pd.fields:
-            val = getattr(packet.raw, defn.name)
+            val = values[defn.name]
 
             if pd.history and defn.name in pd.history:
-                val = getattr(packet.history, defn.name)
+                val = getattr(pd.history, defn.name)
 
             if val is not None and not (isinstance(val, float) and math.isnan(val)):
                 fields[defn.name] = val
 
         if len(fields) == 0:
             log.error("No fields present to insert into Influx")
-            return
+            return None
 
         tags = kwargs.get("tags", {})
 
@@ -361,7 +393,7 @@ class InfluxDBBackend(GenericBackend):
         if time:
             data["time"] = time
 
-        self._conn.write_points([data])
+        return data
 
     def _query(self, query, **kwargs):
         """Query the database and return results
@@ -697,7 +729,32 @@ class SQLiteBackend(GenericBackend):
                 The :class:`ait.core.tlm.Packet` instance to insert into
                 the database
 
+            time
+                Optional time value to insert with the record, as a datetime
+                or an integer number of nanoseconds since the Unix epoch.
+
+        """
+        self._insert(packet, time)
+        self._conn.commit()
+
+    def insert_many(self, packets, **kwargs):
+        """Insert several packets into the database in a single transaction
+
+        Arguments
+            packets
+                The :class:`ait.core.tlm.Packet` instances to insert into
+                the database, each with the current time
         """
+        for packet in packets:
+            self._insert(packet)
+        self._conn.commit()
+
+    def _insert(self, packet, time=None):
+        if isinstance(time, int):
+            ns = time % 1000000000
+            time = dt.datetime.utcfromtimestamp(time // 1000000000)
+            time = time.replace(microsecond=ns // 1000)
+
         if isinstance(time, dt.datetime):
             time = time.strftime(dmc.RFC3339_Format)
 
@@ -709,7 +766,6 @@ class SQLiteBackend(GenericBackend):
             else (sqlite3.Binary(packet._data))
 
         self._conn.execute(sql, values)
-        self._conn.commit()
 
     def _query(self, query, **kwargs):
         """Query the database and return results
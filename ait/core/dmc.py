@@ -28,6 +28,7 @@ import datetime
 import math
 import os.path
 import pickle
+import time
 from typing import Tuple
 
 import requests
@@ -49,9 +50,7 @@ LeapSeconds = None
 
 def get_timestamp_utc():
     """Returns the current UTC time in seconds and microseconds."""
-    utc = datetime.datetime.utcnow()
-    ts_sec = calendar.timegm(utc.timetuple())
-    ts_usec = utc.microsecond
+    ts_sec, ts_usec = divmod(time.time_ns() // 1000, 1000000)
     return ts_sec, ts_usec
 
 
@@ -153,6 +152,51 @@ def to_gps_seconds(timestamp) -> int:
     return (delta.days * 24 * 3600) + delta.seconds
 
 
+def to_gps_ns(timestamp) -> int:
+    """Convert datetime object into number of nanoseconds since GPS epoch.
+
+    The result is comparable with the ``unpack_gps(..., ns=True)``
+    value of TIME32, TIME40 and TIME64 fields.
+
+    Arguments:
+        timestamp (datetime.datetime): The datetime object to convert.
+
+    Return:
+        Number of nanoseconds since the GPS epoch which the timestamp
+        represents.
+
+    Examples:
+
+    >>> import datetime
+    >>> to_gps_ns(datetime.datetime(1980, 1, 6, 0, 0, 1, 500))
+    1000500000
+    """
+    return to_gps_seconds(timestamp) * 1000000000 + timestamp.microsecond * 1000
+
+
+def to_unix_ns(timestamp) -> int:
+    """Convert a UTC datetime object into number of nanoseconds since the
+    Unix epoch.
+
+    The result is comparable with :attr:`PCapPacketHeader.ts_ns`.
+
+    Arguments:
+        timestamp (datetime.datetime): The UTC datetime object to convert.
+
+    Return:
+        Number of nanoseconds since the Unix epoch which the timestamp
+        represents.
+
+    Examples:
+
+    >>> import datetime
+    >>> to_unix_ns(datetime.datetime(1970, 1, 2, 0, 0, 0, 1))
+    86400000001000
+    """
+    seconds = calendar.timegm(timestamp.utctimetuple())
+    return seconds * 1000000000 + timestamp.microsecond * 1000
+
+
 def to_gmst(dt=None) -> float:
     """Convert datetime / Julian date to GMST.
 
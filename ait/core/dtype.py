@@ -65,6 +65,7 @@ tuples, for succinctness:
     error: float '1e+06' cannot be represented as an integer.
 """
 
+import array
 import datetime
 import struct
 import sys
@@ -132,7 +133,10 @@ class PrimitiveType(object):
     ("MSB" or "LSB"), float, signed, nbits, nbytes, min, and max.
 
     PrimitiveTypes can validate() specific values and encode() and
-    decode() binary representations.
+    decode() binary representations.  The ``struct.Struct`` and value
+    coercion used to encode and decode are precompiled once, when the
+    PrimitiveType is created.  unpack_from() and pack_into() decode
+    and encode values in place, at an offset in a larger buffer.
     """
 
     def __init__(self, name):
@@ -175,12 +179,43 @@ class PrimitiveType(object):
             self._max = 2 ** self.nbits - 1
             self._min = 0
 
+        self._compile()
+
     def __eq__(self, other):
         return isinstance(other, PrimitiveType) and self._name == other._name
 
     def __repr__(self):
         return "%s('%s')" % (self.__class__.__name__, self.name)
 
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("_coerce", None)
+        state.pop("_struct", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def _compile(self):
+        """Precompiles the ``struct.Struct`` and value coercion used to
+        encode and decode this PrimitiveType.  Types without a struct
+        format (e.g. "MSB_U24") may still be created, but cannot be
+        encoded or decoded.
+        """
+        self._struct = None
+        self._coerce = None
+
+        if self.format is None:
+            return
+
+        self._struct = struct.Struct(self.format)
+
+        if re.sub(r"\W+", "", self.format).lower() in ("b", "i", "l", "q"):
+            self._coerce = int
+        elif self._string:
+            self._coerce = str.encode
+
     @property
     def endian(self):
         """Endianness of this PrimitiveType, either 'MSB' or 'LSB'."""
@@ -238,15 +273,10 @@ class PrimitiveType(object):
         Encodes the given value to a bytearray according to this
         PrimitiveType definition.
         """
-        if re.sub(r"\W+", "", self.format).lower() in ("b", "i", "l", "q"):
-            fvalue = int(value)
-        elif self._string:
-            fvalue = value.encode()
-        else:
-            fvalue = value
+        if self._coerce is not None:
+            value = self._coerce(value)
 
-        as_str = struct.pack(self.format, fvalue)
-        return bytearray(as_str)
+        return bytearray(self._struct.pack(value))
 
     def decode(self, bytestring, raw=False):
         """decode(bytearray, raw=False) -> value
@@ -258,7 +288,36 @@ class PrimitiveType(object):
         ``decode()`` inteface, but has no effect for PrimitiveType
         definitions.
         """
-        return struct.unpack(self.format, memoryview(bytestring))[0]
+        return self._struct.unpack(bytestring)[0]
+
+    def pack_into(self, buffer, offset, value):
+        """pack_into(buffer, offset, value)
+
+        Encodes the given value according to this PrimitiveType
+        definition directly into the writable buffer, starting at byte
+        offset.
+        """
+        if type(self) is not PrimitiveType:
+            buffer[offset : offset + self.nbytes] = self.encode(value)
+            return
+
+        if self._coerce is not None:
+            value = self._coerce(value)
+
+        self._struct.pack_into(buffer, offset, value)
+
+    def unpack_from(self, buffer, offset=0, raw=False):
+        """unpack_from(buffer, offset=0, raw=False) -> value
+
+        Decodes the value at byte offset in the given buffer according
+        to this PrimitiveType definition, without copying it out of
+        the buffer first.  See decode().
+        """
+        if type(self) is not PrimitiveType:
+            view = memoryview(buffer)[offset : offset + self.nbytes]
+            return self.decode(view, raw)
+
+        return self._struct.unpack_from(buffer, offset)[0]
 
     def toJSON(self):  # noqa
         return self.name
@@ -344,6 +403,20 @@ class ArrayType(object):
         if index < 0 or index >= self.nelems:
             raise IndexError("list index out of range")
 
+    def _format(self, nelems):
+        """Returns the Python C struct format code for nelems elements of
+        this ArrayType, e.g. '>256H', or None if elements must be
+        decoded and encoded one at a time (see decode_elem()).
+        """
+        elem_type = self.type
+
+        if type(elem_type) is not PrimitiveType or elem_type.string:
+            return None
+
+        code = elem_type.format
+        order = code[0] if code[0] in "<>" else ">"
+        return "%s%d%s" % (order, nelems, code.lstrip("<>"))
+
     @property
     def name(self):
         """Name of this ArrayType."""
@@ -369,7 +442,7 @@ class ArrayType(object):
         """Type of array elements."""
         return self._type
 
-    def decode(self, bytes, index=None, raw=False):
+    def decode(self, bytes, index=None, raw=False, container="list"):
         """decode(bytes[[, index], raw=False]) -> value1, ..., valueN
 
         Decodes the given sequence of bytes according to this Array's
@@ -378,18 +451,76 @@ class ArrayType(object):
         If the optional `index` parameter is an integer or slice, then
         only the element(s) at the specified position(s) will be
         decoded and returned.
+
+        Arrays of numeric PrimitiveTypes are decoded with a single
+        ``struct.unpack_from()`` (e.g. '>256H'), rather than one element
+        at a time.  Multiple elements are returned as a list, or, if
+        container is "array" or "numpy", as an ``array.array`` or
+        NumPy array, respectively.
         """
         if index is None:
             index = slice(0, self.nelems)
 
-        if isinstance(index, slice):
-            step = 1 if index.step is None else index.step
-            indices = range(index.start, index.stop, step)
+        if not isinstance(index, slice):
+            return self.decode_elem(bytes, index, raw)
+
+        start, stop, step = index.indices(self.nelems)
+        fmt = self._format(max(stop - start, 0))
+
+        if fmt is None or step != 1:
+            indices = range(start, stop, step)
             result = [self.decode_elem(bytes, n, raw) for n in indices]
         else:
-            result = self.decode_elem(bytes, index, raw)
+            offset = start * self.type.nbytes
+            end = offset + struct.calcsize(fmt)
 
-        return result
+            if end > len(bytes):
+                msg = "Decoding %s[%d:%d] requires %d bytes, "
+                msg += "but the ArrayType.decode() method received only %d bytes."
+                values = self.type.name, start, stop, end, len(bytes)
+                raise IndexError(msg % values)
+
+            if container == "numpy":
+                return self._decode_numpy(bytes, fmt, offset)
+
+            result = list(struct.unpack_from(fmt, bytes, offset))
+
+        return self._container(result, container)
+
+    def _container(self, values, container):
+        """Returns the list of decoded values in the given container."""
+        if container == "list":
+            return values
+        elif container == "numpy":
+            import numpy
+
+            return numpy.array(values)
+        elif container == "array":
+            fmt = self._format(len(values))
+
+            if fmt is None:
+                msg = "ArrayType %s cannot be decoded to an array.array."
+                raise TypeError(msg % self.name)
+
+            return array.array(fmt[-1], values)
+
+        raise ValueError("Unknown ArrayType.decode() container '%s'." % container)
+
+    def _decode_numpy(self, bytes, fmt, offset):
+        """Returns a NumPy array of elements decoded according to the
+        given Python C struct format code.
+        """
+        try:
+            import numpy
+        except ImportError:
+            msg = "ArrayType.decode(..., container='numpy') requires NumPy."
+            raise ImportError(msg)
+
+        count = int(fmt[1:-1])
+        values = numpy.frombuffer(bytes, fmt[0] + fmt[-1], count, offset)
+
+        # Don't share memory with data that may change later.
+        return values.copy() if values.flags.writeable else values
 
     def decode_elem(self, bytes, index, raw=False):
         """Decodes a single element at array[index] from a sequence bytes
@@ -416,7 +547,42 @@ class ArrayType(object):
             msg = "ArrayType %s encode() requires %d values, but received %d."
             raise ValueError(msg % (self.name, self.nelems, len(args)))
 
-        return bytearray().join(self.type.encode(arg) for arg in args)
+        fmt = self._format(self.nelems)
+
+        if fmt is None:
+            return bytearray().join(self.type.encode(arg) for arg in args)
+
+        if not self.type.float:
+            args = [int(arg) for arg in args]
+
+        return bytearray(struct.pack(fmt, *args))
+
+    def pack_into(self, buffer, offset, values):
+        """pack_into(buffer, offset, values)
+
+        Encodes the given sequence of values according to this Array's
+        element type directly into the writable buffer, starting at
+        byte offset.  See encode().
+        """
+        fmt = self._format(self.nelems)
+
+        if fmt is None or len(values) != self.nelems:
+            buffer[offset : offset + self.nbytes] = self.encode(*values)
+            return
+
+        if not self.type.float:
+            values = [int(value) for value in values]
+
+        struct.pack_into(fmt, buffer, offset, *values)
+
+    def unpack_from(self, buffer, offset=0, raw=False, container="list"):
+        """unpack_from(buffer, offset=0, raw=False) -> value1, ..., valueN
+
+        Decodes the array starting at byte offset in the given buffer,
+        without copying it out of the buffer first.  See decode().
+        """
+        view = memoryview(buffer)[offset : offset + self.nbytes]
+        return self.decode(view, raw=raw, container=container)
 
     @staticmethod
     def parse(name):
@@ -678,9 +844,21 @@ class Time32Type(PrimitiveType):
         If the optional parameter ``raw`` is ``True``, the integral
         number of seconds will be returned instead.
         """
-        sec = super(Time32Type, self).decode(bytes)
+        sec = self._struct.unpack(bytes)[0]
         return sec if raw else dmc.to_local_time(sec)
 
+    def unpack_gps(self, buffer, offset=0, ns=False):
+        """unpack_gps(buffer, offset=0, ns=False) -> seconds | nanoseconds
+
+        Decodes the time starting at byte offset in the given buffer
+        and returns the elapsed time since the GPS epoch as a number of
+        seconds (float), or, if ``ns`` is ``True``, nanoseconds (int).
+        No Python :class:`datetime` is created, which makes this
+        suitable for sorting and filtering many timestamps.
+        """
+        sec = self._struct.unpack_from(buffer, offset)[0]
+        return sec * 1000000000 if ns else float(sec)
+
 
 class Time40Type(PrimitiveType):
     """Time40Type
@@ -690,6 +868,8 @@ class Time40Type(PrimitiveType):
     the GPS epoch.
     """
 
+    Struct = struct.Struct(">IB")
+
     def __init__(self):
         super(Time40Type, self).__init__("MSB_U32")
 
@@ -712,10 +892,10 @@ class Time40Type(PrimitiveType):
         if not isinstance(value, datetime.datetime):
             raise TypeError("encode() argument must be a Python datetime")
 
-        coarse = Time32Type().encode(value)
-        fine = Time8Type().encode(value.microsecond / 1e6)
+        coarse = dmc.to_gps_seconds(value)
+        fine = int(value.microsecond / 1e6 * 256)
 
-        return coarse + fine
+        return bytearray(self.Struct.pack(coarse, fine))
 
     def decode(self, bytes, raw=False):
         """decode(bytearray, raw=False) -> value
@@ -728,13 +908,29 @@ class Time40Type(PrimitiveType):
         seconds and subseconds will be returned as a floating-point
         number instead.
         """
-        coarse = Time32Type().decode(bytes[:4], raw)
-        fine = Time8Type().decode(bytes[4:])
+        coarse, fine = self.Struct.unpack(bytes)
+        fine /= 256.0
 
-        if not raw:
-            fine = datetime.timedelta(microseconds=fine * 1e6)
+        if raw:
+            return coarse + fine
 
-        return coarse + fine
+        return dmc.to_local_time(coarse, fine * 1e6)
+
+    def unpack_gps(self, buffer, offset=0, ns=False):
+        """unpack_gps(buffer, offset=0, ns=False) -> seconds | nanoseconds
+
+        Decodes the time starting at byte offset in the given buffer
+        and returns the elapsed time since the GPS epoch as a number of
+        seconds (float), or, if ``ns`` is ``True``, nanoseconds (int).
+        See Time32Type.unpack_gps().
+        """
+        coarse, fine = self.Struct.unpack_from(buffer, offset)
+
+        if ns:
+            # 1e9 / 256 is exactly 3906250 nanoseconds.
+            return coarse * 1000000000 + fine * 3906250
+
+        return coarse + fine / 256.0
 
 
 class Time64Type(PrimitiveType):
@@ -745,6 +941,8 @@ class Time64Type(PrimitiveType):
     epoch.
     """
 
+    Struct = struct.Struct(">II")
+
     def __init__(self):
         super(Time64Type, self).__init__("MSB_U64")
 
@@ -765,10 +963,10 @@ class Time64Type(PrimitiveType):
         if not isinstance(value, datetime.datetime):
             raise TypeError("encode() argument must be a Python datetime")
 
-        coarse = Time32Type().encode(value)
-        fine = get("MSB_U32").encode(value.microsecond * 1e3)
+        coarse = dmc.to_gps_seconds(value)
+        fine = int(value.microsecond * 1e3)
 
-        return coarse + fine
+        return bytearray(self.Struct.pack(coarse, fine))
 
     def decode(self, bytes, raw=False):
         """decode(bytearray, False) -> value
@@ -782,15 +980,23 @@ class Time64Type(PrimitiveType):
         seconds and nanoseconds will be returned as a floating-point
         number instead.
         """
-        coarse = Time32Type().decode(bytes[:4], raw)
-        fine = get("MSB_U32").decode(bytes[4:])
+        coarse, fine = self.Struct.unpack(bytes)
 
         if raw:
-            fine /= 1e9
-        else:
-            fine = datetime.timedelta(microseconds=fine / 1e3)
+            return coarse + fine / 1e9
+
+        return dmc.to_local_time(coarse, fine / 1e3)
 
-        return coarse + fine
+    def unpack_gps(self, buffer, offset=0, ns=False):
+        """unpack_gps(buffer, offset=0, ns=False) -> seconds | nanoseconds
+
+        Decodes the time starting at byte offset in the given buffer
+        and returns the elapsed time since the GPS epoch as a number of
+        seconds (float), or, if ``ns`` is ``True``, nanoseconds (int).
+        See Time32Type.unpack_gps().
+        """
+        coarse, fine = self.Struct.unpack_from(buffer, offset)
+        return coarse * 1000000000 + fine if ns else coarse + fine / 1e9
 
 
 # ComplexTypeMap
@@ -17,13 +17,26 @@ This module, pcap.py, is a library to read/write PCAP-formatted files with
 simple open, read, write, close functions.  (PCAP - packet capture)
 """
 
+import array
+import bisect
 import builtins
 import calendar
+import collections
+import concurrent.futures
+import functools
+import heapq
+import io
 import math
+import mmap
+import os
+import shutil
 import struct
+import sys
+import tempfile
+import time
 import datetime
 
-from .dmc import get_timestamp_utc
+from .dmc import get_timestamp_utc, to_unix_ns
 from ait.core import log
 
 """
@@ -181,10 +194,41 @@ class PCapPacketHeader:
         """Packet timestamp as a float, a combination of ts_sec and ts_usec"""
         return float(self.ts_sec) + (float(self.ts_usec) / 1e6)
 
+    @property
+    def ts_ns(self):
+        """Packet timestamp as an integer number of nanoseconds since the
+        Unix epoch.  Unlike timestamp, no Python Datetime is created.
+        """
+        return self.ts_sec * 1000000000 + self.ts_usec * 1000
+
     def incomplete(self):
         """Indicates whether or not this PCapGlobalHeader is incomplete."""
         return len(self) < self._size
 
+    @classmethod
+    def unpack_from(cls, buffer, offset=0, swap=None):
+        """Creates a new PCapPacketHeader from the packet header data at
+        byte offset in the given buffer (e.g. a memoryview).  Unlike
+        the constructor, the current time is never queried, which
+        makes this suitable for reading many packet headers.
+        """
+        if swap is None:
+            swap = "@"
+
+        header = cls.__new__(cls)
+        header._format = "IIII"
+        header._size = 16
+        header._swap = swap
+        header._data = buffer[offset : offset + 16]
+
+        if len(header._data) >= 16:
+            values = struct.unpack_from(swap + "IIII", buffer, offset)
+        else:
+            values = None, None, None, None
+
+        header.ts_sec, header.ts_usec, header.incl_len, header.orig_len = values
+        return header
+
     def read(self, stream):
         """Reads PCapPacketHeader data from the given stream."""
         self._data = stream.read(self._size)
@@ -206,7 +250,16 @@ class PCapRolloverStream:
     times, file size, or number of packets.
     """
 
-    def __init__(self, format, nbytes=None, npackets=None, nseconds=None, dryrun=False):
+    def __init__(
+        self,
+        format,
+        nbytes=None,
+        npackets=None,
+        nseconds=None,
+        dryrun=False,
+        index=False,
+        **buffering,
+    ):
         """Creates a new :class:`PCapRolloverStream` with the given
         thresholds.
 
@@ -242,10 +295,19 @@ class PCapRolloverStream:
         :param nseconds:  Rollover after nseconds have elapsed between
                           the first and last packet timestamp in the file.
         :param dryrun:    Simulate file writes and output log messages.
+        :param index:     Write a PCapIndex sidecar file for each file.
+
+        Any other keyword arguments (``buffered``, ``flush_nbytes``,
+        etc.) are passed to each :class:`PCapStream` opened.  Pending
+        packets are written whenever a file is closed.
         """
+        self._buffering = buffering
         self._dryrun = dryrun
         self._filename = None
         self._format = format
+        self._index = None
+        self._indexing = index and not dryrun
+        self._offset = 0
         self._startTime = None
         self._stream = None
         self._threshold = PCapFileStats(nbytes, npackets, nseconds)
@@ -297,12 +359,20 @@ class PCapRolloverStream:
                 self._stream = True
                 self._total.nbytes += len(PCapGlobalHeader().pack())
             else:
-                self._stream = open(self._filename, "w")
+                self._stream = open(self._filename, "w", **self._buffering)
                 self._total.nbytes += len(self._stream.header.pack())
+                self._offset = len(self._stream.header.pack())
+
+                if self._indexing:
+                    self._index = PCapIndex(self._filename)
 
         if not self._dryrun:
             self._stream.write(bytes, header)
 
+        if self._index is not None:
+            self._index.add(self._offset, header.ts_ns)
+            self._offset += len(header) + header.incl_len
+
         self._total.nbytes += len(bytes) + len(header)
         self._total.npackets += 1
         self._total.nseconds = header.ts - self._startTime
@@ -312,6 +382,25 @@ class PCapRolloverStream:
 
         return header.incl_len
 
+    def write_many(self, packets):
+        """Writes each of the given packets, which may be either a byte
+        array or a (byte array, header) tuple.  See write().
+        """
+        nbytes = 0
+
+        for packet in packets:
+            if type(packet) is tuple:
+                nbytes += self.write(*packet)
+            else:
+                nbytes += self.write(packet)
+
+        return nbytes
+
+    def flush(self):
+        """Writes any pending packets to the current file."""
+        if self._stream and not self._dryrun:
+            self._stream.flush()
+
     def close(self):
         """Closes this :class:``PCapStream`` by closing the underlying Python
         stream."""
@@ -331,7 +420,16 @@ class PCapRolloverStream:
 
             log.info(msg.format(*values))
 
+            if self._index is not None:
+                try:
+                    self._index.stat()
+                    self._index.save()
+                except OSError as e:
+                    msg = "Could not save pcap index %s: %s"
+                    log.error(msg % (self._index.idxname, e))
+
             self._filename = None
+            self._index = None
             self._startTime = None
             self._stream = None
             self._total = PCapFileStats(0, 0, 0)
@@ -344,14 +442,37 @@ class PCapStream:
     open(), read(), write(), and close() methods to read and write
     pcap-formatted files.
 
+    By default, each packet written is flushed to the underlying
+    stream immediately.  A ``buffered`` PCapStream instead collects
+    written packets in memory and writes them all at once when any of
+    the flush thresholds is reached:
+
+      - ``flush_nbytes`` bytes are pending (default: 65536),
+      - ``flush_npackets`` packets are pending (default: none), or
+      - the oldest pending packet was written ``flush_nseconds``
+        seconds ago (default: 1.0).
+
+    Thresholds are checked when packets are written, so an idle
+    buffered PCapStream must be flushed explicitly (see flush()).
+    Pending packets are always written by flush() and close().
+
     See:
 
         https://wiki.wireshark.org/Development/LibpcapFileFormat
     """
 
-    def __init__(self, stream, mode="rb"):
+    def __init__(
+        self,
+        stream,
+        mode="rb",
+        buffered=False,
+        flush_nbytes=None,
+        flush_npackets=None,
+        flush_nseconds=None,
+    ):
         """Creates a new PCapStream, which wraps the underlying Python stream,
-        already opened in the given mode.
+        already opened in the given mode.  See PCapStream for the
+        buffered write mode and flush thresholds.
         """
         if mode.startswith("r"):
             self.header = PCapGlobalHeader(stream)
@@ -360,6 +481,15 @@ class PCapStream:
             stream.write(self.header.pack())
 
         self._stream = stream
+        self._buffer = bytearray()
+        self._buffered = buffered
+        self._pending = PCapFileStats(0, 0, None)
+        self._threshold = PCapFileStats(flush_nbytes, flush_npackets, flush_nseconds)
+        self._packer = struct.Struct("IIII")
+
+        if buffered and flush_nbytes is None and flush_nseconds is None:
+            self._threshold.nbytes = 65536
+            self._threshold.nseconds = 1.0
 
     def __enter__(self):
         """A PCapStream provies a Python Context Manager interface."""
@@ -410,22 +540,580 @@ class PCapStream:
         if type(bytes) is str:
             bytes = bytearray(bytes, "ISO-8859-1")
 
-        if not isinstance(header, PCapPacketHeader):
-            header = PCapPacketHeader(orig_len=len(bytes))
+        if isinstance(header, PCapPacketHeader):
+            incl_len = header.incl_len
+            data = header.pack()
+        else:
+            ts_sec, ts_usec = get_timestamp_utc()
+            orig_len = len(bytes)
+            incl_len = min(orig_len, 65535)
+            data = self._packer.pack(ts_sec, ts_usec, incl_len, orig_len)
 
-        packet = bytes[0 : header.incl_len]
+        packet = bytes[0:incl_len]
+
+        if self._buffered:
+            self._append(data + packet, 1)
+        else:
+            self._stream.write(data)
+            self._stream.write(packet)
+            self._stream.flush()
+
+        return incl_len
+
+    def write_many(self, packets):
+        """Writes each of the given packets to the file, just as write()
+        would, but with a single write (and, if not buffered, flush) to
+        the underlying stream.  Each packet may be either a byte array or
+        a (byte array, header) tuple.  Packets without a header are all
+        given the current time.  Returns the total number of packet bytes
+        written.
+        """
+        data = bytearray()
+        nbytes = 0
+        npackets = 0
+        ts = None
+
+        for packet in packets:
+            if type(packet) is tuple:
+                packet, header = packet
+            else:
+                header = None
+
+            if type(packet) is str:
+                packet = bytearray(packet, "ISO-8859-1")
+
+            if isinstance(header, PCapPacketHeader):
+                incl_len = header.incl_len
+                data += header.pack()
+            else:
+                if ts is None:
+                    ts = get_timestamp_utc()
+                orig_len = len(packet)
+                incl_len = min(orig_len, 65535)
+                data += self._packer.pack(ts[0], ts[1], incl_len, orig_len)
+
+            data += packet[0:incl_len]
+            nbytes += incl_len
+            npackets += 1
+
+        if self._buffered:
+            self._append(data, npackets)
+        else:
+            self._stream.write(data)
+            self._stream.flush()
+
+        return nbytes
+
+    def _append(self, data, npackets):
+        """Appends the given data, containing npackets packets, to the
+        pending packets and flushes them if any flush threshold is
+        reached.
+        """
+        pending = self._pending
+        threshold = self._threshold
+
+        if pending.npackets == 0:
+            pending.nseconds = time.monotonic()
+
+        self._buffer += data
+        pending.nbytes += len(data)
+        pending.npackets += npackets
+
+        if (
+            (threshold.nbytes is not None and pending.nbytes >= threshold.nbytes)
+            or (
+                threshold.npackets is not None
+                and pending.npackets >= threshold.npackets
+            )
+            or (
+                threshold.nseconds is not None
+                and time.monotonic() - pending.nseconds >= threshold.nseconds
+            )
+        ):
+            self.flush()
+
+    def flush(self):
+        """Writes any pending (buffered) packets and flushes the
+        underlying Python stream.
+        """
+        if self._buffer:
+            self._stream.write(self._buffer)
+            self._buffer = bytearray()
+            self._pending = PCapFileStats(0, 0, None)
 
-        self._stream.write(header.pack())
-        self._stream.write(packet)
         self._stream.flush()
 
-        return header.incl_len
+    def close(self):
+        """Closes this PCapStream by closing the underlying Python stream,
+        after writing any pending packets.
+        """
+        if self._buffer:
+            self.flush()
+
+        self._stream.close()
+
+
+class PCapMmapStream:
+    """PCapMmapStream
+
+    PCapMmapStream reads a pcap-formatted file through a read-only
+    memory map.  It provides the same read(), next(), iterator and
+    context manager interface as a PCapStream opened for reading, but
+    packet headers are unpacked in place and packets are returned as
+    ``memoryview`` slices of the mapping, without being copied.
+    Packets remain valid only while the stream is open; copy them
+    (e.g. ``bytes(packet)``) to keep them after close().
+
+    A PCapMmapStream also supports random access by packet number,
+    e.g. ``stream[n]`` and ``len(stream)``.  The byte offset of each
+    packet is recorded in an index as the file is scanned, so each
+    part of the file is scanned at most once.
+
+    Only the data in the file when it was opened is mapped.  A
+    truncated final packet (e.g. one still being written) is treated
+    as the end of the file.
+    """
+
+    def __init__(self, stream):
+        """Creates a new PCapMmapStream, which maps the given Python
+        stream, already opened in binary read mode.
+        """
+        self._stream = stream
+
+        if os.fstat(stream.fileno()).st_size > 0:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = memoryview(self._map)
+        else:
+            self._map = None
+            self._data = memoryview(b"")
+
+        self.header = PCapGlobalHeader(io.BytesIO(self._data[:24]))
+        self._incl_len = struct.Struct(self.header._swap + "I")
+        self._offsets = array.array("Q")
+        self._scanned = len(self.header)
+        self._pos = 0
+
+    def __enter__(self):
+        """A PCapMmapStream provies a Python Context Manager interface."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """A PCapMmapStream provies a Python Context Manager interface."""
+        self.close()
+
+    def __getitem__(self, index):
+        """Returns the (PCapPacketHeader, packet) tuple for the given
+        packet number.  Negative numbers count back from the last
+        packet.
+        """
+        if index < 0:
+            index += len(self)
+
+        if index < 0 or (index >= len(self._offsets) and not self._scan(index)):
+            raise IndexError("pcap packet index out of range")
+
+        return self._packet(self._offsets[index])
+
+    def __len__(self):
+        """Returns the number of packets in this PCapMmapStream."""
+        self._scan()
+        return len(self._offsets)
+
+    def __next__(self):
+        """Provides Python 3 iterator compatibility.  See next()."""
+        return self.next()
+
+    def __iter__(self):
+        """A PCapMmapStream provides a Python iterator interface.
+        Iteration starts at the current packet number (see seek()) and
+        advances it, just as read() does.
+        """
+        data = self._data
+        offsets = self._offsets
+        swap = self.header._swap
+        unpack_from = PCapPacketHeader.unpack_from
+
+        while True:
+            pos = self._pos
+
+            if pos >= len(offsets):
+                # Index packets ahead in batches, rather than one at a time.
+                self._scan(pos + 1023)
+                if pos >= len(offsets):
+                    return
+
+            header = unpack_from(data, offsets[pos], swap)
+            start = offsets[pos] + 16
+            self._pos = pos + 1
+
+            yield header, data[start : start + header.incl_len]
+
+    def _packet(self, offset):
+        """Returns the (PCapPacketHeader, packet) tuple for the packet
+        whose header starts at the given byte offset.
+        """
+        header = PCapPacketHeader.unpack_from(self._data, offset, self.header._swap)
+        start = offset + header._size
+        return header, self._data[start : start + header.incl_len]
+
+    def _scan(self, index=None):
+        """Extends the packet index through the given packet number, or
+        to the end of the file if index is None.  Returns True if the
+        given packet number is in the file, False otherwise.
+        """
+        data = self._data
+        end = len(data)
+        offset = self._scanned
+        offsets = self._offsets
+        unpack_from = self._incl_len.unpack_from
+
+        while (index is None or len(offsets) <= index) and offset + 16 <= end:
+            stop = offset + 16 + unpack_from(data, offset + 8)[0]
+
+            if stop > end:
+                break
+
+            offsets.append(offset)
+            offset = stop
+
+        self._scanned = offset
+        return index is None or index < len(offsets)
+
+    def headers(self, offset=None):
+        """Yields an ``(offset, ts_sec, ts_usec, incl_len, orig_len)``
+        tuple for each packet, starting with the packet header at the
+        given byte offset (default: the first packet).  Headers are
+        unpacked in place and no objects are created, which makes this
+        the fastest way to scan a file.
+        """
+        data = self._data
+        end = len(data)
+        unpack_from = struct.Struct(self.header._swap + "IIII").unpack_from
+
+        if offset is None:
+            offset = len(self.header)
+
+        while offset + 16 <= end:
+            values = unpack_from(data, offset)
+            stop = offset + 16 + values[2]
+
+            if stop > end:
+                break
+
+            yield (offset,) + values
+            offset = stop
+
+    def next(self):
+        """Returns the next header and packet from this
+        PCapMmapStream. See read().
+        """
+        header, packet = self.read()
+
+        if packet is None:
+            raise StopIteration
+
+        return header, packet
+
+    def read(self):
+        """Reads a single packet from the this pcap stream, returning a
+        tuple (PCapPacketHeader, packet).  The packet is a memoryview,
+        or None when there are no more packets.
+        """
+        if self._pos >= len(self._offsets) and not self._scan(self._pos):
+            return PCapPacketHeader.unpack_from(b""), None
+
+        header, packet = self._packet(self._offsets[self._pos])
+        self._pos += 1
+
+        return header, packet
+
+    def read_at(self, offset):
+        """Reads the packet whose header starts at the given byte offset
+        and returns a tuple (PCapPacketHeader, packet), just as read()
+        does.  The current packet number (see seek()) is unaffected.
+        """
+        header = PCapPacketHeader.unpack_from(self._data, offset, self.header._swap)
+        start = offset + 16
+
+        if header.incomplete() or start + header.incl_len > len(self._data):
+            return header, None
+
+        return header, self._data[start : start + header.incl_len]
+
+    def seek(self, index):
+        """Positions this PCapMmapStream so that the next read() returns
+        the given packet number.
+        """
+        self._pos = index
+
+    def tell(self):
+        """Returns the packet number the next read() will return."""
+        return self._pos
 
     def close(self):
-        """Closes this PCapStream by closing the underlying Python stream."""
+        """Closes this PCapMmapStream by closing the memory map and the
+        underlying Python stream.
+        """
+        self._data.release()
+
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Packets handed out are still in use; the mapping is
+                # closed when the last of them is released.
+                pass
+
         self._stream.close()
 
 
+class PCapIndex:
+    """PCapIndex
+
+    A PCapIndex summarizes the packet (ground receipt) times in a pcap
+    file, so that time range queries need not scan the whole file.  It
+    records:
+
+      - the number of packets and the first, last, minimum and
+        maximum packet times,
+      - the time and byte offset of every ``interval``-th packet,
+      - whether or not packet times never decrease (``sorted``), and
+      - each pair of consecutive packet times more than ``gap_ns``
+        nanoseconds apart.
+
+    Times are integer nanoseconds since the Unix epoch (see
+    PCapPacketHeader.ts_ns).  A PCapIndex is saved to a sidecar file
+    (the pcap filename plus ``Suffix``) along with the size and
+    modification time of the pcap file, and is ignored once either
+    changes.  See get_index().
+    """
+
+    Suffix = ".idx"
+    Magic = b"AITPIX01"
+    Header = struct.Struct("<8sQqQIIqqqqqQQ")
+    Interval = 1024
+    GapNs = 1000000000
+
+    def __init__(self, filename, interval=None, gap_ns=None):
+        """Creates a new, empty PCapIndex for the given pcap filename.
+        The ``interval`` and ``gap_ns`` default to ``Interval`` and
+        ``GapNs``, respectively.
+        """
+        self.filename = filename
+        self.interval = self.Interval if interval is None else interval
+        self.gap_ns = self.GapNs if gap_ns is None else gap_ns
+        self.size = None
+        self.mtime_ns = None
+        self.npackets = 0
+        self.sorted = True
+        self.first_ns = None
+        self.last_ns = None
+        self.min_ns = None
+        self.max_ns = None
+        self.sample_ns = array.array("q")
+        self.sample_offsets = array.array("Q")
+        self.gaps = array.array("q")
+
+    @property
+    def idxname(self):
+        """The sidecar index filename"""
+        return self.filename + self.Suffix
+
+    def add(self, offset, ts_ns):
+        """Adds the packet with the given time, whose header starts at
+        the given byte offset, to this PCapIndex.  Packets must be
+        added in file order.
+        """
+        if self.npackets % self.interval == 0:
+            self.sample_ns.append(ts_ns)
+            self.sample_offsets.append(offset)
+
+        if self.npackets == 0:
+            self.first_ns = self.min_ns = self.max_ns = ts_ns
+        else:
+            if ts_ns < self.last_ns:
+                self.sorted = False
+            if ts_ns - self.last_ns > self.gap_ns:
+                self.gaps.extend((self.last_ns, ts_ns))
+            if ts_ns < self.min_ns:
+                self.min_ns = ts_ns
+            elif ts_ns > self.max_ns:
+                self.max_ns = ts_ns
+
+        self.last_ns = ts_ns
+        self.npackets += 1
+
+    @classmethod
+    def build(cls, filename, **kwargs):
+        """Creates a new PCapIndex by scanning the given pcap file."""
+        index = cls(filename, **kwargs)
+        index.stat()
+
+        with open(filename, "r", mmap=True) as stream:
+            add = index.add
+            for offset, ts_sec, ts_usec, _, _ in stream.headers():
+                add(offset, ts_sec * 1000000000 + ts_usec * 1000)
+
+        return index
+
+    def current(self):
+        """Indicates whether or not this PCapIndex matches the current
+        size and modification time of its pcap file.
+        """
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return False
+
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    @classmethod
+    def load(cls, filename):
+        """Loads the sidecar PCapIndex for the given pcap file.  Returns
+        None if there is no sidecar file, or if it is unreadable or no
+        longer current.
+        """
+        index = cls(filename)
+
+        try:
+            with builtins.open(index.idxname, "rb") as stream:
+                data = stream.read()
+
+            values = cls.Header.unpack_from(data)
+            if values[0] != cls.Magic:
+                return None
+
+            (
+                _,
+                index.size,
+                index.mtime_ns,
+                index.npackets,
+                index.interval,
+                flags,
+                index.gap_ns,
+                index.first_ns,
+                index.last_ns,
+                index.min_ns,
+                index.max_ns,
+                nsamples,
+                ngaps,
+            ) = values
+
+            offset = cls.Header.size
+            for name, count in (
+                ("sample_ns", nsamples),
+                ("sample_offsets", nsamples),
+                ("gaps", 2 * ngaps),
+            ):
+                values = getattr(index, name)
+                stop = offset + count * values.itemsize
+                if stop > len(data):
+                    return None
+                values.frombytes(data[offset:stop])
+                if sys.byteorder != "little":
+                    values.byteswap()
+                offset = stop
+        except (OSError, ValueError, struct.error):
+            return None
+
+        index.sorted = bool(flags & 1)
+
+        if index.npackets == 0:
+            index.first_ns = index.last_ns = index.min_ns = index.max_ns = None
+
+        return index if index.current() else None
+
+    def offset(self, start_ns):
+        """Returns the byte offset at which to start scanning for packets
+        at or after start_ns.  Every packet before the offset is earlier
+        than start_ns.  The PCapIndex must not be empty.
+        """
+        pos = 0
+
+        if self.sorted:
+            pos = max(bisect.bisect_left(self.sample_ns, start_ns) - 1, 0)
+
+        return self.sample_offsets[pos]
+
+    def overlaps(self, start_ns, end_ns):
+        """Indicates whether or not any packet time may be in the range
+        [start_ns, end_ns].  Either may be None (unbounded).
+        """
+        if self.npackets == 0:
+            return False
+
+        return (start_ns is None or self.max_ns >= start_ns) and (
+            end_ns is None or self.min_ns <= end_ns
+        )
+
+    def ranges(self, tolerance_ns):
+        """Returns the list of (start_ns, stop_ns) time ranges in the pcap
+        file, split wherever consecutive packets are more than
+        tolerance_ns apart.  See times().  The tolerance may not be less
+        than gap_ns.
+        """
+        if tolerance_ns < self.gap_ns:
+            msg = "tolerance %d ns is less than the index gap of %d ns"
+            raise ValueError(msg % (tolerance_ns, self.gap_ns))
+
+        ranges = []
+
+        if self.npackets > 0:
+            start = self.first_ns
+            gaps = self.gaps
+
+            for n in range(0, len(gaps), 2):
+                if gaps[n + 1] - gaps[n] > tolerance_ns:
+                    ranges.append((start, gaps[n]))
+                    start = gaps[n + 1]
+
+            ranges.append((start, self.last_ns))
+
+        return ranges
+
+    def save(self):
+        """Saves this PCapIndex to its sidecar file."""
+        header = self.Header.pack(
+            self.Magic,
+            self.size,
+            self.mtime_ns,
+            self.npackets,
+            self.interval,
+            1 if self.sorted else 0,
+            self.gap_ns,
+            self.first_ns or 0,
+            self.last_ns or 0,
+            self.min_ns or 0,
+            self.max_ns or 0,
+            len(self.sample_ns),
+            len(self.gaps) // 2,
+        )
+
+        tmpname = self.idxname + ".tmp"
+        try:
+            with builtins.open(tmpname, "wb") as stream:
+                stream.write(header)
+                for values in (self.sample_ns, self.sample_offsets, self.gaps):
+                    if sys.byteorder != "little":
+                        values = array.array(values.typecode, values)
+                        values.byteswap()
+                    stream.write(values.tobytes())
+
+            os.replace(tmpname, self.idxname)
+        except OSError:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+            raise
+
+    def stat(self):
+        """Records the current size and modification time of the pcap
+        file, against which this PCapIndex is validated when loaded.
+        """
+        st = os.stat(self.filename)
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+
+
 def open(filename, mode="r", **options):
     """Returns an instance of a :class:`PCapStream` class which contains
     the ``read()``, ``write()``, and ``close()`` methods.  Binary mode
@@ -435,31 +1123,244 @@ def open(filename, mode="r", **options):
     If the optiontal ``rollover`` parameter is True, a
     :class:`PCapRolloverStream` is created instead.  In that case
     ``filename`` is treated as a ``strftime(3)`` format string and
-    ``nbytes``, ``npackets``, ``nseconds``, and ``dryrun`` parameters
-    may also be specified.  See :class:``PCapRolloverStream`` for more
+    ``nbytes``, ``npackets``, ``nseconds``, ``dryrun``, and ``index``
+    parameters may also be specified.  See :class:``PCapRolloverStream`` for more
     information.
 
     NOTE: :class:`PCapRolloverStream` is always opened in write mode
     ("wb") and supports only ``write()`` and ``close()``, not
     ``read()``.
+
+    If the optional ``mmap`` parameter is True and the file is opened
+    for reading, a :class:`PCapMmapStream` is created instead.
+
+    The optional ``buffered``, ``flush_nbytes``, ``flush_npackets``,
+    and ``flush_nseconds`` parameters select the buffered write mode
+    of :class:`PCapStream` (also for each file written by a
+    :class:`PCapRolloverStream`).
     """
     mode = mode.replace("b", "") + "b"
-
-    if options.get("rollover", False):
+    buffering = {
+        name: options[name]
+        for name in ("buffered", "flush_nbytes", "flush_npackets", "flush_nseconds")
+        if name in options
+    }
+
+    if options.get("mmap", False) and mode.startswith("r"):
+        stream = PCapMmapStream(builtins.open(filename, mode))
+    elif options.get("rollover", False):
         stream = PCapRolloverStream(
             filename,
             options.get("nbytes", None),
             options.get("npackets", None),
             options.get("nseconds", None),
             options.get("dryrun", False),
+            options.get("index", False),
+            **buffering,
         )
     else:
-        stream = PCapStream(builtins.open(filename, mode), mode)
+        stream = PCapStream(builtins.open(filename, mode), mode, **buffering)
 
     return stream
 
 
-def query(starttime, endtime, output=None, *filenames):
+def get_index(filename, build=True):
+    """Returns the PCapIndex for the given pcap file, loaded from its
+    sidecar file if current.  Otherwise, if ``build`` is True, the
+    PCapIndex is built by scanning the file and saved to its sidecar
+    file.  None is returned if there is no current PCapIndex and it is
+    not built, or cannot be saved (e.g. in a read-only directory), in
+    which case callers scan the pcap file instead.
+    """
+    index = PCapIndex.load(filename)
+
+    if index is None and build:
+        dirname = os.path.dirname(filename) or os.curdir
+        if not os.access(dirname, os.W_OK):
+            return None
+
+        index = PCapIndex.build(filename)
+        try:
+            index.save()
+        except OSError as e:
+            log.debug("Could not save pcap index %s: %s" % (index.idxname, e))
+            return None
+
+    return index
+
+
+def packets(filename, start_ns=None, end_ns=None, index=True):
+    """Yields (PCapPacketHeader, packet) tuples for the packets in the
+    given pcap file, optionally only those whose time (see
+    PCapPacketHeader.ts_ns) is in the range [start_ns, end_ns].
+    Packets are memoryviews (see PCapMmapStream).
+
+    If ``index`` is True and a time range is given, the file's
+    PCapIndex (see get_index()) is used to skip files wholly outside
+    the range, to start scanning near start_ns and, if packet times
+    never decrease, to stop scanning after end_ns.
+    """
+    ranged = start_ns is not None or end_ns is not None
+    pcapindex = get_index(filename) if index and ranged else None
+
+    if pcapindex is not None and not pcapindex.overlaps(start_ns, end_ns):
+        return
+
+    with open(filename, "r", mmap=True) as stream:
+        offset = len(stream.header)
+        stop_early = False
+
+        if pcapindex is not None:
+            if start_ns is not None:
+                offset = pcapindex.offset(start_ns)
+            stop_early = pcapindex.sorted and end_ns is not None
+
+        while True:
+            header, packet = stream.read_at(offset)
+
+            if packet is None:
+                break
+
+            offset += len(header) + header.incl_len
+
+            if ranged:
+                ts_ns = header.ts_ns
+
+                if end_ns is not None and ts_ns > end_ns:
+                    if stop_early:
+                        break
+                    continue
+
+                if start_ns is not None and ts_ns < start_ns:
+                    continue
+
+            yield header, packet
+
+
+def map_files(func, filenames, jobs=1):
+    """Yields ``func(filename)`` for each of the given files, in order.
+
+    If ``jobs`` is more than one (or None, for one per CPU), files are
+    processed concurrently by that many worker processes (see
+    ``concurrent.futures.ProcessPoolExecutor``).  In that case
+    ``func`` and its results must be picklable, e.g. a module-level
+    function or a ``functools.partial`` of one, and results should be
+    small (e.g. the name of a temporary file holding a large result).
+    """
+    if jobs == 1 or len(filenames) < 2:
+        for filename in filenames:
+            yield func(filename)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        for result in executor.map(func, filenames):
+            yield result
+
+
+def merge_iters(sources):
+    """Yields the items of one or more sources merged in key order,
+    where each source is a ``(first_key, opener)`` tuple and
+    ``opener()`` returns an iterable of ``(key, item)`` tuples, the
+    first of which has ``first_key``.  Items with equal keys are
+    yielded in source order.  Each source should be in key order
+    itself.
+
+    A source is only opened once the merge reaches its first key, so
+    only sources that overlap in key range are open at the same time
+    (e.g. one or two files of an hourly pcap archive), not every
+    source.
+    """
+    sources = sorted(enumerate(sources), key=lambda s: (s[1][0], s[0]))
+    heap = []
+    pending = 0
+
+    def push(n, iterator):
+        for key, item in iterator:
+            heapq.heappush(heap, (key, n, item, iterator))
+            break
+
+    while heap or pending < len(sources):
+        while pending < len(sources) and (
+            not heap or sources[pending][1][0] <= heap[0][0]
+        ):
+            n, (_, opener) = sources[pending]
+            push(n, iter(opener()))
+            pending += 1
+
+        if heap:
+            _, n, item, iterator = heapq.heappop(heap)
+            yield item
+            push(n, iterator)
+
+
+def merge(filenames, output, dedupe=False):
+    """Merges the packets of the given pcap file(s) into a new pcap
+    file, in timestamp order (see PCapPacketHeader.ts_ns).  Packets
+    with equal timestamps are written in the order of the given files.
+    Each file is read as a stream (see merge_iters()), so memory use
+    grows with the number of files, not their size, but each file
+    should be in timestamp order itself.
+
+    If ``dedupe`` is not False (or None), a packet is dropped when its
+    payload duplicates that of a packet written at most ``dedupe``
+    seconds earlier (True for one second), e.g. the same packet
+    captured by redundant ground stations.
+
+    :param filenames: Single filename (string) or list of filenames
+    :param output:    The name of the output pcap file
+    :param dedupe:    Duplicate payload suppression window in seconds
+
+    :returns: The number of packets written.
+    """
+    if isinstance(filenames, str):
+        filenames = [filenames]
+
+    sources = []
+
+    for filename in filenames:
+        with open(filename, "r") as stream:
+            header, packet = stream.read()
+
+        if packet is not None:
+            sources.append((header.ts_ns, functools.partial(_timed_packets, filename)))
+
+    window_ns = None
+    if dedupe is not False and dedupe is not None:
+        window_ns = int(dedupe * 1000000000)
+
+    seen = set()
+    window = collections.deque()
+    npackets = 0
+    nduplicates = 0
+
+    with open(output, "w", buffered=True) as outfile:
+        for header, packet in merge_iters(sources):
+            if window_ns is not None:
+                ts_ns = header.ts_ns
+
+                while window and window[0][0] < ts_ns - window_ns:
+                    seen.remove(window.popleft()[1])
+
+                payload = bytes(packet)
+                if payload in seen:
+                    nduplicates += 1
+                    continue
+
+                seen.add(payload)
+                window.append((ts_ns, payload))
+
+            outfile.write(packet, header=header)
+            npackets += 1
+
+    log.info(
+        "pcap.merge: wrote %d packets to %s (%d duplicates dropped)."
+        % (npackets, output, nduplicates)
+    )
+
+    return npackets
+
+
+def query(starttime, endtime, output=None, *filenames, index=True, jobs=1):
     """Given a time range and input file, query creates a new file with only
     that subset of data. If no outfile name is given, the new file name is the
     old file name with the time range appended.
@@ -474,6 +1375,17 @@ def query(starttime, endtime, output=None, *filenames):
             [first filename in filenames][starttime]-[endtime].pcap
         filenames:
             A tuple of one or more file names to extract data from.
+        index:
+            Optional: Whether or not to use (and build) each file's
+            PCapIndex, which saves a sidecar ``.idx`` file next to
+            each file whose directory is writable.  See packets().
+            Defaults to True.
+        jobs:
+            Optional: The number of worker processes to filter files
+            with concurrently (None for one per CPU).  If more than
+            one, packets are written in timestamp order across files
+            (see merge_iters()), rather than file by file.  Defaults
+            to 1.
     """
 
     if not output:
@@ -487,16 +1399,91 @@ def query(starttime, endtime, output=None, *filenames):
     else:
         output = output
 
-    with open(output, "w") as outfile:
-        for filename in filenames:
-            log.info("pcap.query: processing %s..." % filename)
-            with open(filename, "r") as stream:
-                for header, packet in stream:
-                    if packet is not None:
-                        if (
-                                starttime <= header.timestamp <= endtime
-                        ):
-                            outfile.write(packet, header=header)
+    # Compare integer timestamps, rather than creating a datetime for
+    # every packet.
+    start_ns = to_unix_ns(starttime)
+    end_ns = to_unix_ns(endtime)
+
+    if jobs == 1 or len(filenames) < 2:
+        with open(output, "w") as outfile:
+            for filename in filenames:
+                log.info("pcap.query: processing %s..." % filename)
+                for header, packet in packets(filename, start_ns, end_ns, index):
+                    outfile.write(packet, header=header)
+        return
+
+    # Each worker writes the packets in range from one file to a
+    # temporary pcap file (next to the output, which may be large).
+    # These are then merged in timestamp order, or simply copied when
+    # their time range does not overlap any other.
+    tmpdir = os.path.dirname(os.path.abspath(output))
+
+    with tempfile.TemporaryDirectory(dir=tmpdir) as tmpdir:
+        func = functools.partial(
+            _query_file, start_ns=start_ns, end_ns=end_ns, index=index, tmpdir=tmpdir
+        )
+        results = [r for r in map_files(func, filenames, jobs) if r is not None]
+        results.sort(key=lambda r: r[2])
+        clusters = []
+
+        for result in results:
+            if clusters and result[2] <= clusters[-1][0]:
+                clusters[-1][0] = max(clusters[-1][0], result[3])
+                clusters[-1][1].append(result)
+            else:
+                clusters.append([result[3], [result]])
+
+        with open(output, "w", buffered=True) as outfile:
+            for _, cluster in clusters:
+                if len(cluster) == 1:
+                    outfile.flush()
+                    with builtins.open(cluster[0][0], "rb") as stream:
+                        stream.seek(len(outfile.header))
+                        shutil.copyfileobj(stream, outfile._stream)
+                    continue
+
+                sources = [
+                    (first_ns, functools.partial(_timed_packets, tmpname))
+                    for tmpname, first_ns, _min_ns, _max_ns in cluster
+                ]
+                for header, packet in merge_iters(sources):
+                    outfile.write(packet, header=header)
+
+
+def _query_file(filename, start_ns, end_ns, index, tmpdir):
+    """Writes the packets of the given pcap file in the time range
+    [start_ns, end_ns] to a new temporary pcap file in tmpdir and
+    returns ``(tmpname, first_ns, min_ns, max_ns)`` with the times of
+    the first, earliest and latest packets written, or None if there
+    are none.  See query().
+    """
+    log.info("pcap.query: processing %s..." % filename)
+    fd, tmpname = tempfile.mkstemp(suffix=".pcap", dir=tmpdir)
+    first_ns = min_ns = max_ns = None
+
+    with PCapStream(builtins.open(fd, "wb"), "wb", buffered=True) as stream:
+        for header, packet in packets(filename, start_ns, end_ns, index):
+            ts_ns = header.ts_ns
+            if first_ns is None:
+                first_ns = min_ns = max_ns = ts_ns
+            elif ts_ns < min_ns:
+                min_ns = ts_ns
+            elif ts_ns > max_ns:
+                max_ns = ts_ns
+            stream.write(packet, header)
+
+    if first_ns is None:
+        return None
+
+    return tmpname, first_ns, min_ns, max_ns
+
+
+def _timed_packets(filename):
+    """Yields (ts_ns, (PCapPacketHeader, packet)) tuples for the packets
+    in the given pcap file.  See merge_iters().
+    """
+    for header, packet in packets(filename):
+        yield header.ts_ns, (header, packet)
 
 
 def segment(filenames, format, **options):
@@ -512,6 +1499,7 @@ def segment(filenames, format, **options):
     :param nseconds:  Rollover after N seconds have elapsed between
                       the first and last packet timestamp in the file.
     :param dryrun:    Simulate file writes and output log messages.
+    :param index:     Write a PCapIndex sidecar file for each segment.
     """
     output = open(format, rollover=True, **options)
 
@@ -519,42 +1507,74 @@ def segment(filenames, format, **options):
         filenames = [filenames]
 
     for filename in filenames:
-        with open(filename, "r") as stream:
+        with open(filename, "r", mmap=True) as stream:
             for header, packet in stream:
                 output.write(packet, header)
 
     output.close()
 
 
-def times(filenames, tolerance=2):
+def times(filenames, tolerance=2, index=True, jobs=1):
     """For the given file(s), return the time ranges available.  Tolerance
     sets the number of seconds between time ranges.  Any gaps larger
     than tolerance seconds will result in a new time range.
 
+    If ``index`` is True and the tolerance is at least
+    ``PCapIndex.GapNs`` (one second), time ranges are read from each file's PCapIndex
+    (see get_index()), rather than by scanning the file.
+
     :param filenames: Single filename (string) or list of filenames
     :param tolerance: Maximum seconds between contiguous time ranges
+    :param index:     Use (and build) the PCapIndex of each file
+    :param jobs:      Number of worker processes to scan files with
+                      concurrently (None for one per CPU)
 
     :returns: A dictionary keyed by filename, with each value a list
     of (start, stop) time ranges for that file.
     """
-    times = {}
-    delta = datetime.timedelta(seconds=tolerance)
-
     if isinstance(filenames, str):
         filenames = [filenames]
 
-    for filename in filenames:
-        with open(filename, "r") as stream:
-            times[filename] = list()
-            header, packet = stream.read()
-            start, stop = header.timestamp, header.timestamp
+    func = functools.partial(_file_times, tolerance=tolerance, index=index)
+    return dict(zip(filenames, map_files(func, filenames, jobs)))
+
+
+def _file_times(filename, tolerance, index):
+    """Returns the list of (start, stop) time ranges for the given
+    file.  See times().
+    """
+    ranges = []
+    delta = datetime.timedelta(seconds=tolerance)
+    tolerance_ns = tolerance * 1000000000
 
-            for header, _packet in stream:
-                if header.timestamp - stop > delta:
-                    times[filename].append((start, stop))
-                    start = header.timestamp
-                stop = header.timestamp
+    pcapindex = None
+    if index and tolerance_ns >= PCapIndex.GapNs:
+        pcapindex = get_index(filename)
 
-            times[filename].append((start, stop))
+    if pcapindex is not None and tolerance_ns >= pcapindex.gap_ns:
+        return [
+            (_timestamp(start), _timestamp(stop))
+            for start, stop in pcapindex.ranges(tolerance_ns)
+        ]
 
-    return times
+    with open(filename, "r", mmap=True) as stream:
+        header, packet = stream.read()
+        start, stop = header.timestamp, header.timestamp
+
+        for header, _packet in stream:
+            if header.timestamp - stop > delta:
+                ranges.append((start, stop))
+                start = header.timestamp
+            stop = header.timestamp
+
+        ranges.append((start, stop))
+
+    return ranges
+
+
+def _timestamp(ts_ns):
+    """Returns the given time in nanoseconds since the Unix epoch as a
+    Python Datetime, exactly as PCapPacketHeader.timestamp would.
+    """
+    ts_sec, ts_usec = divmod(ts_ns // 1000, 1000000)
+    return datetime.datetime.utcfromtimestamp(float(ts_sec) + (float(ts_usec) / 1e6))
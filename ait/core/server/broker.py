@@ -1,22 +1,46 @@
 import zmq.green as zmq
 import gevent
 import gevent.monkey
+import gevent.threadpool
 
 gevent.monkey.patch_all()
 
 from typing import List, Any
 
+from zmq import Context as NativeContext
+
 import ait.core
 import ait.core.server
 from ait.core import log
+from . import utils
 from .config import ZmqConfig
 
+# From libzmq 4.3.5 zmq.proxy_steerable() replies to every command on
+# its control socket, so requires a socket that can send (REP), while
+# earlier versions never reply and so require one that does not (PULL).
+CONTROL_REPLIES = zmq.zmq_version_info() >= (4, 3, 5)
+CONTROL_TIMEOUT = 1000
+
 
 class Broker(gevent.Greenlet):
     """
     This broker contains the ZeroMQ context and proxy that connects all
     streams and plugins to each other through publish-subscribe sockets.
     This broker subscribes all ZMQ clients to their input topics.
+
+    By default (``server.broker.mode: greenlet``) messages are forwarded
+    by this greenlet.  With ``server.broker.mode: thread`` they are
+    instead forwarded by ``zmq.proxy_steerable()`` in a native thread,
+    without passing through Python.  In thread mode the proxy may
+    additionally publish a copy of every message on a capture socket
+    (``server.broker.capture``, e.g. for a metrics tap), and accept
+    PAUSE, RESUME and TERMINATE commands on a control socket
+    (``server.broker.control``, a REP socket with libzmq 4.3.5 or later
+    and a PULL socket with earlier versions).
+
+    ``server.broker.socket_options`` may set the ``sndhwm``, ``rcvhwm``
+    and ``linger`` options of the XSUB and XPUB sockets (see
+    utils.set_socket_options()).
     """
 
     inbound_streams: List[Any] = []
@@ -28,6 +52,18 @@ class Broker(gevent.Greenlet):
         self.context = zmq.Context()
         self.XSUB_URL = ZmqConfig.get_xsub_url()
         self.XPUB_URL = ZmqConfig.get_xpub_url()
+        self.mode = ZmqConfig.get_broker_mode()
+        self.capture_url = ZmqConfig.get_broker_capture_url()
+        self.control_url = ZmqConfig.get_broker_control_url()
+        self.socket_options = ZmqConfig.get_broker_socket_options()
+        self.forwarded = 0
+
+        if self.mode not in ("greenlet", "thread"):
+            raise ValueError(f"Unknown broker mode {self.mode}")
+
+        # Internal endpoint used to control a thread mode proxy
+        self._control_inproc = f"inproc://ait-broker-control-{id(self)}"
+        self._control = None
 
         # Name of the topic associated with external commands
         self.command_topic = ait.config.get("command.topic", ait.DEFAULT_CMD_TOPIC)
@@ -35,6 +71,10 @@ class Broker(gevent.Greenlet):
         gevent.Greenlet.__init__(self)
 
     def _run(self):
+        if self.mode == "thread":
+            self._run_thread()
+            return
+
         self._setup_proxy()
         self._subscribe_all()
 
@@ -46,6 +86,7 @@ class Broker(gevent.Greenlet):
             if socks.get(self.frontend) == zmq.POLLIN:
                 message = self.frontend.recv_multipart()
                 self.backend.send_multipart(message)
+                self.forwarded += 1
 
             if socks.get(self.backend) == zmq.POLLIN:
                 message = self.backend.recv_multipart()
@@ -53,15 +94,122 @@ class Broker(gevent.Greenlet):
 
     def _setup_proxy(self):
         self.frontend = self.context.socket(zmq.XSUB)
+        utils.set_socket_options(self.frontend, self.socket_options)
         self.frontend.bind(self.XSUB_URL)
 
         self.backend = self.context.socket(zmq.XPUB)
+        utils.set_socket_options(self.backend, self.socket_options)
         self.backend.bind(self.XPUB_URL)
 
         self.poller = zmq.Poller()
         self.poller.register(self.frontend, zmq.POLLIN)
         self.poller.register(self.backend, zmq.POLLIN)
 
+    def _run_thread(self):
+        self._subscribe_all()
+
+        log.info("Starting broker proxy thread...")
+        pool = gevent.threadpool.ThreadPool(1)
+        proxy = pool.spawn(self._proxy)
+
+        try:
+            proxy.get()
+            log.info("Broker proxy thread stopped")
+        finally:
+            # Stop the proxy if this greenlet is killed
+            if not proxy.ready():
+                self.terminate()
+                proxy.wait()
+            pool.kill()
+            if self._control is not None:
+                self._control.close(linger=0)
+                self._control = None
+
+    def _proxy(self):
+        """
+        Runs zmq.proxy_steerable() between the XSUB and XPUB sockets
+        until a TERMINATE command is received.  Called in a native
+        thread, so uses (non-green) sockets created in that thread,
+        and must not log.
+        """
+        context = NativeContext.shadow(self.context.underlying)
+        sockets = []
+
+        def socket(socket_type, *urls, options=None):
+            sock = context.socket(socket_type)
+            sockets.append(sock)
+            utils.set_socket_options(sock, options)
+            for url in urls:
+                sock.bind(url)
+            return sock
+
+        try:
+            frontend = socket(zmq.XSUB, self.XSUB_URL, options=self.socket_options)
+            backend = socket(zmq.XPUB, self.XPUB_URL, options=self.socket_options)
+            capture = None
+            if self.capture_url:
+                capture = socket(zmq.PUB, self.capture_url)
+            control_urls = [self._control_inproc]
+            if self.control_url:
+                control_urls.append(self.control_url)
+            control = socket(zmq.REP if CONTROL_REPLIES else zmq.PULL, *control_urls)
+
+            zmq.proxy_steerable(frontend, backend, capture, control)
+        finally:
+            for sock in sockets:
+                sock.close(linger=0)
+
+    def _send_control(self, command):
+        """
+        Sends a command (PAUSE, RESUME or TERMINATE) to a thread mode
+        proxy, waiting for the proxy's reply where libzmq sends one.
+        """
+        if self.mode != "thread":
+            raise ValueError("Broker control requires broker mode thread")
+
+        if self._control is None:
+            self._control = self.context.socket(
+                zmq.REQ if CONTROL_REPLIES else zmq.PUSH
+            )
+            self._control.connect(self._control_inproc)
+
+        self._control.send(command)
+
+        if CONTROL_REPLIES:
+            if self._control.poll(CONTROL_TIMEOUT):
+                self._control.recv_multipart()
+            else:
+                # A REQ socket cannot send again until it has a reply
+                self._control.close(linger=0)
+                self._control = None
+                log.warn(f"No reply from broker proxy to {command.decode()}")
+
+    def pause(self):
+        """
+        Suspends forwarding of messages by a thread mode proxy (not
+        reliably honoured by libzmq 4.3.5, which acknowledges the
+        command but may keep forwarding, or hold back messages until
+        the proxy next sees traffic).
+        """
+        self._send_control(b"PAUSE")
+
+    def resume(self):
+        """Resumes forwarding of messages by a thread mode proxy."""
+        self._send_control(b"RESUME")
+
+    def terminate(self):
+        """Stops a thread mode proxy, ending the broker."""
+        self._send_control(b"TERMINATE")
+
+    def stats(self):
+        """
+        Returns a dict of the broker mode and the number of messages
+        it has forwarded from publishers to subscribers (None in thread
+        mode, where messages do not pass through Python).
+        """
+        forwarded = self.forwarded if self.mode == "greenlet" else None
+        return {"mode": self.mode, "forwarded": forwarded}
+
     def _subscribe_all(self):
         """
         Subscribes all streams to their input.
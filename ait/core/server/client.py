@@ -18,19 +18,47 @@ class ZMQClient(object):
     This is the base ZeroMQ client class that all streams and plugins
     inherit from. It opens a ZMQ PUB socket to publish messages to
     and publishes to it.
+
+    Messages are pickled when published unless ``wire_format`` is
+    ``binary``, in which case bytes-like messages are sent in the
+    binary wire format (see utils.encode_message()).  TaggedPackets
+    are always sent in the binary wire format.
+
+    When ``batch`` is set, published messages are coalesced per topic
+    and sent as a single multipart batch (see utils.encode_batch())
+    once the batch holds ``batch["count"]`` messages (default 100) or
+    ``batch["bytes"]`` bytes of payload, or ``batch["latency"]``
+    seconds (default 0.01) after its first message was published.
+
+    ``socket_options`` may set the ``sndhwm``, ``rcvhwm`` and ``linger``
+    options of the client's sockets (see utils.set_socket_options()).
+    The number of messages received, processed, published and dropped
+    by the client are reported by stats().
     """
 
+    wire_format = "pickle"
+    batch = None
+    socket_options = None
+
     def __init__(
         self,
         zmq_context,
         zmq_proxy_xsub_url=ait.SERVER_DEFAULT_XSUB_URL,
         zmq_proxy_xpub_url=ait.SERVER_DEFAULT_XPUB_URL,
+        socket_options=None,
         **kwargs,
     ):
 
         self.context = zmq_context
+        self._batches = {}
+        self._counters = dict.fromkeys(
+            ("received", "processed", "published", "dropped"), 0
+        )
+        if socket_options is not None:
+            self.socket_options = socket_options
         # open PUB socket & connect to broker
         self.pub = self.context.socket(zmq.PUB)
+        utils.set_socket_options(self.pub, self.socket_options)
         self.pub.connect(zmq_proxy_xsub_url.replace("*", "localhost"))
         if 'listener' in kwargs and isinstance(kwargs['listener'], int) :
             kwargs['listener'] = "127.0.0.1:"+str(kwargs['listener'])
@@ -47,14 +75,89 @@ class ZMQClient(object):
         """
         if not topic:
             topic = self.name
-        msg = utils.encode_message(topic, msg)
-        if msg is None:
+        binary = self.wire_format == "binary"
+
+        if self.batch:
+            self._publish_batched(msg, topic, binary)
+            return
+
+        enc = utils.encode_message(topic, msg, binary=binary)
+        if enc is None:
             log.error(f"{self} unable to encode msg {msg} for send.")
+            self._counters["dropped"] += 1
             return
 
-        self.pub.send_multipart(msg)
+        self._send(enc)
+        self._counters["published"] += 1
         log.debug("Published message from {}".format(self))
 
+    def _publish_batched(self, msg, topic, binary):
+        try:
+            frames = utils.encode_frames(msg, binary)
+        # TODO: This should be way less generic than Exception
+        except Exception:
+            log.error(f"{self} unable to encode msg {msg} for send.")
+            self._counters["dropped"] += 1
+            return
+
+        batch = self._batches.get(topic)
+        if batch is None:
+            latency = self.batch.get("latency", 0.01)
+            batch = self._batches[topic] = {
+                "frames": [],
+                "bytes": 0,
+                "timer": gevent.spawn_later(latency, self.flush, topic),
+            }
+
+        batch["frames"].append(frames)
+        batch["bytes"] += len(frames[1])
+
+        max_bytes = self.batch.get("bytes", None)
+        if len(batch["frames"]) >= self.batch.get("count", 100) or (
+            max_bytes and batch["bytes"] >= max_bytes
+        ):
+            self.flush(topic)
+
+    def flush(self, topic=None):
+        """
+        Sends the messages batched for topic, or for every topic if
+        the topic parameter is not provided.
+        """
+        topics = list(self._batches) if topic is None else [topic]
+
+        for topic in topics:
+            batch = self._batches.pop(topic, None)
+            if batch is None:
+                continue
+
+            if batch["timer"] is not gevent.getcurrent():
+                batch["timer"].kill(block=False)
+
+            frames = batch["frames"]
+            if len(frames) == 1:
+                self._send([bytes(topic, "utf-8")] + frames[0])
+            else:
+                self._send(utils.encode_batch(topic, frames))
+            self._counters["published"] += len(frames)
+            log.debug(f"Published batch of {len(frames)} messages from {self}")
+
+    def _send(self, enc):
+        # Frames large enough to be sent without copying are released
+        # by pyzmq's garbage collector thread, a greenlet once gevent
+        # has monkey patched threading, so callers must yield to the hub
+        self.pub.send_multipart(enc, copy=False)
+
+    def stats(self):
+        """
+        Returns a dict of the number of messages received, processed,
+        published and dropped (invalid, conflated or unable to be
+        encoded) by this client, and the number queued awaiting
+        publication in batches.
+        """
+        stats = dict(self._counters)
+        stats["queued"] = sum(len(b["frames"]) for b in self._batches.values())
+        return stats
+
     def process(self, input_data, topic=None):
         """This method must be implemented by all streams and plugins that
         inherit from ZMQClient. It is called whenever a message is received.
@@ -72,6 +175,18 @@ class ZMQClient(object):
             )
         )
 
+    def process_batch(self, messages, topic=None):
+        """Called whenever a batch of messages is received (see publish()).
+        Calls process() on each message in turn unless overridden, e.g.
+        by plugins able to handle a whole batch more efficiently.
+
+        Params:
+            messages:    list of messages received by client
+            topic:       name of component messages received from
+        """
+        for message in messages:
+            self.process(message, topic=topic)
+
 
 class ZMQInputClient(ZMQClient, gevent.Greenlet):
     """
@@ -80,6 +195,19 @@ class ZMQInputClient(ZMQClient, gevent.Greenlet):
     ZMQ messages from the input streams it is subscribed to and stays
     open to receiving those messages, calling the process method
     on all messages received.
+
+    TaggedPackets received in the binary wire format are passed to
+    process() as is when ``wire_format`` is ``binary``, and are
+    otherwise pickled as (uid, data) tuples for compatibility with
+    clients expecting the pickled handler output.
+
+    Batches are passed to process_batch() as a list of messages.
+
+    With ``socket_options["conflate"]`` set, every message already
+    queued is received before any are processed, and only the latest
+    message from each topic is processed, for clients that only need
+    the latest value.  (ZMQ_CONFLATE itself does not support the
+    multipart messages sent by ZMQClient.)
     """
 
     def __init__(
@@ -87,16 +215,19 @@ class ZMQInputClient(ZMQClient, gevent.Greenlet):
         zmq_context,
         zmq_proxy_xsub_url=ait.SERVER_DEFAULT_XSUB_URL,
         zmq_proxy_xpub_url=ait.SERVER_DEFAULT_XPUB_URL,
+        socket_options=None,
         **kwargs,
     ):
 
         super(ZMQInputClient, self).__init__(
-            zmq_context, zmq_proxy_xsub_url, zmq_proxy_xpub_url
+            zmq_context, zmq_proxy_xsub_url, zmq_proxy_xpub_url, socket_options
         )
 
         self.context = zmq_context
         self.sub = self.context.socket(zmq.SUB)
+        utils.set_socket_options(self.sub, self.socket_options)
         self.sub.connect(zmq_proxy_xpub_url.replace("*", "localhost"))
+        self._conflate = bool((self.socket_options or {}).get("conflate", False))
 
         gevent.Greenlet.__init__(self)
 
@@ -105,13 +236,13 @@ class ZMQInputClient(ZMQClient, gevent.Greenlet):
             while True:
                 gevent.sleep(0)
                 msg = self.sub.recv_multipart()
-                topic, message = utils.decode_message(msg)
-                if topic is None or message is None:
-                    log.error(f"{self} received invalid topic or message. Skipping")
+                if self._conflate:
+                    self._process_latest(msg)
                     continue
 
-                log.debug("{} received message from {}".format(self, topic))
-                self.process(message, topic=topic)
+                topic, messages = self._decode(msg)
+                if messages is not None:
+                    self._process_messages(messages, topic)
 
         except Exception as e:
             log.error(
@@ -119,6 +250,55 @@ class ZMQInputClient(ZMQClient, gevent.Greenlet):
             )
             raise (e)
 
+    def _decode(self, msg):
+        topic, messages = utils.decode_messages(msg)
+        if topic is None or messages is None:
+            log.error(f"{self} received invalid topic or message. Skipping")
+            self._counters["received"] += 1
+            self._counters["dropped"] += 1
+            return (None, None)
+
+        self._counters["received"] += len(messages)
+        log.debug("{} received message from {}".format(self, topic))
+        return (topic, messages)
+
+    def _process_latest(self, msg):
+        """
+        Receives every message queued, then processes only the latest
+        message received from each topic.
+        """
+        latest = {}
+
+        while msg is not None:
+            topic, messages = self._decode(msg)
+            if messages is not None:
+                self._counters["dropped"] += len(messages) - 1
+                if topic in latest:
+                    self._counters["dropped"] += 1
+                latest[topic] = messages[-1:]
+
+            try:
+                msg = self.sub.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                msg = None
+
+        for topic, messages in latest.items():
+            self._process_messages(messages, topic)
+
+    def _process_messages(self, messages, topic):
+        if self.wire_format != "binary":
+            messages = [
+                utils.pickle_packet(m) if isinstance(m, utils.TaggedPacket) else m
+                for m in messages
+            ]
+
+        if len(messages) == 1:
+            self.process(messages[0], topic=topic)
+        else:
+            self.process_batch(messages, topic=topic)
+
+        self._counters["processed"] += len(messages)
+
 
 class PortOutputClient(ZMQInputClient):
     """
@@ -136,7 +316,10 @@ class PortOutputClient(ZMQInputClient):
     ):
 
         super(PortOutputClient, self).__init__(
-            zmq_context, zmq_proxy_xsub_url, zmq_proxy_xpub_url
+            zmq_context,
+            zmq_proxy_xsub_url,
+            zmq_proxy_xpub_url,
+            kwargs.get("socket_options", None),
         )
         self.out_port = kwargs["output"]
         self.context = zmq_context
@@ -144,7 +327,10 @@ class PortOutputClient(ZMQInputClient):
         self.pub = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
     def publish(self, msg):
+        if isinstance(msg, utils.TaggedPacket):
+            msg = utils.pickle_packet(msg)
         self.pub.sendto(msg, ("localhost", int(self.out_port)))
+        self._counters["published"] += 1
         log.debug("Published message from {}".format(self))
 
 
@@ -168,6 +354,7 @@ class PortInputClient(ZMQClient, gs.DatagramServer):
                 zmq_context,
                 zmq_proxy_xsub_url,
                 zmq_proxy_xpub_url,
+                kwargs.get("socket_options", None),
                 listener=int(kwargs["input"][0]),
             )
         else:
@@ -179,4 +366,6 @@ class PortInputClient(ZMQClient, gs.DatagramServer):
     def handle(self, packet, address):
         # This function provided for gs.DatagramServer class
         log.debug("{} received message from port {}".format(self, address))
+        self._counters["received"] += 1
         self.process(packet)
+        self._counters["processed"] += 1
@@ -13,3 +13,19 @@ class ZmqConfig:
     @staticmethod
     def get_xpub_url():
         return ait.config.get("server.xpub", ait.SERVER_DEFAULT_XPUB_URL)
+
+    @staticmethod
+    def get_broker_mode():
+        return ait.config.get("server.broker.mode", "greenlet")
+
+    @staticmethod
+    def get_broker_capture_url():
+        return ait.config.get("server.broker.capture", None)
+
+    @staticmethod
+    def get_broker_control_url():
+        return ait.config.get("server.broker.control", None)
+
+    @staticmethod
+    def get_broker_socket_options():
+        return ait.config.get("server.broker.socket_options", None)
@@ -3,6 +3,7 @@ import binascii
 import ait.core.log
 
 from ait.core.server.handler import Handler
+from ait.core.server import utils
 from ait.core import tlm
 
 
@@ -29,14 +30,23 @@ class CCSDSPacketHandler(Handler):
                                      For example, 'XXXXX1011XXX' means only bits 6-9 represent the APID
             packet_secondary_header_length: (optional) Length of secondary header in octets.
                                                        Defaults to 0.
+            wire_format:  (optional) "binary" to output a TaggedPacket, sent
+                                     over 0MQ without pickling, or "pickle".
+                                     Defaults to "pickle".
         Raises:
             ValueError:   If packet in config is not present in default tlm dict.
+                          If wire_format is not "binary" or "pickle".
         """
         super(CCSDSPacketHandler, self).__init__(input_type, output_type)
         self.packet_types = kwargs["packet_types"]
         self.packet_secondary_header_length = kwargs.get(
             "packet_secondary_header_length", 0
         )
+        self.wire_format = kwargs.get("wire_format", "pickle")
+
+        if self.wire_format not in ("binary", "pickle"):
+            msg = "CCSDSPacketHandler: Unknown wire_format {}".format(self.wire_format)
+            raise ValueError(msg)
 
         # Check if all packet names in config are in telemetry dictionary
         tlm_dict = tlm.getDefaultDict()
@@ -53,7 +63,8 @@ class CCSDSPacketHandler(Handler):
         Params:
             packet:    CCSDS packet
         Returns:
-            tuple of packet UID and packet data field
+            tuple of packet UID and packet data field, pickled unless
+            wire_format is "binary"
         """
 
         # Check if packet length is at least 7 bytes
@@ -95,6 +106,9 @@ class CCSDSPacketHandler(Handler):
         udf_start = primary_header_length + self.packet_secondary_header_length
         user_data_field = input_data[udf_start : udf_start + udf_length + 1]
 
+        if self.wire_format == "binary":
+            return utils.TaggedPacket(packet_uid, user_data_field)
+
         return pickle.dumps((packet_uid, user_data_field), 2)
 
     def comp_apid(self, server_apid):
@@ -1,6 +1,7 @@
 import pickle
 
 from ait.core.server.handler import Handler
+from ait.core.server import utils
 from ait.core import tlm
 
 
@@ -14,12 +15,21 @@ class PacketHandler(Handler):
                                      validate handler workflow. Defaults to None
             **kwargs:
                 packet:   (required) Name of packet, present in default tlm dict.
+                wire_format: (optional) "binary" to output a TaggedPacket,
+                                        sent over 0MQ without pickling, or
+                                        "pickle". Defaults to "pickle".
         Raises:
             ValueError:    If packet is not present in kwargs.
                            If packet is specified but not present in default tlm dict.
+                           If wire_format is not "binary" or "pickle".
         """
         super(PacketHandler, self).__init__(input_type, output_type)
         self.packet = kwargs.get("packet", None)
+        self.wire_format = kwargs.get("wire_format", "pickle")
+
+        if self.wire_format not in ("binary", "pickle"):
+            msg = "PacketHandler: Unknown wire_format {}".format(self.wire_format)
+            raise ValueError(msg)
 
         if not self.packet:
             msg = 'PacketHandler: No packet name provided in handler config as key "packet"'
@@ -40,6 +50,10 @@ class PacketHandler(Handler):
         Params:
             input_data:   message received by stream
         Returns:
-            tuple of packet UID and message received by stream
+            tuple of packet UID and message received by stream, pickled
+            unless wire_format is "binary"
         """
+        if self.wire_format == "binary":
+            return utils.TaggedPacket(self._pkt_defn.uid, input_data)
+
         return pickle.dumps((self._pkt_defn.uid, input_data), 2)
@@ -13,7 +13,6 @@
 # information to foreign countries or providing access to foreign persons.
 
 from collections import defaultdict
-import pickle
 import importlib
 
 import gevent
@@ -23,10 +22,14 @@ gevent.monkey.patch_all()
 
 import ait.core  # noqa
 from ait.core import log, tlm
+from ait.core.server import utils
 from ait.core.server.plugin import Plugin
 
 
 class DataArchive(Plugin):
+    # Receive tagged packets from binary wire format handlers unpickled
+    wire_format = "binary"
+
     def __init__(
         self, inputs, outputs, datastore="ait.core.db.InfluxDBBackend", **kwargs
     ):
@@ -83,10 +86,33 @@ class DataArchive(Plugin):
             **kwargs:    any args required for connected to the backend
         """
         try:
-            load = pickle.loads(input_data)
-            uid, pkt = int(load[0]), load[1]
+            uid, pkt = utils.load_packet(input_data)
             defn = self.packet_dict[uid]
-            decoded = tlm.Packet(defn, data=bytearray(pkt))
+            decoded = tlm.Packet(defn, data=pkt)
             self.dbconn.insert(decoded, **kwargs)
         except Exception as e:
             log.error("Data archival failed with error: {}.".format(e))
+
+    def process_batch(self, messages, topic=None, **kwargs):
+        """
+        Decodes a batch of packets, as process() does, and inserts them
+        into the database backend together.
+
+        Params:
+            messages:    list of messages received from inbound stream
+            topic:       name of inbound stream messages received from
+            **kwargs:    any args required for connected to the backend
+        """
+        packets = []
+
+        for input_data in messages:
+            try:
+                uid, pkt = utils.load_packet(input_data)
+                packets.append(tlm.Packet(self.packet_dict[uid], data=pkt))
+            except Exception as e:
+                log.error("Data archival failed with error: {}.".format(e))
+
+        try:
+            self.dbconn.insert_many(packets, **kwargs)
+        except Exception as e:
+            log.error("Data archival failed with error: {}.".format(e))
@@ -13,7 +13,6 @@
 # information to foreign countries or providing access to foreign persons.
 
 from collections import defaultdict
-import pickle
 
 import gevent
 import gevent.monkey
@@ -22,10 +21,14 @@ gevent.monkey.patch_all()
 
 import ait.core
 from ait.core import limits, log, notify, tlm
+from ait.core.server import utils
 from ait.core.server.plugin import Plugin
 
 
 class TelemetryLimitMonitor(Plugin):
+    # Receive tagged packets from binary wire format handlers unpickled
+    wire_format = "binary"
+
     def __init__(self, inputs, outputs, **kwargs):
         super(TelemetryLimitMonitor, self).__init__(inputs, outputs, **kwargs)
 
@@ -48,10 +51,9 @@ class TelemetryLimitMonitor(Plugin):
 
     def process(self, input_data, topic=None, **kwargs):
         try:
-            load = pickle.loads(input_data)
-            pkt_id, pkt_data = int(load[0]), load[1]
+            pkt_id, pkt_data = utils.load_packet(input_data)
             packet = self.packet_dict[pkt_id]
-            decoded = tlm.Packet(packet, data=bytearray(pkt_data))
+            decoded = tlm.Packet(packet, data=pkt_data)
         except Exception as e:
             log.error("TelemetryLimitMonitor: {}".format(e))
             log.error(
@@ -21,7 +21,6 @@ framework for realtime and, eventually, historical telemetry
 from AIT.
 """
 
-import pickle
 import datetime
 import json
 import random
@@ -41,6 +40,7 @@ import importlib
 
 import ait.core
 from ait.core import api, dtype, log, tlm
+from ait.core.server import utils
 from ait.core.server.plugin import Plugin
 
 
@@ -351,6 +351,9 @@ class AITOpenMctPlugin(Plugin):
 
     DEFAULT_WS_EMPTY_MESSAGE = json.dumps(dict())  # Empty Json string
 
+    # Receive tagged packets from binary wire format handlers unpickled
+    wire_format = "binary"
+
     def __init__(
         self,
         inputs,
@@ -497,12 +500,11 @@ class AITOpenMctPlugin(Plugin):
         processed = False
 
         try:
-            pkl_load = pickle.loads(input_data)
-            pkt_id, pkt_data = int(pkl_load[0]), pkl_load[1]
+            pkt_id, pkt_data = utils.load_packet(input_data)
             packet_def = self._get_tlm_packet_def(pkt_id)
             if packet_def:
                 packet_def = self._uidToPktDefMap[pkt_id]
-                tlm_packet = tlm.Packet(packet_def, data=bytearray(pkt_data))
+                tlm_packet = tlm.Packet(packet_def, data=pkt_data)
                 self._process_telem_msg(tlm_packet)
                 processed = True
             else:
@@ -951,7 +953,7 @@ class AITOpenMctPlugin(Plugin):
                     random_num, random_num, random_num, random_num, random_num
                 )
 
-            tlm_pkt = tlm.Packet(ait_pkt_defn, data=bytearray(dummy_data))
+            tlm_pkt = tlm.Packet(ait_pkt_defn, data=dummy_data)
             self._process_telem_msg(tlm_pkt)
 
             info_msg = (
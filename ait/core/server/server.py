@@ -1,5 +1,6 @@
 import gevent
 import gevent.monkey
+import zmq.green as zmq
 
 from importlib import import_module
 import sys
@@ -11,6 +12,7 @@ from .config import ZmqConfig
 from .broker import Broker
 from .plugin import PluginType, Plugin, PluginConfig
 from .process import PluginsProcess
+from . import utils
 from ait.core import log, cfg
 
 gevent.monkey.patch_all()
@@ -70,8 +72,42 @@ class Server(object):
         # Subscribe process-plugin output streams to plugin names
         self._subscribe_process_plugins_outputs()
 
+        interval = ait.config.get("server.stats.interval", None)
+        if interval:
+            topic = ait.config.get("server.stats.topic", ait.DEFAULT_STATS_TOPIC)
+            gevent.spawn(self._publish_stats, float(interval), topic)
+
         gevent.joinall(self.greenlets)
 
+    def stats(self):
+        """
+        Returns a dict of the broker's stats and the stats of each
+        stream and plugin running in this process (see
+        ZMQClient.stats()), by name.  Plugins running in separate
+        plugin processes are not included.
+        """
+        return {
+            "broker": self.broker.stats(),
+            "streams": {
+                stream.name: stream.stats()
+                for stream in self.servers
+                + self.inbound_streams
+                + self.outbound_streams
+            },
+            "plugins": {plugin.name: plugin.stats() for plugin in self.plugins},
+        }
+
+    def _publish_stats(self, interval, topic):
+        """
+        Publishes stats() on the given topic every interval seconds.
+        """
+        pub = self.broker.context.socket(zmq.PUB)
+        pub.connect(ZmqConfig.get_xsub_url().replace("*", "localhost"))
+
+        while True:
+            gevent.sleep(interval)
+            pub.send_multipart(utils.encode_message(topic, self.stats()))
+
     def _subscribe_process_plugins_outputs(self):
         """
         While each PluginsProcess performs its own subscription setup for
@@ -263,22 +299,28 @@ class Server(object):
 
         # Create ZMQ args re-using the Broker's context
         zmq_args_dict = self._create_zmq_args(True)
+        zmq_args_dict["socket_options"] = config.get("socket_options", None)
 
         if type(stream_input[0]) is int:
-            return PortInputStream(
+            istream = PortInputStream(
                 name,
                 stream_input,
                 stream_handlers,
                 zmq_args=zmq_args_dict,
             )
         else:
-            return ZMQStream(
+            istream = ZMQStream(
                 name,
                 stream_input,
                 stream_handlers,
                 zmq_args=zmq_args_dict,
             )
 
+        # Set the optional publish batching for the stream
+        istream.batch = config.get("batch", None)
+
+        return istream
+
     def _create_outbound_stream(self, config=None):
         """
         Creates an outbound stream from its config.
@@ -306,6 +348,7 @@ class Server(object):
 
         # Create ZMQ args re-using the Broker's context
         zmq_args_dict = self._create_zmq_args(True)
+        zmq_args_dict["socket_options"] = config.get("socket_options", None)
 
         if type(stream_output) is int:
             ostream = PortOutputStream(
@@ -328,6 +371,7 @@ class Server(object):
 
         # Set the cmd subscriber field for the stream
         ostream.cmd_subscriber = stream_cmd_sub is True
+        ostream.batch = config.get("batch", None)
 
         return ostream
 
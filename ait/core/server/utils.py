@@ -13,10 +13,34 @@
 # information to foreign countries or providing access to foreign persons.
 
 
+import collections
 import pickle
+import struct
+import time
 
+import zmq
 
-def encode_message(topic, data):
+
+TaggedPacket = collections.namedtuple("TaggedPacket", "uid data")
+TaggedPacket.__doc__ = """A packet UID and its raw data, as produced by
+PacketHandler and CCSDSPacketHandler when configured with
+``wire_format: binary``.  TaggedPackets are sent over 0MQ in the binary
+wire format (see encode_message()) rather than being pickled.
+"""
+
+#: Binary wire format header: version, message type, two pad bytes,
+#: packet UID and the send time in nanoseconds since the Unix epoch.
+WIRE_HEADER = struct.Struct("!BBxxIq")
+WIRE_VERSION = 1
+
+#: Binary wire format message types
+MSG_RAW = 0
+MSG_PACKET = 1
+MSG_PICKLE = 2
+MSG_BATCH = 3
+
+
+def encode_message(topic, data, binary=False):
     """Encode a message for sending via 0MQ
 
     Given a string topic name and a pickle-able data object, encode and prep
@@ -28,11 +52,27 @@ def encode_message(topic, data):
             Pickled data object
         ]
 
+    TaggedPackets, and bytes-like data when binary is True, are instead
+    encoded in the binary wire format, which avoids pickling the payload:
+        [
+            Bytes object of String (UTF-8),
+            WIRE_HEADER (version, type, uid, timestamp),
+            Raw payload
+        ]
+
+    The payload frame references the packet data rather than copying
+    it, so it is suitable for `send_multipart(..., copy=False)`.
+
     If encoding fails None will be returned.
 
     """
     try:
-        enc = [bytes(topic, "utf-8"), pickle.dumps(data)]
+        if isinstance(data, TaggedPacket) or (
+            binary and isinstance(data, (bytes, bytearray, memoryview))
+        ):
+            enc = [bytes(topic, "utf-8")] + encode_frames(data, binary)
+        else:
+            enc = [bytes(topic, "utf-8"), pickle.dumps(data)]
     # TODO: This should be way less generic than Exception
     except Exception:
         enc = None
@@ -40,27 +80,178 @@ def encode_message(topic, data):
     return enc
 
 
+def encode_frames(data, binary=False):
+    """Encode a message as binary wire format header and payload frames
+
+    As encode_message(), except that the data is always preceded by a
+    WIRE_HEADER frame, whose type is MSG_PICKLE if the data was pickled.
+    Used to build batches (see encode_batch()).
+
+    Returns a list of the form:
+        [
+            WIRE_HEADER (version, type, uid, timestamp),
+            Raw payload or pickled data object
+        ]
+
+    Raises any exception raised pickling the data.
+    """
+    ts_ns = time.time_ns()
+
+    if isinstance(data, TaggedPacket):
+        header = WIRE_HEADER.pack(WIRE_VERSION, MSG_PACKET, data.uid, ts_ns)
+        return [header, data.data]
+
+    if binary and isinstance(data, (bytes, bytearray, memoryview)):
+        return [WIRE_HEADER.pack(WIRE_VERSION, MSG_RAW, 0, ts_ns), data]
+
+    return [WIRE_HEADER.pack(WIRE_VERSION, MSG_PICKLE, 0, ts_ns), pickle.dumps(data)]
+
+
+def encode_batch(topic, frames):
+    """Encode a batch of messages for sending via 0MQ
+
+    Given a string topic name and a list of the [header, payload]
+    frames of each message (see encode_frames()), returns a single
+    multipart message of the form:
+        [
+            Bytes object of String (UTF-8),
+            WIRE_HEADER (version, MSG_BATCH, message count, timestamp),
+            Header of first message,
+            Payload of first message,
+            ...
+        ]
+    """
+    header = WIRE_HEADER.pack(WIRE_VERSION, MSG_BATCH, len(frames), time.time_ns())
+    enc = [bytes(topic, "utf-8"), header]
+    for message in frames:
+        enc.extend(message)
+
+    return enc
+
+
+def _decode_frames(header, payload):
+    version, mtype, uid, _ = WIRE_HEADER.unpack(header)
+    if version != WIRE_VERSION:
+        raise ValueError(f"Unsupported wire format version {version}")
+
+    if mtype == MSG_PACKET:
+        return TaggedPacket(uid, payload)
+    elif mtype == MSG_RAW:
+        return payload
+    elif mtype == MSG_PICKLE:
+        return pickle.loads(payload)
+
+    raise ValueError(f"Unknown wire format message type {mtype}")
+
+
 def decode_message(msg):
     """Decode a message received via 0MQ
 
     Given a message received from `recv_multipart`, decode the components.
+    Both the pickled and the binary wire formats are accepted, and are
+    distinguished by their number of frames.  Batches are not accepted
+    (see decode_messages()).
 
     Returns a tuple of the form:
         (
             UTF-8 string
-            De-pickled data object
+            De-pickled data object, TaggedPacket or raw bytes
         )
 
     If decoding fails a tuple of None objects will be returned.
     """
-    [topic, message] = msg
-
     try:
+        if len(msg) == 3:
+            topic, header, message = msg
+            message = _decode_frames(header, message)
+        else:
+            [topic, message] = msg
+            message = pickle.loads(message)
+
         tpc = topic.decode("utf-8")
-        msg = pickle.loads(message)
+        msg = message
     # TODO: This should be way less generic than Exception
     except Exception:
         tpc = None
         msg = None
 
     return (tpc, msg)
+
+
+def decode_messages(msg):
+    """Decode a message or batch of messages received via 0MQ
+
+    As decode_message(), but also accepts batches (see encode_batch()).
+
+    Returns a tuple of the form:
+        (
+            UTF-8 string
+            List of decoded messages, of length one unless msg is a batch
+        )
+
+    If decoding fails a tuple of None objects will be returned.
+    """
+    if len(msg) < 4:
+        tpc, message = decode_message(msg)
+        if message is None:
+            return (None, None)
+        return (tpc, [message])
+
+    try:
+        tpc = msg[0].decode("utf-8")
+        version, mtype, count, _ = WIRE_HEADER.unpack(msg[1])
+        if version != WIRE_VERSION or mtype != MSG_BATCH:
+            raise ValueError("Invalid wire format batch header")
+        if len(msg) != 2 * count + 2:
+            raise ValueError("Wire format batch length does not match its header")
+
+        messages = [_decode_frames(msg[n], msg[n + 1]) for n in range(2, len(msg), 2)]
+    # TODO: This should be way less generic than Exception
+    except Exception:
+        tpc = None
+        messages = None
+
+    return (tpc, messages)
+
+
+def load_packet(data):
+    """Returns the (uid, data) tuple for a tagged packet
+
+    Accepts either a TaggedPacket (or any (uid, data) tuple) received in
+    the binary wire format, or the pickled tuple produced by the packet
+    handlers' default ``pickle`` wire format.
+    """
+    if not isinstance(data, tuple):
+        data = pickle.loads(data)
+
+    return int(data[0]), data[1]
+
+
+def pickle_packet(packet):
+    """Returns a TaggedPacket pickled the way the packet handlers'
+    default ``pickle`` wire format encodes it."""
+    return pickle.dumps((packet.uid, bytes(packet.data)), 2)
+
+
+#: ZMQ socket options accepted by set_socket_options()
+SOCKET_OPTIONS = {"sndhwm": zmq.SNDHWM, "rcvhwm": zmq.RCVHWM, "linger": zmq.LINGER}
+
+
+def set_socket_options(sock, options):
+    """Sets ZMQ socket options given by name in a dict
+
+    Given a socket and a dict (e.g. from config.yaml) of any of the
+    option names ``sndhwm``, ``rcvhwm`` and ``linger`` (milliseconds),
+    sets those options on the socket.  Options must be set before the
+    socket is bound or connected to take effect.  The ``conflate``
+    option is accepted but left to the caller.
+
+    Raises:
+        ValueError: If options has an unknown option name
+    """
+    for name, value in (options or {}).items():
+        if name == "conflate":
+            continue
+        if name not in SOCKET_OPTIONS:
+            raise ValueError(f"Unknown ZMQ socket option {name}")
+        sock.setsockopt(SOCKET_OPTIONS[name], int(value))
@@ -71,7 +71,7 @@ class FSWColDefn(object):
             EOFError: If the number of bytes read from the input stream
                 is less than the length of the data type.
         """
-        val = None
+        data = b""
         dt = dtype.get(self.type)
 
         if dt is not None:
@@ -80,14 +80,35 @@ class FSWColDefn(object):
             if len(data) != dt.nbytes:
                 raise EOFError
 
+        return self.unpack_from(data, 0, raw)
+
+    def unpack_from(self, buffer, offset, raw=False):
+        """Decode a column's value starting at an offset in a buffer
+
+        Decodes the column's value in place, without first copying it
+        out of the buffer.
+
+        Arguments:
+            buffer: A bytes-like object containing the column's data.
+
+            offset: The byte offset of the column's data in buffer.
+
+            raw: Flag denoting whether raw values or enumerate values
+                (if present for this column) should be returned.
+        """
+        val = None
+        dt = dtype.get(self.type)
+
+        if dt is not None:
             if (
                 isinstance(dt, dtype.Time64Type)
                 or isinstance(dt, dtype.Time40Type)
                 or isinstance(dt, dtype.Time32Type)
             ):
-                val = dt.decode(data).strftime(dmc.RFC3339_Format)
+                val = dt.unpack_from(buffer, offset)
+                val = val.strftime(dmc.RFC3339_Format)
             else:
-                val = dt.decode(data, raw=True)
+                val = dt.unpack_from(buffer, offset, raw=True)
 
         if self.enum and not raw:
             val = self.enum.get(val, val)
@@ -102,11 +123,7 @@ class FSWColDefn(object):
                 the appropriate type for the column's data type.
         """
         dt = dtype.get(self.type)
-
-        if self._enum_rev is not None:
-            value = self._enum_rev.get(value, value)
-
-        value = self._parse_column_value_from_string(value)
+        value = self._prepare_value(value)
 
         # For some reason ArrayType.encode expects to receive the values
         # for encoding in *args instead of, you know, an iterable ...
@@ -117,6 +134,30 @@ class FSWColDefn(object):
         else:
             return dt.encode(value)
 
+    def pack_into(self, buffer, offset, value):
+        """Encode a column's value into a buffer at an offset
+
+        Arguments:
+            buffer: A writable bytes-like object, e.g. a bytearray,
+                at least offset plus the column's size long.
+
+            offset: The byte offset at which to encode the value.
+
+            value: The value to encode provided as either a string or
+                the appropriate type for the column's data type.
+        """
+        dtype.get(self.type).pack_into(buffer, offset, self._prepare_value(value))
+
+    def _prepare_value(self, value):
+        """Returns a column value ready for encoding, with any enumeration
+        name and string representation converted to a value of the
+        column's data type.
+        """
+        if self._enum_rev is not None:
+            value = self._enum_rev.get(value, value)
+
+        return self._parse_column_value_from_string(value)
+
     def _parse_column_value_from_string(self, value):
         """Parse strings into an appropriate type for a given table column
 
@@ -20,7 +20,10 @@ dictionaries.  Dictionaries contain packet, header, data, and field
 definitions.
 """
 
+import ast
 import collections
+import functools
+import operator
 import os
 import pkg_resources
 import struct
@@ -89,6 +92,15 @@ class DNToEUConversion(json.SlotSerializer):
         self.units = units
         self._when = when
 
+    def bind(self, defn, decoder=None):
+        """Compiles this DNToEUConversion for Packets of the given
+        PacketDefinition.  See PacketExpression.bind().
+        """
+        if self._when is not None:
+            self._when.bind(defn, decoder)
+
+        self._equation.bind(defn, decoder)
+
     def eval(self, packet):
         """Returns the result of evaluating this DNToEUConversion in the
         context of the given Packet.
@@ -122,12 +134,17 @@ class FieldList(collections.Sequence):
         return (
             isinstance(other, collections.Sequence)
             and len(self) == len(other)
-            and all(self[n] == other[n] for n in range(len(self)))
+            and all(a == b for a, b in zip(self, other))
         )
 
     def __getitem__(self, key):
         return self._packet._getattr(self._defn.name, self._raw, key)
 
+    def __iter__(self):
+        """Decodes all elements at once (see ArrayType.decode())."""
+        values = self[0 : len(self)]
+        return iter([None] * len(self) if values is None else values)
+
     def __len__(self):
         return self._defn.type.nelems
 
@@ -215,6 +232,10 @@ class FieldDefinition(json.SlotSerializer):
     Use the get() and set() methods to extract and set a field's value
     in the underlying raw packet data.
 
+    Changing the type or bytes of a FieldDefinition increments the
+    generation of the PacketDefinition that owns it, which invalidates
+    that packet's PacketLayout (see PacketDefinition.layout).
+
     """
 
     __slots__ = [
@@ -231,11 +252,16 @@ class FieldDefinition(json.SlotSerializer):
         "when",
         "_title",
         "aliases",
+        "_generation",
     ]
 
     def __init__(self, *args, **kwargs):
         """Creates a new FieldDefinition."""
+        self._generation = None
+
         for slot in FieldDefinition.__slots__:
+            if slot == "_generation":
+                continue
             name = slot[1:] if slot.startswith("_") else slot
             setattr(self, name, kwargs.get(name, None))
 
@@ -258,11 +284,23 @@ class FieldDefinition(json.SlotSerializer):
             self.when = createPacketExpression(self.when)  # noqa
 
     def __jsonOmit__(self, key, val):  # noqa
-        return val is None or val == "" or (key == "shift" and val == 0)
+        return (
+            val is None
+            or val == ""
+            or (key == "shift" and val == 0)
+            or key == "generation"
+        )
 
     def __repr__(self):
         return util.toRepr(self)
 
+    def _changed(self):
+        """Increments the generation of the owning PacketDefinition, if
+        any, when the type or bytes of this FieldDefinition change.
+        """
+        if self._generation is not None:
+            self._generation[0] += 1
+
     @property
     def nbytes(self):
         """The number of bytes required to represent this packet field."""
@@ -296,6 +334,8 @@ class FieldDefinition(json.SlotSerializer):
             self._type = value
             log.error("Invalid field type '%s' " % value)
 
+        self._changed()
+
     @property
     def bytes(self):
         """The argument bytes."""
@@ -308,6 +348,8 @@ class FieldDefinition(json.SlotSerializer):
         else:
             self._bytes = value
 
+        self._changed()
+
     def decode(self, bytes, raw=False, index=None):
         """Decodes the given bytes according to this Field Definition.
 
@@ -318,10 +360,14 @@ class FieldDefinition(json.SlotSerializer):
         FieldDefinition is an ArrayType), then only the element(s) at
         the specified position(s) will be decoded.
         """
+        indices = self.slice()
+
         if index is not None and isinstance(self.type, dtype.ArrayType):
-            value = self.type.decode(bytes[self.slice()], index, raw)
+            value = self.type.decode(bytes[indices], index, raw)
+        elif indices.stop - indices.start == self.nbytes:
+            value = self.type.unpack_from(bytes, indices.start, raw)
         else:
-            value = self.type.decode(bytes[self.slice()], raw)
+            value = self.type.decode(bytes[indices], raw=raw)
 
         # Apply bit mask if needed
         if self.mask is not None:
@@ -348,6 +394,39 @@ class FieldDefinition(json.SlotSerializer):
 
         return self.type.encode(value) if self.type else bytearray()
 
+    def pack_into(self, buffer, offset, value):
+        """Encodes the given value according to this FieldDefinition
+        directly into the writable buffer, starting at byte offset.
+        """
+        if self.mask is None:
+            if type(value) == str and self.enum and value in self.enum:
+                value = self.enum[value]
+
+            self.type.pack_into(buffer, offset, value)
+            return
+
+        # If a mask is defined on the FieldDefinition, encode() will
+        # return the encoded value appropriately bit-shifted and
+        # masked.  This value, which could span several bytes must now
+        # be integrated byte-by-byte into the already existing bytes
+        # of the buffer, taking care not to clobber any bits outside
+        # the mask.  To accomplish this, for each byte at byte
+        # position b:
+        #
+        #   1.  Bitwise-AND the existing value (buffer[b]) with the
+        #       bitwise-COMPLEMENT of mask[b] to zero-out (clear)
+        #       only the masked bits of the existing value, then
+        #
+        #   2.  Bitwise-OR with the the new byte value (bytes[b])
+        #       to set the appropriate bits.
+        bytes = self.encode(value)
+        mask = bytearray(struct.pack(self.type.format, self.mask))
+
+        for b in range(len(bytes)):
+            bytes[b] |= buffer[offset + b] & ~mask[b]
+
+        buffer[offset : offset + len(bytes)] = bytes
+
     def slice(self, offset=0):
         """Returns a Python slice object (e.g. for array indexing) indicating
         the start and stop byte position of this Telemetry field.  The
@@ -393,21 +472,911 @@ class FieldDefinition(json.SlotSerializer):
         return valid
 
 
+class PacketLayout:
+    """PacketLayout
+
+    A PacketLayout records where the fields of a PacketDefinition lie
+    in its binary packet data: the total packet size in bytes, the
+    byte slice of each field and, for each byte, the names of the
+    fields that occupy it.
+
+    A PacketLayout is computed once and shared by everything that
+    needs field positions (decoders, Packet field writes and the
+    telemetry dictionary exporters).  Use PacketDefinition.layout,
+    which rebuilds the PacketLayout after its fields change, rather
+    than creating one directly.
+    """
+
+    __slots__ = ["fields", "generation", "nbytes", "occupancy", "slices"]
+
+    def __init__(self, defn):
+        """Creates a new PacketLayout for the given PacketDefinition."""
+        self.fields = defn.fields
+        self.generation = defn._generation[0]
+        self.slices = {fd.name: fd.slice() for fd in defn.fields}
+
+        max_byte = -1
+        for fd in defn.fields:
+            byte = fd.bytes if type(fd.bytes) is int else max(fd.bytes)
+            max_byte = max(max_byte, byte)
+
+        self.nbytes = max_byte + 1
+
+        occupancy = [[] for _ in range(self.nbytes)]
+        for fd in defn.fields:
+            indices = self.slices[fd.name]
+            for b in range(indices.start, min(indices.stop, self.nbytes)):
+                occupancy[b].append(fd.name)
+
+        self.occupancy = tuple(tuple(names) for names in occupancy)
+
+    def __contains__(self, name):
+        """Returns True if this PacketLayout contains the named field."""
+        return name in self.slices
+
+    def __getitem__(self, name):
+        """Returns the byte slice of the named field."""
+        return self.slices[name]
+
+    def __len__(self):
+        """Returns the size of the packet in bytes."""
+        return self.nbytes
+
+    def current(self, defn):
+        """Returns True if this PacketLayout is still up-to-date for the
+        given PacketDefinition, False if it must be rebuilt.
+        """
+        return self.generation == defn._generation[0] and self.fields is defn.fields
+
+    def gaps(self):
+        """Returns a list of slices for each run of bytes not occupied
+        by any field.
+        """
+        gaps = []
+        start = None
+
+        for b, names in enumerate(self.occupancy):
+            if not names and start is None:
+                start = b
+            elif names and start is not None:
+                gaps.append(slice(start, b))
+                start = None
+
+        if start is not None:
+            gaps.append(slice(start, self.nbytes))
+
+        return gaps
+
+
+class FieldDecoder:
+    """FieldDecoder
+
+    A FieldDecoder decodes a single FieldDefinition or
+    DerivationDefinition from a Packet.  The byte offset, precompiled
+    ``struct.Struct``, mask, shift and enumeration for the field are
+    computed once, when the FieldDecoder is created, so they need not
+    be recomputed on every field access.
+
+    A FieldDecoder should not be created directly.  It's created
+    internally by PacketDecoder.
+    """
+
+    __slots__ = [
+        "convert",
+        "defn",
+        "derived",
+        "enum",
+        "isarray",
+        "mask",
+        "name",
+        "offset",
+        "override",
+        "shift",
+        "slice",
+        "struct",
+        "when",
+    ]
+
+    def __init__(self, defn, indices=None, derived=False):
+        """Creates a new FieldDecoder for the given FieldDefinition or,
+        if derived is True, DerivationDefinition.  The field's byte
+        slice, indices, defaults to FieldDefinition.slice().
+        """
+        self.defn = defn
+        self.name = defn.name
+        self.when = defn.when
+        self.derived = derived
+        self.isarray = isinstance(defn.type, dtype.ArrayType)
+        self.convert = None
+        self.enum = None
+        self.mask = None
+        self.offset = 0
+        self.override = False
+        self.shift = 0
+        self.slice = None
+        self.struct = None
+
+        if self.derived:
+            self.convert = defn.equation
+            return
+
+        self.convert = defn.dntoeu if defn.dntoeu is not None else defn.expr
+        self.enum = defn.enum
+        self.mask = defn.mask
+        self.shift = defn.shift
+
+        # Only PrimitiveTypes (not their ComplexType subclasses) whose
+        # struct format exactly spans the field's bytes can be decoded
+        # in place.  Everything else is decoded by its type from a
+        # slice of the packet data.
+        if indices is None:
+            indices = defn.slice()
+
+        self.slice = indices
+        self.offset = indices.start
+
+        # FieldDefinition extensions (see util.__init_extensions__())
+        # that override decode() are always decoded by it.
+        self.override = type(defn).decode is not FieldDefinition.decode
+
+        if self.override:
+            return
+
+        if type(defn.type) is dtype.PrimitiveType:
+            fmt = struct.Struct(defn.type.format)
+            if fmt.size == indices.stop - indices.start:
+                self.struct = fmt
+
+    def decode(self, data, raw=False, index=None):
+        """Decodes this field from the given packet data.
+
+        If raw is True, no enumeration substitutions will be applied
+        to the value returned.  See FieldDefinition.decode().
+        """
+        if self.override:
+            return self.defn.decode(data, raw, index)
+
+        if self.struct is not None:
+            value = self.struct.unpack_from(data, self.offset)[0]
+        elif index is not None and self.isarray:
+            value = self.defn.type.decode(data[self.slice], index, raw)
+        else:
+            value = self.defn.type.decode(data[self.slice], raw=raw)
+
+        if self.mask is not None:
+            value &= self.mask
+
+        if self.shift > 0:
+            value >>= self.shift
+
+        if not raw and self.enum is not None:
+            value = self.enum.get(value, value)
+
+        return value
+
+    def get(self, packet, raw=False, index=None):
+        """Returns the value of this field in the given Packet.
+
+        If raw is True, the field value is only decoded.  That is no
+        enumeration substituions or DN to EU conversions are applied.
+
+        If the Packet has a value cache (see Packet), the value is
+        decoded at most once and thereafter returned from the cache.
+        """
+        cache = packet._cache if index is None else None
+        key = self.name, raw
+
+        if cache is not None and key in cache:
+            return cache[key]
+
+        value = None
+
+        if self.isarray and index is None:
+            value = createFieldList(packet, self.defn, raw)  # noqa
+        elif self.when is None or self.when.eval(packet):
+            if self.derived:
+                value = self.convert.eval(packet)
+            elif raw or self.convert is None:
+                value = self.decode(packet._data, raw, index)
+            else:
+                value = self.convert.eval(packet)
+
+        if cache is not None:
+            cache[key] = value
+
+        return value
+
+
+class PacketDecoder:
+    """PacketDecoder
+
+    A PacketDecoder maps each field and derivation name in a
+    PacketDefinition to a FieldDecoder.  It is built once per
+    PacketDefinition (see PacketDefinition.decoder) and used by
+    Packet for field access, toJSON() and validate().
+
+    A PacketDecoder can also decode every field in a Packet at once
+    (see decode_all()).  Non-overlapping, unguarded primitive fields
+    are unpacked together by a single precompiled ``struct.Struct``.
+
+    A PacketDecoder also generates the Packet and RawPacket subclasses
+    (packet_class and raw_class) instantiated for its
+    PacketDefinition.  They have a property for each field, so field
+    access need not go through ``__getattr__()``.
+    """
+
+    __slots__ = [
+        "_bulk",
+        "_bulkfields",
+        "_decoders",
+        "_defn",
+        "_derivations",
+        "_fields",
+        "layout",
+        "packet_class",
+        "raw_class",
+    ]
+
+    def __init__(self, defn):
+        """Creates a new PacketDecoder for the given PacketDefinition."""
+        self._defn = defn
+        self.layout = defn.layout
+        self._fields = [
+            createFieldDecoder(fd, self.layout[fd.name]) for fd in defn.fields  # noqa
+        ]
+        self._derivations = [
+            createFieldDecoder(dd, derived=True) for dd in defn.derivations  # noqa
+        ]
+
+        # Derivations take precedence over fields of the same name.
+        self._decoders = {fd.name: fd for fd in self._fields}
+        self._decoders.update((dd.name, dd) for dd in self._derivations)
+
+        self._bulk = None
+        self._bulkfields = []
+        self._update_bulk()
+
+        self.packet_class = None
+        self.raw_class = None
+        self._update_classes()
+
+        # Compile all expressions up front, rather than on first use.
+        for fd in self._fields + self._derivations:
+            for expr in fd.when, fd.convert:
+                if expr is not None:
+                    expr.bind(defn, self)
+
+    def __contains__(self, name):
+        """Returns True if this PacketDecoder can decode name."""
+        return name in self._decoders
+
+    def __getitem__(self, name):
+        """Returns the FieldDecoder for the given field name."""
+        return self._decoders[name]
+
+    def _update_classes(self):
+        """Generates packet_class and raw_class.
+
+        Field names that clash with an existing Packet or RawPacket
+        attribute (e.g. ``nbytes``) are left to that attribute, just as
+        they are for a plain Packet, except for the helpers listed in
+        Packet.Helpers (e.g. ``decode_all``), which give way to fields.
+
+        The properties look up the current FieldDecoder on each access,
+        so Packets created before a layout change (see
+        PacketDefinition.layout) decode with the new layout too.
+        """
+
+        def packet_property(fieldname):
+            return property(lambda packet: packet._getattr(fieldname))
+
+        def raw_property(fieldname):
+            return property(lambda raw: raw._packet._getattr(fieldname, True))
+
+        name = str(self._defn.name)
+        packet_attrs = {"__slots__": ()}
+        raw_attrs = {"__slots__": ()}
+
+        for fieldname in self._decoders:
+            if fieldname in Packet.Helpers or not hasattr(Packet, fieldname):
+                packet_attrs[fieldname] = packet_property(fieldname)
+            if not hasattr(RawPacket, fieldname):
+                raw_attrs[fieldname] = raw_property(fieldname)
+
+        self.raw_class = type(name + "RawPacket", (RawPacket,), raw_attrs)
+        packet_attrs["_rawclass"] = self.raw_class
+        self.packet_class = type(name + "Packet", (Packet,), packet_attrs)
+
+    def _update_bulk(self):
+        """Builds the single ``struct.Struct`` used by decode_all().
+
+        Fields are added in byte order, padding any gaps.  A field is
+        left out (and decoded individually) if it has a when guard, is
+        not a plain PrimitiveType, overlaps a field already added (e.g.
+        bit fields sharing a byte), or has a different byte order than
+        the fields already added.
+        """
+        order = None
+        codes = []
+        pos = 0
+
+        fields = [
+            fd for fd in self._fields if fd.struct is not None and fd.when is None
+        ]
+
+        for fd in sorted(fields, key=lambda fd: fd.offset):
+            fmt = fd.defn.type.format
+            prefix = fmt[0] if fmt[0] in "<>" else None
+
+            if fd.offset < pos or (order and prefix and prefix != order):
+                continue
+
+            if fd.offset > pos:
+                codes.append("%dx" % (fd.offset - pos))
+
+            order = order or prefix
+            codes.append(fmt.lstrip("<>"))
+            pos = fd.offset + fd.struct.size
+            self._bulkfields.append(fd)
+
+        if self._bulkfields:
+            self._bulk = struct.Struct((order or ">") + "".join(codes))
+
+    def decode_all(self, packet, values="eu", derivations=False, astuple=False):
+        """Decodes every field in the given Packet in one pass.
+
+        The values returned are those of ``packet.fieldname`` when
+        values is "eu" (the default), ``packet.raw.fieldname`` when
+        values is "raw", or a (raw, eu) tuple of both when values is
+        "both".
+
+        If derivations is True, derivations are included after the
+        packet fields.
+
+        Returns a dictionary mapping field names to values or, if
+        astuple is True, a tuple of values in field order.
+        """
+        if values not in ("eu", "raw", "both"):
+            raise ValueError('values must be one of "eu", "raw" or "both"')
+
+        decoded = {}
+
+        if self._bulk is not None:
+            unpacked = self._bulk.unpack_from(packet._data)
+
+            for fd, value in zip(self._bulkfields, unpacked):
+                if fd.mask is not None:
+                    value &= fd.mask
+                if fd.shift > 0:
+                    value >>= fd.shift
+                decoded[fd.name] = value
+
+        fields = self._fields + self._derivations if derivations else self._fields
+        result = []
+
+        for fd in fields:
+            raw = eu = None
+
+            if not fd.derived and fd.name in decoded:
+                raw = decoded[fd.name]
+
+                if values != "raw":
+                    if fd.convert is not None:
+                        eu = fd.convert.eval(packet)
+                    elif fd.enum is not None:
+                        eu = fd.enum.get(raw, raw)
+                    else:
+                        eu = raw
+            else:
+                if values != "eu":
+                    raw = fd.get(packet, raw=True)
+                if values != "raw":
+                    eu = fd.get(packet)
+
+            if values == "eu":
+                result.append(eu)
+            elif values == "raw":
+                result.append(raw)
+            else:
+                result.append((raw, eu))
+
+        if astuple:
+            return tuple(result)
+
+        return {fd.name: value for fd, value in zip(fields, result)}
+
+    def get(self, packet, name, raw=False, index=None):
+        """Returns the value of the given field name in packet."""
+        return self._decoders[name].get(packet, raw, index)
+
+
+class PacketColumnDecoder:
+    """PacketColumnDecoder
+
+    A PacketColumnDecoder decodes many packets of the same
+    PacketDefinition at once into NumPy arrays, one column per field.
+    Packet data is viewed through a NumPy structured ``dtype`` derived
+    from the PacketDefinition (see the dtype property), so most fields
+    are decoded with a handful of vectorized operations rather than
+    one Packet at a time.
+
+    DN-to-EU conversions, field expressions, when guards and
+    derivations are evaluated column-wise when the expression allows
+    it (i.e. it uses only arithmetic and functions that accept NumPy
+    arrays).  Otherwise, or for field types that have no NumPy
+    equivalent, values are decoded one Packet at a time and returned
+    as an object array.
+
+    NumPy is an optional dependency and is only required to create a
+    PacketColumnDecoder.
+    """
+
+    __slots__ = ["_defn", "_dtype", "_kinds", "_np"]
+
+    NumPyFormats = {
+        "b": "i1",
+        "B": "u1",
+        "h": "i2",
+        "H": "u2",
+        "i": "i4",
+        "I": "u4",
+        "q": "i8",
+        "Q": "u8",
+        "f": "f4",
+        "d": "f8",
+    }
+
+    def __init__(self, defn):
+        """Creates a new PacketColumnDecoder for the given
+        PacketDefinition.
+
+        Raises ImportError if NumPy is not installed.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("PacketColumnDecoder requires NumPy (numpy)")
+
+        self._np = numpy
+        self._defn = defn
+        self._kinds = {}
+
+        names, formats, offsets = [], [], []
+
+        for fd in defn.fields:
+            kind, fmt = self._column_format(fd, defn.layout[fd.name])
+
+            if fmt is not None:
+                names.append(fd.name)
+                formats.append(fmt)
+                offsets.append(defn.layout[fd.name].start)
+
+            self._kinds[fd.name] = kind
+
+        layout = dict(names=names, formats=formats, offsets=offsets)
+        layout["itemsize"] = defn.nbytes
+        self._dtype = numpy.dtype(layout)
+
+    def _column_format(self, fd, indices):
+        """Returns a (kind, NumPy format) pair describing how the given
+        FieldDefinition, occupying the byte slice indices, is stored in
+        each packet.  The NumPy format is None when the field must be
+        decoded one Packet at a time.
+        """
+        t = fd.type
+
+        if t is None or isinstance(t, str) or indices.stop - indices.start != t.nbytes:
+            return None, None
+
+        if type(fd).decode is not FieldDefinition.decode:
+            return None, None
+
+        if type(t) is dtype.ArrayType:
+            fmt = self._numpy_format(t.type)
+            return ("array", (fmt, (t.nelems,))) if fmt else (None, None)
+        elif type(t) is dtype.PrimitiveType:
+            return "value", self._numpy_format(t)
+        elif isinstance(t, dtype.Time8Type):
+            return "time8", "u1"
+        elif isinstance(t, dtype.Time32Type):
+            return "time32", ">u4"
+        elif isinstance(t, dtype.Time40Type):
+            return "time40", [("sec", ">u4"), ("sub", "u1")]
+        elif isinstance(t, dtype.Time64Type):
+            return "time64", [("sec", ">u4"), ("nsec", ">u4")]
+        elif isinstance(t, (dtype.CmdType, dtype.EVRType)):
+            return "code", ">u2"
+
+        return None, None
+
+    def _numpy_format(self, t):
+        """Returns the NumPy format for the given PrimitiveType or None."""
+        if type(t) is not dtype.PrimitiveType:
+            return None
+
+        if t.string:
+            return "S%d" % t.nbytes
+
+        fmt = t.format
+        order = fmt[0] if fmt[0] in "<>" else "|"
+        code = self.NumPyFormats.get(fmt.lstrip("<>"))
+
+        return order + code if code else None
+
+    @property
+    def dtype(self):
+        """The NumPy structured dtype of a single packet.  Fields that
+        must be decoded one Packet at a time are omitted.
+        """
+        return self._dtype
+
+    def decode(self, data, raw=False, derivations=False):
+        """Decodes every field in the given packets into columns.
+
+        The data may be a single contiguous buffer of back-to-back
+        packets, each PacketDefinition.nbytes long, or an iterable of
+        raw packets (each at least that long).
+
+        If raw is True, the values are those of
+        ``packet.raw.fieldname``, otherwise those of
+        ``packet.fieldname``.  Time fields are returned as NumPy
+        datetime64[us] columns rather than Python datetimes.  If
+        derivations is True, derivations are included after the
+        packet fields.
+
+        Returns a dictionary mapping field names to NumPy arrays.
+        """
+        columns = _PacketColumns(self, self.frombuffer(data))
+        fields = self._defn.fields
+
+        if derivations:
+            fields = fields + self._defn.derivations
+
+        if raw:
+            return {defn.name: columns.raw(defn.name) for defn in fields}
+        else:
+            return {defn.name: columns.eu(defn.name) for defn in fields}
+
+    def frombuffer(self, data):
+        """Returns a NumPy structured array of the given packets (see
+        decode()) using this PacketColumnDecoder's dtype.  When data is
+        a contiguous buffer, the array is a view of it, not a copy.
+        """
+        nbytes = self._defn.nbytes
+
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            packets = list(data)
+
+            if any(len(p) < nbytes for p in packets):
+                msg = "Packet '%s' requires %d bytes per packet"
+                raise ValueError(msg % (self._defn.name, nbytes))
+
+            data = b"".join(bytes(p[:nbytes]) for p in packets)
+
+        if len(data) % nbytes != 0:
+            msg = "Buffer size %d is not a multiple of packet '%s' size %d"
+            raise ValueError(msg % (len(data), self._defn.name, nbytes))
+
+        return self._np.frombuffer(data, dtype=self._dtype)
+
+
+class _PacketColumns:
+    """Lazily decodes and caches the raw and EU columns of a single
+    PacketColumnDecoder.decode() call, so that columns referenced by
+    several expressions are decoded only once.
+    """
+
+    Epoch = "1980-01-06T00:00:00"
+
+    def __init__(self, decoder, records):
+        self._decoder = decoder
+        self._defn = decoder._defn
+        self._np = decoder._np
+        self._records = records
+        self._packets = None
+        self._raw = {}
+        self._eu = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    def _lookup(self, name):
+        """Returns the DerivationDefinition or FieldDefinition for name."""
+        if name in self._defn.derivationmap:
+            return self._defn.derivationmap[name], True
+        elif name in self._defn.fieldmap:
+            return self._defn.fieldmap[name], False
+
+        values = self._defn.name, name
+        raise KeyError("Packet '%s' has no field '%s'" % values)
+
+    def _per_packet(self, name, raw):
+        """Decodes the given field one Packet at a time."""
+        if self._packets is None:
+            data = memoryview(self._records.tobytes())
+            nbytes = self._defn.nbytes
+            self._packets = [
+                createPacket(self._defn, data[n : n + nbytes])  # noqa
+                for n in range(0, len(data), nbytes)
+            ]
+
+        values = [p._getattr(name, raw=raw) for p in self._packets]
+        column = self._np.empty(len(self), dtype=object)
+        column[:] = [list(v) if isinstance(v, FieldList) else v for v in values]
+        return column
+
+    def _evaluate(self, expr):
+        """Evaluates the given PacketExpression column-wise.  Raises an
+        exception if the expression cannot be evaluated on columns.
+        """
+        if "history" in expr._code.co_names:
+            raise ValueError("History cannot be evaluated column-wise")
+
+        with self._np.errstate(divide="raise", invalid="raise"):
+            result = eval(expr._code, self._defn.globals, _ColumnContext(self))
+
+        return self._np.broadcast_to(result, (len(self),))
+
+    def operand(self, column):
+        """Returns column as an operand for column-wise evaluation.
+        Integer columns are widened to int64 (or Python ints, for
+        uint64) so that arithmetic does not wrap around as it would in
+        their packed, often unsigned, dtypes, matching the Python ints
+        a single Packet evaluates with.
+        """
+        kind, itemsize = column.dtype.kind, column.dtype.itemsize
+
+        if kind == "u" and itemsize == 8:
+            return column.astype(object)
+        elif kind in "iu":
+            return column.astype(self._np.int64)
+
+        return column
+
+    def _guard(self, when, column):
+        """Applies the given when guard PacketExpression to column."""
+        if when is None:
+            return column
+
+        mask = self._evaluate(when).astype(bool)
+
+        if mask.all():
+            return column
+
+        return self._np.where(mask, column.astype(object), None)
+
+    def raw(self, name):
+        """Returns the column of raw values for the given field name."""
+        if name not in self._raw:
+            self._raw[name] = self._decode(name, raw=True)
+
+        return self._raw[name]
+
+    def eu(self, name):
+        """Returns the column of values for the given field name."""
+        if name not in self._eu:
+            self._eu[name] = self._decode(name, raw=False)
+
+        return self._eu[name]
+
+    def _decode(self, name, raw):
+        defn, derived = self._lookup(name)
+        kind = None if derived else self._decoder._kinds[name]
+
+        try:
+            if derived:
+                column = self._evaluate(defn.equation)
+            elif kind is None:
+                return self._per_packet(name, raw)
+            elif raw or (defn.dntoeu is None and defn.expr is None):
+                column = self._decode_value(defn, kind, raw)
+            elif defn.dntoeu is not None:
+                when = defn.dntoeu._when
+                column = self._guard(when, self._evaluate(defn.dntoeu._equation))
+            else:
+                column = self._evaluate(defn.expr)
+
+            return self._guard(defn.when, column)
+        except RecursionError:
+            raise
+        except Exception:
+            return self._per_packet(name, raw)
+
+    def _decode_value(self, defn, kind, raw):
+        """Decodes the given FieldDefinition column from packet data."""
+        np = self._np
+        rec = self._records[defn.name]
+
+        if kind == "time8":
+            return rec if raw else rec / 256.0
+        elif kind == "time40":
+            if raw:
+                return rec["sec"] + rec["sub"] / 256.0
+            sec = rec["sec"].astype(np.int64)
+            usec = sec * 1000000 + np.round(rec["sub"] / 256.0 * 1e6)
+            return np.datetime64(self.Epoch, "us") + usec.astype("timedelta64[us]")
+        elif kind == "time64":
+            if raw:
+                return rec["sec"] + rec["nsec"] / 1e9
+            sec = rec["sec"].astype(np.int64)
+            usec = sec * 1000000 + np.round(rec["nsec"] / 1e3)
+            return np.datetime64(self.Epoch, "us") + usec.astype("timedelta64[us]")
+        elif kind == "time32":
+            if raw:
+                return rec
+            return np.datetime64(self.Epoch, "s") + rec.astype("timedelta64[s]")
+        elif kind == "code" and not raw:
+            raise ValueError("Command and EVR codes are decoded per packet")
+
+        if defn.mask is not None:
+            rec = rec & defn.mask
+
+        if defn.shift > 0:
+            rec = rec >> defn.shift
+
+        if not raw and defn.enum is not None:
+            column = np.empty(len(rec), dtype=object)
+            column[:] = [defn.enum.get(v, v) for v in rec.tolist()]
+            return column
+
+        return rec
+
+
+class _ColumnContext:
+    """Maps field names to columns when evaluating a PacketExpression
+    column-wise, analogous to a PacketContext for a single Packet.
+    """
+
+    __slots__ = ["_columns"]
+
+    def __init__(self, columns):
+        self._columns = columns
+
+    def __getitem__(self, name):
+        if name == "raw":
+            return _RawColumns(self._columns)
+        return self._columns.operand(self._columns.eu(name))
+
+
+class _RawColumns:
+    """Provides ``raw.fieldname`` access to raw columns, analogous to a
+    RawPacket for a single Packet.
+    """
+
+    __slots__ = ["_columns"]
+
+    def __init__(self, columns):
+        self._columns = columns
+
+    def __getattr__(self, name):
+        try:
+            column = self._columns.raw(name)
+        except KeyError as e:
+            raise AttributeError(str(e))
+
+        return self._columns.operand(column)
+
+
+class CachedPacketData(bytearray):
+    """CachedPacketData
+
+    CachedPacketData is the bytearray of a Packet with a value cache.
+    Any modification of the bytearray clears the cache of decoded
+    values.
+
+    A CachedPacketData should not be created directly.  It's created
+    internally by Packet.
+    """
+
+    __slots__ = ["_cache"]
+
+    def __init__(self, data, cache):
+        super(CachedPacketData, self).__init__(data)
+        self._cache = cache
+
+    def __reduce_ex__(self, protocol):
+        """Pickles CachedPacketData as a plain bytearray."""
+        return (bytearray, (bytes(self),))
+
+
+def _clear_cache_before(name):
+    """Returns bytearray method name, wrapped to clear the cache of a
+    CachedPacketData before modifying it.
+    """
+    method = getattr(bytearray, name)
+
+    def modify(self, *args):
+        self._cache.clear()
+        return method(self, *args)
+
+    modify.__name__ = name
+    modify.__doc__ = method.__doc__
+    return modify
+
+
+for _name in (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "__setitem__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+):
+    setattr(CachedPacketData, _name, _clear_cache_before(_name))
+
+del _name
+
+
 class Packet:
-    """Packet"""
+    """Packet
+
+    Creating a Packet returns an instance of the Packet subclass
+    generated for its PacketDefinition (see PacketDecoder), which has a
+    property for each field.  Packets use ``__slots__`` and create
+    their RawPacket (packet.raw) at most once, to keep the many Packets
+    that may be buffered at a time small.
+    """
+
+    # Helper attributes overridden by fields of the same name
+    Helpers = ("decode_all", "history", "readonly")
+
+    __slots__ = ["_cache", "_data", "_defn", "_raw"]
+    _rawclass = None
+
+    def __new__(cls, *args, **kwargs):
+        """Returns a new, uninitialized instance of the Packet subclass
+        generated for the given Packet Definition.  Other subclasses of
+        Packet are instantiated as is.
+        """
+        if cls is Packet:
+            defn = args[0] if args else kwargs["defn"]
+            packet_class = defn.decoder.packet_class
+            if issubclass(packet_class, cls):
+                cls = packet_class
 
-    def __init__(self, defn, data=None):
+        return object.__new__(cls)
+
+    def __init__(self, defn, data=None, cache=False):
         """Creates a new Packet based on the given Packet Definition and
         binary (raw) packet data.
+
+        Packet data given as a bytearray is used (and modified) in
+        place.  Data given as ``bytes`` or a ``memoryview`` (e.g. of a
+        received frame) is not copied.  Fields are decoded directly
+        from it and it is only copied to a new bytearray on the first
+        write to a field.  Data given as a memoryview must not be
+        reused (e.g. for the next received frame) while the Packet is
+        in use.  Any other data (e.g. a list of byte values) is copied
+        to a new bytearray.
+
+        If cache is True, each field value is decoded at most once,
+        the first time it is accessed, and cached until the packet data
+        is modified.  This saves repeatedly decoding fields referenced
+        by DN to EU conversions, derivations, validate(), toJSON(),
+        etc.
         """
         object.__setattr__(self, "_defn", defn)
 
         if data is None:
             data = bytearray(self.nbytes)
-        elif not isinstance(data, bytearray):
+        elif not isinstance(data, (bytes, bytearray, memoryview)):
             data = bytearray(data)
 
+        if cache:
+            cache = {}
+            if isinstance(data, bytearray):
+                data = CachedPacketData(data, cache)
+        else:
+            cache = None
+
+        object.__setattr__(self, "_cache", cache)
         object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_raw", None)
 
         if defn.history:
             defn.history.add(self)
@@ -415,6 +1384,10 @@ class Packet:
     def __repr__(self):
         return self._defn.__repr__()
 
+    def __reduce__(self):
+        """Pickles a Packet by its definition and data."""
+        return Packet, (self._defn, bytes(self._data), self._cache is not None)
+
     def __getattr__(self, fieldname):
         """Returns the value of the given packet field name."""
         return self._getattr(fieldname)
@@ -423,34 +1396,16 @@ class Packet:
         """Sets the given packet field name to value."""
         self._assert_field(fieldname)
 
+        if not isinstance(self._data, bytearray):
+            self._copy_data()
+
         defn = self._defn.fieldmap[fieldname]
-        bytes = defn.encode(value)
-        indices = defn.slice()
+        defn.pack_into(self._data, self._defn.layout[fieldname].start, value)
 
-        if defn.mask is not None:
-            # If a mask is defined on the FieldDefinition (defn),
-            # defn.encode() will return the encoded value
-            # appropriately bit-shifted and masked.  This value, which
-            # could span several bytes must now be integrated
-            # byte-by-byte into the already existing data bytes of the
-            # packet (self._data), taking care not to clobber any bits
-            # outside the mask.  To accomplish this, for each byte at
-            # byte position b:
-            #
-            #   1.  Bitwise-AND the existing value (data[b]) with the
-            #       bitwise-COMPLEMENT of mask[b] to zero-out (clear)
-            #       only the masked bits of the existing value, then
-            #
-            #   2.  Bitwise-OR with the the new byte value (bytes[b])
-            #       to set the appropriate bits.
-
-            data = self._data[indices]
-            mask = bytearray(struct.pack(defn.type.format, defn.mask))
-
-            for b in range(len(data)):
-                bytes[b] |= data[b] & ~mask[b]
-
-        self._data[indices] = bytes
+        # pack_into() may write through the buffer protocol, bypassing
+        # CachedPacketData.
+        if self._cache is not None:
+            self._cache.clear()
 
     def _assert_field(self, fieldname):
         """Raise AttributeError when Packet has no field with the given
@@ -459,39 +1414,36 @@ class Packet:
             values = self._defn.name, fieldname
             raise AttributeError("Packet '%s' has no field '%s'" % values)
 
+    def _copy_data(self):
+        """Copies read-only packet data (e.g. ``bytes`` or a
+        ``memoryview``) to a new bytearray, so it may be modified.
+        """
+        if self._cache is None:
+            data = bytearray(self._data)
+        else:
+            data = CachedPacketData(self._data, self._cache)
+            self._cache.clear()
+
+        object.__setattr__(self, "_data", data)
+
     def _getattr(self, fieldname, raw=False, index=None):
         """Returns the value of the given packet field name.
 
         If raw is True, the field value is only decoded.  That is no
         enumeration substituions or DN to EU conversions are applied.
         """
-        self._assert_field(fieldname)
-        value = None
-
         if fieldname == "raw":
-            value = createRawPacket(self)  # noqa
-        elif fieldname == "history":
-            value = self._defn.history
-        else:
-            if fieldname in self._defn.derivationmap:
-                defn = self._defn.derivationmap[fieldname]
-            else:
-                defn = self._defn.fieldmap[fieldname]
+            return self.raw
 
-            if isinstance(defn.type, dtype.ArrayType) and index is None:
-                return createFieldList(self, defn, raw)  # noqa
-
-            if defn.when is None or defn.when.eval(self):
-                if isinstance(defn, DerivationDefinition):
-                    value = defn.equation.eval(self)
-                elif raw or (defn.dntoeu is None and defn.expr is None):
-                    value = defn.decode(self._data, raw, index)
-                elif defn.dntoeu is not None:
-                    value = defn.dntoeu.eval(self)
-                elif defn.expr is not None:
-                    value = defn.expr.eval(self)
+        try:
+            decoder = self._defn.decoder[fieldname]
+        except KeyError:
+            if fieldname == "history":
+                return self._defn.history
+            values = self._defn.name, fieldname
+            raise AttributeError("Packet '%s' has no field '%s'" % values)
 
-        return value
+        return decoder.get(self, raw, index)
 
     def _hasattr(self, fieldname):
         """Returns True if this packet contains fieldname, False otherwise."""
@@ -502,18 +1454,57 @@ class Packet:
             or fieldname in self._defn.derivationmap
         )
 
+    def decode_all(self, values="eu", derivations=False, astuple=False):
+        """Decodes every field in this Packet in one pass.
+
+        See PacketDecoder.decode_all().
+        """
+        return self._defn.decoder.decode_all(self, values, derivations, astuple)
+
+    @property
+    def history(self):
+        """The PacketHistory of this packet's definition, if any."""
+        return self._defn.history
+
     @property
     def nbytes(self):
         """The size of this packet in bytes."""
         return self._defn.nbytes
 
+    @property
+    def raw(self):
+        """This packet as a RawPacket, created on first use."""
+        raw = self._raw
+        if raw is None:
+            if self._rawclass is None:
+                raw = createRawPacket(self)  # noqa
+            else:
+                raw = self._rawclass(self)
+            object.__setattr__(self, "_raw", raw)
+
+        return raw
+
+    @property
+    def readonly(self):
+        """True if this packet's data has not been copied to a bytearray
+        (see Packet()), False otherwise.
+        """
+        return not isinstance(self._data, bytearray)
+
     @property
     def words(self):
         """Packet data as a wordarray."""
         return WordArray(self._data)
 
     def toJSON(self):  # noqa
-        return {name: getattr(self, name) for name in self._defn.fieldmap}
+        decoder = self._defn.decoder
+        values = {name: decoder.get(self, name) for name in self._defn.fieldmap}
+
+        for name, value in values.items():
+            if isinstance(value, FieldList):
+                values[name] = list(value)
+
+        return values
 
     def validate(self, messages=None):
         """Returns True if the given Packet is valid, False otherwise.
@@ -563,6 +1554,11 @@ class PacketDefinition(json.SlotSerializer):
     """PacketDefinition"""
 
     NextUID = 1
+
+    # Private slots caching state derived from the others.  They are
+    # neither set from keyword arguments (i.e. YAML) nor pickled.
+    CacheSlots = ("_decoder", "_generation", "_layout")
+
     __slots__ = [
         "ccsds",
         "constants",
@@ -576,13 +1572,21 @@ class PacketDefinition(json.SlotSerializer):
         "name",
         "derivations",
         "derivationmap",
+        "_decoder",
+        "_generation",
+        "_layout",
     ]
 
     def __init__(self, *args, **kwargs):
         """Creates a new PacketDefinition."""
         for slot in PacketDefinition.__slots__:
             name = slot[1:] if slot.startswith("_") else slot
-            setattr(self, slot, kwargs.get(name, None))
+            cached = slot in PacketDefinition.CacheSlots
+            setattr(self, slot, None if cached else kwargs.get(name, None))
+
+        # Incremented by FieldDefinitions (which share this list) when
+        # their type or bytes change.
+        self._generation = [0]
 
         if self.ccsds:
             import ait.core.ccsds as ccsds
@@ -622,12 +1626,15 @@ class PacketDefinition(json.SlotSerializer):
         return {
             name: getattr(self, name)
             for name in PacketDefinition.__slots__
-            if name != "globals"
+            if name != "globals" and name not in PacketDefinition.CacheSlots
         }
 
     def __setstate__(self, state):
         for s in PacketDefinition.__slots__:
             setattr(self, s, state.get(s, None))
+        self._generation = [0]
+        for fd in self.fields:
+            fd._generation = self._generation
         self._update_globals()
 
     def _update_bytes(self, defns, start=0):
@@ -680,16 +1687,51 @@ class PacketDefinition(json.SlotSerializer):
         if self.history:
             self.globals["history"] = self.history
 
+    @property
+    def decoder(self):
+        """The PacketDecoder for this telemetry packet, built on first use
+        and rebuilt whenever the packet layout changes
+        """
+        # This property is read on every Packet field access, so the
+        # PacketLayout.current() check is inlined.
+        decoder = self._decoder
+        if (
+            decoder is None
+            or decoder.layout.generation != self._generation[0]
+            or decoder.layout.fields is not self.fields
+        ):
+            decoder = self._decoder = createPacketDecoder(self)  # noqa
+
+        return decoder
+
+    @property
+    def layout(self):
+        """The PacketLayout for this telemetry packet, built on first use
+        and rebuilt whenever a field's type or bytes change or fields is
+        reassigned.  Reassign fields (rather than modifying the list in
+        place) when adding or removing fields.
+        """
+        layout = self._layout
+        if layout is None or not layout.current(self):
+            for fd in self.fields:
+                fd._generation = self._generation
+            layout = self._layout = createPacketLayout(self)  # noqa
+
+        return layout
+
     @property
     def nbytes(self):
         """The number of bytes for this telemetry packet"""
-        max_byte = -1
+        return self.layout.nbytes
 
-        for defn in self.fields:
-            byte = defn.bytes if type(defn.bytes) is int else max(defn.bytes)
-            max_byte = max(max_byte, byte)
+    def decode_all(self, data, values="eu", derivations=False, astuple=False):
+        """Decodes every field in the given binary (raw) packet data in
+        one pass.
 
-        return max_byte + 1
+        See PacketDecoder.decode_all().
+        """
+        packet = createPacket(self, data)  # noqa
+        return self.decoder.decode_all(packet, values, derivations, astuple)
 
     def validate(self, pkt, messages=None):
         """Returns True if the given Packet is valid, False otherwise.
@@ -697,10 +1739,11 @@ class PacketDefinition(json.SlotSerializer):
         array.
         """
         valid = True
+        decoder = self.decoder
 
         for f in self.fields:
             try:
-                value = getattr(pkt, f.name)
+                value = decoder.get(pkt, f.name)
             except AttributeError:
                 valid = False
                 if messages is not None:
@@ -752,14 +1795,21 @@ class PacketExpression:
     particular housekeeping value when a corresponding mux field in
     the same packet is equal to some contsant value.
 
+    Before a PacketExpression is first evaluated for Packets of a
+    PacketDefinition, it is compiled (see bind()) into a Python
+    function of a Packet whose references to packet fields call the
+    field's FieldDecoder directly.  Compiled functions are kept per
+    PacketDefinition, as an expression may be shared between them.
+
     """
 
-    __slots__ = ["_code", "_expr"]
+    __slots__ = ["_code", "_expr", "_funcs"]
 
     def __init__(self, expr):
         """Creates a new PacketExpression from the given string expression."""
         self._code = compile(expr, "<string>", mode="eval")
         self._expr = expr
+        self._funcs = {}
 
     def __reduce__(self):
         """Pickles and Unpickles PacketExpressions.
@@ -777,13 +1827,46 @@ class PacketExpression:
     def __str__(self):
         return self._expr
 
+    def bind(self, defn, decoder=None):
+        """Compiles this PacketExpression for Packets of the given
+        PacketDefinition and returns the compiled function.
+
+        Names in the expression that refer to packet fields (or to
+        ``raw.fieldname``) are resolved to their FieldDecoders (from
+        the optional PacketDecoder or ``defn.decoder``) once, here,
+        rather than through a PacketContext on every evaluation.  All
+        other names are looked up in the PacketDefinition globals.
+        """
+        if decoder is None:
+            decoder = defn.decoder
+
+        tree = ast.parse(self._expr, mode="eval").body
+        compiler = _PacketExpressionCompiler(decoder, tree)
+        tree = compiler.visit(tree)
+
+        # Wrapping the expression in an outer lambda binds the field
+        # decoders as closure variables of the inner function.
+        args = ", ".join(compiler.names)
+        outer = ast.parse("lambda %s: lambda __packet__: None" % args).body[0]
+        outer.value.body.body = tree
+        outer = ast.fix_missing_locations(ast.Expression(outer.value))
+
+        func = eval(compile(outer, "<string>", "eval"), defn.globals)
+        func = self._funcs[defn] = func(*compiler.values)
+
+        return func
+
     def eval(self, packet):
         """Returns the result of evaluating this PacketExpression in the
         context of the given Packet.
         """
+        func = self._funcs.get(packet._defn)
+
+        if func is None:
+            func = self.bind(packet._defn)
+
         try:
-            context = createPacketContext(packet)  # noqa
-            result = eval(self._code, packet._defn.globals, context)
+            result = func(packet)
         except ZeroDivisionError:
             result = None
 
@@ -793,6 +1876,70 @@ class PacketExpression:
         return self._expr
 
 
+class _PacketExpressionCompiler(ast.NodeTransformer):
+    """Rewrites the syntax tree of a PacketExpression so that each
+    reference to a packet field becomes a call to its FieldDecoder.
+    The names and values of the FieldDecoder methods (and other packet
+    context symbols) referenced are accumulated in names and values.
+    """
+
+    def __init__(self, decoder, tree):
+        self.decoder = decoder
+        self.names = []
+        self.values = []
+        self._symbols = {}
+
+        # Names bound within the expression itself (e.g. comprehension
+        # targets or lambda arguments) are never packet fields.
+        self._bound = set()
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                self._bound.add(node.id)
+            elif isinstance(node, ast.arg):
+                self._bound.add(node.arg)
+
+    def _symbol(self, key, value):
+        """Returns a Name node for the given packet context value."""
+        if key not in self._symbols:
+            self._symbols[key] = "__%s%d__" % (key[0], len(self.names))
+            self.names.append(self._symbols[key])
+            self.values.append(value)
+
+        return ast.Name(id=self._symbols[key], ctx=ast.Load())
+
+    def _call(self, key, value):
+        """Returns a Call node that calls value with the packet."""
+        packet = ast.Name(id="__packet__", ctx=ast.Load())
+        return ast.Call(func=self._symbol(key, value), args=[packet], keywords=[])
+
+    def visit_Attribute(self, node):  # noqa
+        value = node.value
+
+        if (
+            isinstance(value, ast.Name)
+            and value.id == "raw"
+            and "raw" not in self._bound
+            and node.attr in self.decoder
+        ):
+            get = functools.partial(self.decoder[node.attr].get, raw=True)
+            return self._call(("raw", node.attr), get)
+
+        return self.generic_visit(node)
+
+    def visit_Name(self, node):  # noqa
+        if not isinstance(node.ctx, ast.Load) or node.id in self._bound:
+            return node
+        elif node.id == "raw":
+            return self._call(("raw",), operator.attrgetter("raw"))
+        elif node.id == "history":
+            return self._symbol(("history",), self.decoder._defn.history)
+        elif node.id in self.decoder:
+            return self._call(("field", node.id), self.decoder[node.id].get)
+
+        return node
+
+
 class PacketFunction:
     """PacketFunction"""
 
@@ -1058,6 +2205,8 @@ class TlmDictWriter:
                 csvwriter = csv.writer(output, quoting=csv.QUOTE_ALL)
                 csvwriter.writerow(header)
 
+                layout = self.tlmdict[pkt_name].layout
+
                 for fld in self.tlmdict[pkt_name].fields:
                     # Pre-process some fields
 
@@ -1077,8 +2226,8 @@ class TlmDictWriter:
                     # Set row
                     row = [
                         fld.name,
-                        fld.slice().start,
-                        fld.slice().stop,
+                        layout[fld.name].start,
+                        layout[fld.name].stop,
                         mask,
                         fld.type.endian,
                         fld.type.name,
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+"""
+Compares capturing a burst of UDP datagrams with a SocketStreamCapturer
+reading one datagram per wakeup (the default) against batched reads
+(the recv_batch handler option).  A separate process sends the
+datagrams as fast as it can, e.g.:
+
+    python scripts/benchmarks/bsc_capture.py --packets 200000
+"""
+
+import argparse
+import multiprocessing
+import socket
+import tempfile
+import time
+
+import gevent.socket
+
+from ait.core import bsc
+
+
+def send(address, npackets, size):
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    packet = bytes(size)
+    for _ in range(npackets):
+        sender.sendto(packet, address)
+    sender.close()
+
+
+def capture(args, **options):
+    with tempfile.TemporaryDirectory() as log_dir:
+        handler = {"name": "bench", "log_dir": log_dir, "rotate_log": False}
+        handler.update(options)
+        sl = bsc.SocketStreamCapturer([handler], ["127.0.0.1", 0], "udp")
+        address = sl.socket.getsockname()
+
+        sender = multiprocessing.Process(
+            target=send, args=(address, args.packets, args.size)
+        )
+        sender.start()
+        start = time.perf_counter()
+        last = start
+
+        while True:
+            try:
+                gevent.socket.wait_read(sl.socket.fileno(), timeout=0.5)
+            except socket.timeout:
+                if not sender.is_alive():
+                    break
+                continue
+
+            if time.monotonic() >= sl._next_rotation:
+                sl._handle_log_rotations()
+            if sl._buffers is not None:
+                sl.capture_packets()
+            else:
+                sl.capture_packet()
+            last = time.perf_counter()
+
+        sender.join()
+        reads = handler["reads"]
+        drops = sl.kernel_drops()
+        sl.clean_up()
+
+    return last - start, reads, drops
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--packets", type=int, default=200000, help="Packets to send")
+    ap.add_argument("--size", type=int, default=128, help="Packet size in bytes")
+    ap.add_argument("--rcvbuf", type=int, default=0, help="SO_RCVBUF size")
+    args = ap.parse_args()
+
+    print(
+        "%-20s %12s %12s %12s %16s"
+        % ("Method", "time (ms)", "captured", "kernel drops", "packets/sec")
+    )
+
+    for name, options in (
+        ("recv()", {}),
+        ("recv_batch=64", {"recv_batch": 64}),
+    ):
+        if args.rcvbuf:
+            options["rcvbuf"] = args.rcvbuf
+        elapsed, reads, drops = capture(args, **options)
+        values = name, 1e3 * elapsed, reads, drops, reads / elapsed
+        print("%-20s %12.3f %12d %12s %16.0f" % values)
+
+
+if __name__ == "__main__":
+    main()
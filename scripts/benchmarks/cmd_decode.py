@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+Measures command decoding throughput.  A buffer of back-to-back
+encoded commands, cycling through every command in the command
+dictionary, is decoded by:
+
+    decode()        slicing each command and calling CmdDict.decode()
+    decode_stream   CmdDict.decode_stream(), yielding Cmd objects
+    (tuples)        CmdDict.decode_stream(create=False)
+    (filter)        CmdDict.decode_stream(create=False) counting a
+                    single command name
+
+Uses the command dictionary referenced by the AIT_CONFIG
+configuration, e.g.:
+
+    AIT_CONFIG=config/config.yaml python scripts/benchmarks/cmd_decode.py
+"""
+
+import argparse
+import timeit
+
+from ait.core import cmd
+
+from cmd_encode import sample
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--count", type=int, default=10000, help="Commands to decode")
+    ap.add_argument("--number", type=int, default=10, help="Iterations per timing")
+    args = ap.parse_args()
+
+    cmddict = cmd.getDefaultDict()
+    defns = [cmddict[name] for name in sorted(cmddict.keys())]
+    cmds = [sample(defns[n % len(defns)], n) for n in range(args.count)]
+    encoded = cmddict.encode_many(cmds, pad=0)
+    data = bytes(b"".join(encoded))
+    names = {defns[0].name}
+
+    def per_command():
+        cmds = []
+        offset = 0
+        for e in encoded:
+            cmds.append(cmddict.decode(data[offset : offset + len(e)]))
+            offset += len(e)
+        return cmds
+
+    def decode_stream():
+        return list(cmddict.decode_stream(data))
+
+    def tuples():
+        return list(cmddict.decode_stream(data, create=False))
+
+    def filtered():
+        return sum(1 for _ in cmddict.decode_stream(data, create=False, names=names))
+
+    assert [str(c) for c in per_command()] == [str(c) for c in decode_stream()]
+
+    print("%-16s %12s %16s" % ("Method", "time (ms)", "commands/sec"))
+
+    for name, func in (
+        ("decode()", per_command),
+        ("decode_stream", decode_stream),
+        ("(tuples)", tuples),
+        ("(filter)", filtered),
+    ):
+        elapsed = timeit.timeit(func, number=args.number) / args.number
+        print("%-16s %12.3f %16.0f" % (name, 1e3 * elapsed, args.count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
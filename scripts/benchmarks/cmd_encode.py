@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""
+Measures command encoding throughput.  A sequence of command strings,
+cycling through every command in the command dictionary, is encoded
+by:
+
+    create()        CmdDict.create() and Cmd.encode() per command
+    encode_many     CmdDict.encode_many() on distinct commands
+    (cached)        CmdDict.encode_many() again, hitting its cache
+    (contiguous)    as (cached), joined into a single buffer
+
+Uses the command dictionary referenced by the AIT_CONFIG
+configuration, e.g.:
+
+    AIT_CONFIG=config/config.yaml python scripts/benchmarks/cmd_encode.py
+"""
+
+import argparse
+import timeit
+
+from ait.core import cmd
+
+
+def sample(defn, n):
+    """Returns a command string for defn with sample argument values."""
+    tokens = [defn.name]
+
+    for arg in defn.args:
+        if arg.enum:
+            names = list(arg.enum.keys())
+            tokens.append(names[n % len(names)])
+        elif arg.type is not None and arg.type.string:
+            tokens.append("S%d" % n)
+        else:
+            tokens.append(str(n % 256))
+
+    return " ".join(tokens)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--count", type=int, default=10000, help="Commands to encode")
+    ap.add_argument("--number", type=int, default=10, help="Iterations per timing")
+    args = ap.parse_args()
+
+    cmddict = cmd.getDefaultDict()
+    defns = [cmddict[name] for name in sorted(cmddict.keys())]
+    cmds = [sample(defns[n % len(defns)], n) for n in range(args.count)]
+
+    def per_command():
+        return [cmddict.create(c).encode() for c in cmds]
+
+    def encode_many():
+        cmddict._encoded = None
+        return cmddict.encode_many(cmds)
+
+    def cached():
+        return cmddict.encode_many(cmds)
+
+    def contiguous():
+        return cmddict.encode_many(cmds, contiguous=True)
+
+    assert per_command() == encode_many() == cached()
+
+    print("%-16s %12s %16s" % ("Method", "time (ms)", "commands/sec"))
+
+    for name, func in (
+        ("create()", per_command),
+        ("encode_many", encode_many),
+        ("(cached)", cached),
+        ("(contiguous)", contiguous),
+    ):
+        elapsed = timeit.timeit(func, number=args.number) / args.number
+        print("%-16s %12.3f %16.0f" % (name, 1e3 * elapsed, args.count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
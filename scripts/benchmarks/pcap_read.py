@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+Compares reading every packet of a pcap file via PCapStream against
+PCapMmapStream (pcap.open(..., mmap=True)), and times random access
+by packet number once a PCapMmapStream has been scanned.  A
+temporary pcap file is written for the comparison, unless one is
+given, e.g.:
+
+    python scripts/benchmarks/pcap_read.py --packets 200000
+    python scripts/benchmarks/pcap_read.py capture.pcap
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from ait.core import pcap
+
+
+def elapsed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("filename", nargs="?", default=None, help="pcap file to read")
+    ap.add_argument("--packets", type=int, default=100000, help="Packets to write")
+    ap.add_argument("--size", type=int, default=128, help="Packet size in bytes")
+    args = ap.parse_args()
+
+    filename = args.filename
+
+    if filename is None:
+        fd, filename = tempfile.mkstemp(suffix=".pcap")
+        os.close(fd)
+        with pcap.open(filename, "w") as stream:
+            for n in range(args.packets):
+                stream.write(n.to_bytes(4, "big") * (args.size // 4))
+
+    def read(**options):
+        with pcap.open(filename, "r", **options) as stream:
+            return sum(len(packet) for _, packet in stream)
+
+    try:
+        before, nbytes = elapsed(read)
+        after, _ = elapsed(lambda: read(mmap=True))
+
+        print("%-24s %12s %12s" % ("Method", "time (ms)", "MB/sec"))
+        for name, secs in (("PCapStream", before), ("PCapMmapStream", after)):
+            print("%-24s %12.3f %12.1f" % (name, 1e3 * secs, nbytes / secs / 1e6))
+
+        with pcap.open(filename, "r", mmap=True) as stream:
+            scan, npackets = elapsed(lambda: len(stream))
+            indices = [random.randrange(npackets) for _ in range(10000)]
+            lookup, _ = elapsed(lambda: [stream[n] for n in indices])
+
+        print("%-24s %12.3f" % ("(scan index)", 1e3 * scan))
+        print("%-24s %12.3f" % ("(10000 random reads)", 1e3 * lookup))
+    finally:
+        if args.filename is None:
+            os.unlink(filename)
+
+
+if __name__ == "__main__":
+    main()
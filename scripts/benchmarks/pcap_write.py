@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+"""
+Compares writing packets to a pcap file via PCapStream.write() with
+a flush per packet (the default), buffered PCapStream.write(), and
+PCapStream.write_many(), e.g.:
+
+    python scripts/benchmarks/pcap_write.py --packets 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from ait.core import pcap
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--packets", type=int, default=100000, help="Packets to write")
+    ap.add_argument("--size", type=int, default=128, help="Packet size in bytes")
+    args = ap.parse_args()
+
+    packet = bytes(args.size)
+    fd, filename = tempfile.mkstemp(suffix=".pcap")
+    os.close(fd)
+
+    def write(**options):
+        with pcap.open(filename, "w", **options) as stream:
+            for _ in range(args.packets):
+                stream.write(packet)
+
+    def write_many():
+        with pcap.open(filename, "w") as stream:
+            for _ in range(0, args.packets, 1000):
+                stream.write_many([packet] * 1000)
+
+    try:
+        print("%-24s %12s %16s" % ("Method", "time (ms)", "packets/sec"))
+
+        for name, func in (
+            ("write()", write),
+            ("write(), buffered", lambda: write(buffered=True)),
+            ("write_many()", write_many),
+        ):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            values = name, 1e3 * elapsed, args.packets / elapsed
+            print("%-24s %12.3f %16.0f" % values)
+    finally:
+        os.unlink(filename)
+
+
+if __name__ == "__main__":
+    main()
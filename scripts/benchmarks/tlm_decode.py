@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+Compares the cost of decoding telemetry fields via the compiled
+per-PacketDefinition decoder (tlm.PacketDecoder) against decoding via
+FieldDefinition.decode(), which slices and unpacks on every call.  The
+"(decode_all)" row for each packet compares reading every raw field
+with getattr() against a single Packet.decode_all() call.  The "(cache)"
+row compares reading every field three times from a Packet created
+without and with its decoded value cache.
+
+Uses the telemetry dictionary referenced by the AIT_CONFIG
+configuration, e.g.:
+
+    AIT_CONFIG=config/config.yaml python scripts/benchmarks/tlm_decode.py
+"""
+
+import argparse
+import functools
+import timeit
+
+from ait.core import tlm
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--number", type=int, default=10000, help="Iterations per timing")
+    ap.add_argument("--packet", default=None, help="Packet name (default: all)")
+    args = ap.parse_args()
+
+    tlmdict = tlm.getDefaultDict()
+    names = [args.packet] if args.packet else sorted(tlmdict.keys())
+
+    print(
+        "%-24s %-24s %12s %12s %8s"
+        % ("Packet", "Field", "defn (us)", "decoder (us)", "speedup")
+    )
+
+    for name in names:
+        defn = tlmdict[name]
+        packet = defn.simulate()
+        data = packet._data
+
+        for fd in defn.fields:
+            decoder = defn.decoder[fd.name]
+
+            try:
+                fd.decode(data)
+            except Exception:
+                continue
+
+            before = timeit.timeit(
+                functools.partial(fd.decode, data), number=args.number
+            )
+            after = timeit.timeit(
+                functools.partial(decoder.decode, data), number=args.number
+            )
+            values = (
+                name,
+                fd.name,
+                1e6 * before / args.number,
+                1e6 * after / args.number,
+                before / after,
+            )
+            print("%-24s %-24s %12.3f %12.3f %7.1fx" % values)
+
+        def per_field(packet=packet, defn=defn):
+            return {fd.name: getattr(packet.raw, fd.name) for fd in defn.fields}
+
+        try:
+            per_field()
+        except Exception:
+            continue
+
+        before = timeit.timeit(per_field, number=args.number)
+        after = timeit.timeit(
+            functools.partial(packet.decode_all, values="raw"), number=args.number
+        )
+        values = (
+            name,
+            "(decode_all)",
+            1e6 * before / args.number,
+            1e6 * after / args.number,
+            before / after,
+        )
+        print("%-24s %-24s %12.3f %12.3f %7.1fx" % values)
+
+        def reread(cache, data=data, defn=defn):
+            packet = tlm.Packet(defn, data, cache=cache)
+            for _ in range(3):
+                for fd in defn.fields:
+                    getattr(packet, fd.name)
+
+        try:
+            reread(False)
+        except Exception:
+            continue
+
+        before = timeit.timeit(functools.partial(reread, False), number=args.number)
+        after = timeit.timeit(functools.partial(reread, True), number=args.number)
+        values = (
+            name,
+            "(cache)",
+            1e6 * before / args.number,
+            1e6 * after / args.number,
+            before / after,
+        )
+        print("%-24s %-24s %12.3f %12.3f %7.1fx" % values)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+Measures the rate at which messages published by a ZMQClient reach
+the process() method of a ZMQInputClient through a Broker, with and
+without publish batching (see ZMQClient.batch).  Messages dropped at
+a high water mark are reported as not received, e.g.:
+
+    python scripts/benchmarks/zmq_batch.py --messages 100000 --count 100
+"""
+
+import argparse
+import time
+
+import gevent
+
+from ait.core.server.broker import Broker
+from ait.core.server.client import ZMQClient, ZMQInputClient
+
+
+class Counter(ZMQInputClient):
+    name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super(Counter, self).__init__(*args, **kwargs)
+        self.count = 0
+
+    def process(self, input_data, topic=None):
+        self.count += 1
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--messages", type=int, default=100000, help="Messages to send")
+    ap.add_argument("--size", type=int, default=128, help="Message size in bytes")
+    ap.add_argument("--count", type=int, default=100, help="Messages per batch")
+    args = ap.parse_args()
+
+    broker = Broker()
+    broker.mode = "thread"
+    broker.XSUB_URL = "inproc://bench-xsub"
+    broker.XPUB_URL = "inproc://bench-xpub"
+    broker.start()
+    gevent.sleep(0.1)
+
+    payload = bytes(args.size)
+
+    print(
+        "%-16s %12s %12s %16s" % ("Batching", "received", "time (ms)", "messages/sec")
+    )
+
+    for name, batch in (
+        ("none", None),
+        ("count=%d" % args.count, {"count": args.count}),
+    ):
+        client = ZMQClient(broker.context, broker.XSUB_URL, broker.XPUB_URL)
+        client.name = "bench"
+        client.wire_format = "binary"
+        client.batch = batch
+
+        counter = Counter(broker.context, broker.XSUB_URL, broker.XPUB_URL)
+        Broker.subscribe(counter, "bench")
+        counter.start()
+        gevent.sleep(0.2)
+
+        start = time.perf_counter()
+        for _ in range(args.messages):
+            # Yield per message, as a stream does between datagrams
+            client.publish(payload)
+            gevent.sleep(0)
+        client.flush()
+
+        end, count = time.perf_counter(), 0
+        while counter.count < args.messages and time.perf_counter() - end < 1:
+            if counter.count > count:
+                end, count = time.perf_counter(), counter.count
+            gevent.sleep(0.001)
+        elapsed = end - start
+
+        counter.kill()
+        client.pub.close()
+        counter.sub.close()
+        counter.pub.close()
+        values = name, counter.count, 1e3 * elapsed, counter.count / elapsed
+        print("%-16s %12d %12.3f %16.0f" % values)
+
+    broker.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""
+Measures Broker throughput with messages forwarded by the broker
+greenlet (server.broker.mode: greenlet) and by zmq.proxy_steerable()
+in a native thread (server.broker.mode: thread).  A publisher process
+sends a burst of messages through the broker to a subscriber process,
+which reports how many it received and how quickly, e.g.:
+
+    python scripts/benchmarks/zmq_broker.py --messages 200000 --size 512
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import zmq
+
+XSUB_URL = "tcp://127.0.0.1:%d"
+XPUB_URL = "tcp://127.0.0.1:%d"
+
+
+def broker(mode, port, ready):
+    import gevent
+    from ait.core.server.broker import Broker
+
+    b = Broker()
+    b.mode = mode
+    b.XSUB_URL = XSUB_URL % port
+    b.XPUB_URL = XPUB_URL % (port + 1)
+    b.start()
+    gevent.sleep(0.5)
+    ready.set()
+    b.join()
+
+
+def publish(port, messages, size):
+    context = zmq.Context()
+    pub = context.socket(zmq.PUB)
+    pub.setsockopt(zmq.SNDHWM, 0)
+    pub.connect(XSUB_URL % port)
+    time.sleep(1)
+
+    payload = bytes(size)
+    for _ in range(messages):
+        pub.send_multipart([b"bench", payload])
+
+    pub.close(linger=-1)
+    context.term()
+
+
+def subscribe(port, messages, result):
+    context = zmq.Context()
+    sub = context.socket(zmq.SUB)
+    sub.setsockopt(zmq.RCVHWM, 0)
+    sub.connect(XPUB_URL % (port + 1))
+    sub.setsockopt(zmq.SUBSCRIBE, b"bench")
+
+    count = 0
+    start = end = None
+    while count < messages and sub.poll(2000):
+        sub.recv_multipart()
+        end = time.perf_counter()
+        if start is None:
+            start = end
+        count += 1
+
+    result.put((count, end - start if count > 1 else 0))
+    sub.close()
+    context.term()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--messages", type=int, default=100000, help="Messages to send")
+    ap.add_argument("--size", type=int, default=128, help="Message size in bytes")
+    ap.add_argument("--port", type=int, default=25559, help="First port to use")
+    args = ap.parse_args()
+
+    print("%-12s %12s %16s" % ("Mode", "received", "messages/sec"))
+
+    for n, mode in enumerate(("greenlet", "thread")):
+        port = args.port + 2 * n
+        ready = multiprocessing.Event()
+        result = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=broker, args=(mode, port, ready))]
+        procs[0].start()
+        ready.wait()
+
+        procs.append(
+            multiprocessing.Process(
+                target=subscribe, args=(port, args.messages, result)
+            )
+        )
+        procs.append(
+            multiprocessing.Process(
+                target=publish, args=(port, args.messages, args.size)
+            )
+        )
+        for proc in procs[1:]:
+            proc.start()
+
+        count, elapsed = result.get()
+        for proc in procs:
+            proc.terminate()
+            proc.join()
+
+        rate = count / elapsed if elapsed else 0
+        print("%-12s %12d %16.0f" % (mode, count, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""
+Compares the per-message overhead of the pickle and binary 0MQ wire
+formats for tagged packets, from the handler output to the (uid, data)
+tuple a plugin decodes:
+
+    pickle      PacketHandler output pickled, then pickled again by
+                encode_message(), with two pickle.loads() on receipt
+    binary      TaggedPacket sent as a header and raw payload frame
+
+Each is timed encoding and decoding in-process, and sent over an
+inproc PUB/SUB socket pair using zmq.green as the server does, e.g.:
+
+    python scripts/benchmarks/zmq_wire.py --messages 100000 --size 1024
+"""
+
+import argparse
+import pickle
+import time
+
+import gevent
+import zmq.green as zmq
+
+from ait.core.server import utils
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--messages", type=int, default=100000, help="Messages to send")
+    ap.add_argument("--size", type=int, default=128, help="Packet size in bytes")
+    args = ap.parse_args()
+
+    data = bytes(args.size)
+
+    def pickled():
+        return utils.encode_message("topic", pickle.dumps((1, data), 2))
+
+    def binary():
+        return utils.encode_message("topic", utils.TaggedPacket(1, data))
+
+    def decode(frames):
+        topic, message = utils.decode_message(frames)
+        return utils.load_packet(message)
+
+    context = zmq.Context()
+    pub = context.socket(zmq.PUB)
+    sub = context.socket(zmq.SUB)
+    pub.setsockopt(zmq.SNDHWM, 0)
+    sub.setsockopt(zmq.RCVHWM, 0)
+    pub.bind("inproc://wire")
+    sub.connect("inproc://wire")
+    sub.setsockopt(zmq.SUBSCRIBE, b"")
+    gevent.sleep(0.1)
+
+    def encode_decode(encode):
+        for _ in range(args.messages):
+            decode(encode())
+
+    def send_recv(encode):
+        for _ in range(args.messages):
+            pub.send_multipart(encode(), copy=False)
+            decode(sub.recv_multipart())
+            # As ZMQInputClient does, let pyzmq's (greened) garbage
+            # collector release zero-copy frames
+            gevent.sleep(0)
+
+    try:
+        print("%-24s %12s %16s" % ("Method", "usec/message", "messages/sec"))
+
+        for name, func in (("encode/decode", encode_decode), ("inproc", send_recv)):
+            for fmt, encode in (("pickle", pickled), ("binary", binary)):
+                assert decode(encode()) == (1, data)
+                start = time.perf_counter()
+                func(encode)
+                elapsed = time.perf_counter() - start
+                label = "%s (%s)" % (name, fmt)
+                values = label, 1e6 * elapsed / args.messages, args.messages / elapsed
+                print("%-24s %12.3f %16.0f" % values)
+    finally:
+        pub.close()
+        sub.close()
+        context.term()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from unittest import mock
+
+import gevent
+import pytest
+import zmq.green as zmq
+
+from ait.core.server.broker import Broker
+
+
+class TestBrokerThread:
+    def setup_method(self):
+        self.broker = Broker()
+        self.broker.mode = "thread"
+        self.broker.XSUB_URL = "inproc://test-broker-xsub"
+        self.broker.XPUB_URL = "inproc://test-broker-xpub"
+        self.broker.capture_url = "inproc://test-broker-capture"
+
+    def teardown_method(self):
+        self.broker.kill()
+        self.broker.context.destroy(linger=0)
+
+    def socket(self, socket_type, url):
+        sock = self.broker.context.socket(socket_type)
+        sock.connect(url)
+        if socket_type == zmq.SUB:
+            sock.setsockopt(zmq.SUBSCRIBE, b"")
+        return sock
+
+    def test_forward(self):
+        self.broker.start()
+        gevent.sleep(0.1)
+
+        pub = self.socket(zmq.PUB, self.broker.XSUB_URL)
+        sub = self.socket(zmq.SUB, self.broker.XPUB_URL)
+        capture = self.socket(zmq.SUB, self.broker.capture_url)
+        gevent.sleep(0.2)
+
+        pub.send_multipart([b"topic", b"data"])
+        assert sub.poll(1000)
+        assert sub.recv_multipart() == [b"topic", b"data"]
+        assert capture.poll(1000)
+
+        self.broker.pause()
+        gevent.sleep(0.1)
+        if zmq.zmq_version_info() < (4, 3, 5):
+            pub.send_multipart([b"topic", b"paused"])
+            assert sub.poll(200) == 0
+
+            self.broker.resume()
+            assert sub.poll(1000)
+            assert sub.recv_multipart() == [b"topic", b"paused"]
+        else:
+            # libzmq 4.3.5 acknowledges PAUSE and RESUME, but does not
+            # reliably pause, and may hold back messages sent meanwhile
+            self.broker.resume()
+            assert self.broker._control is not None
+
+        self.broker.terminate()
+        self.broker.join(timeout=5)
+        assert self.broker.dead
+
+        for sock in (pub, sub, capture):
+            sock.close(linger=0)
+
+    def test_kill(self):
+        self.broker.start()
+        gevent.sleep(0.1)
+        self.broker.kill(timeout=5)
+        assert self.broker.dead
+        assert self.broker._control is None
+        assert self.broker.stats() == {"mode": "thread", "forwarded": None}
+
+
+def test_broker_mode():
+    with pytest.raises(ValueError):
+        Broker().pause()
+
+    with mock.patch(
+        "ait.core.server.config.ZmqConfig.get_broker_mode", return_value="process"
+    ):
+        with pytest.raises(ValueError):
+            Broker()
+
+
+def test_broker_stats():
+    broker = Broker()
+    broker.XSUB_URL = "inproc://test-stats-xsub"
+    broker.XPUB_URL = "inproc://test-stats-xpub"
+    broker.socket_options = {"sndhwm": 5}
+    broker.start()
+    gevent.sleep(0.1)
+    assert broker.backend.getsockopt(zmq.SNDHWM) == 5
+
+    pub = broker.context.socket(zmq.PUB)
+    pub.connect(broker.XSUB_URL)
+    sub = broker.context.socket(zmq.SUB)
+    sub.connect(broker.XPUB_URL)
+    sub.setsockopt(zmq.SUBSCRIBE, b"")
+    gevent.sleep(0.2)
+
+    pub.send_multipart([b"topic", b"data"])
+    assert sub.poll(1000)
+    assert broker.stats() == {"mode": "greenlet", "forwarded": 1}
+
+    broker.kill()
+    broker.context.destroy(linger=0)
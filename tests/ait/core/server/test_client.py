@@ -0,0 +1,172 @@
+import gevent
+import pytest
+import zmq.green as zmq
+
+from ait.core.server import utils
+from ait.core.server.client import ZMQClient, ZMQInputClient
+
+
+class Recorder(ZMQInputClient):
+    name = "recorder"
+
+    def __init__(self, *args, **kwargs):
+        super(Recorder, self).__init__(*args, **kwargs)
+        self.received = []
+        self.batches = []
+
+    def process(self, input_data, topic=None):
+        self.received.append(input_data)
+
+    def process_batch(self, messages, topic=None):
+        self.batches.append(len(messages))
+        super(Recorder, self).process_batch(messages, topic=topic)
+
+
+class TestBatching:
+    def setup_method(self):
+        self.context = zmq.Context()
+        self.xsub_url = "inproc://test-client-xsub"
+        self.xpub_url = "inproc://test-client-xpub"
+
+        # Subscriber standing in for the broker's XSUB socket
+        self.sub = self.context.socket(zmq.SUB)
+        self.sub.bind(self.xsub_url)
+        self.sub.setsockopt(zmq.SUBSCRIBE, b"")
+
+        self.client = ZMQClient(self.context, self.xsub_url, self.xpub_url)
+        self.client.name = "client"
+        gevent.sleep(0.1)
+
+    def teardown_method(self):
+        self.context.destroy(linger=0)
+
+    def recv(self):
+        assert self.sub.poll(1000)
+        return self.sub.recv_multipart()
+
+    def test_publish_count(self):
+        self.client.batch = {"count": 3, "latency": 10}
+
+        for n in range(3):
+            self.client.publish(n)
+
+        msg = self.recv()
+        assert len(msg) == 8
+        assert utils.decode_messages(msg) == ("client", [0, 1, 2])
+        assert self.sub.poll(100) == 0
+
+    def test_publish_bytes(self):
+        self.client.wire_format = "binary"
+        self.client.batch = {"bytes": 10, "latency": 10}
+
+        self.client.publish(b"12345")
+        self.client.publish(utils.TaggedPacket(1, b"67890"))
+
+        topic, messages = utils.decode_messages(self.recv())
+        assert messages == [b"12345", (1, b"67890")]
+        assert isinstance(messages[1], utils.TaggedPacket)
+
+    def test_publish_latency(self):
+        self.client.batch = {"count": 100, "latency": 0.05}
+
+        self.client.publish("first")
+        assert self.sub.poll(10) == 0
+
+        # A lone message is sent without a batch envelope
+        msg = self.recv()
+        assert len(msg) == 3
+        assert utils.decode_messages(msg) == ("client", ["first"])
+
+    def test_flush(self):
+        self.client.batch = {"latency": 10}
+        self.client.publish("a", topic="one")
+        self.client.publish("b", topic="two")
+        self.client.publish("c", topic="two")
+        self.client.flush()
+
+        received = dict(utils.decode_messages(self.recv()) for _ in range(2))
+        assert received == {"one": ["a"], "two": ["b", "c"]}
+        assert self.client._batches == {}
+
+    def test_process_batch(self):
+        pub = self.context.socket(zmq.PUB)
+        pub.bind(self.xpub_url)
+
+        recorder = Recorder(self.context, self.xsub_url, self.xpub_url)
+        recorder.sub.setsockopt(zmq.SUBSCRIBE, b"")
+        recorder.start()
+        gevent.sleep(0.1)
+
+        pub.send_multipart(utils.encode_message("topic", "single"))
+        frames = [utils.encode_frames(n) for n in range(3)]
+        frames.append(utils.encode_frames(utils.TaggedPacket(5, b"data")))
+        pub.send_multipart(utils.encode_batch("topic", frames))
+        gevent.sleep(0.1)
+        recorder.kill()
+
+        assert recorder.batches == [4]
+        assert recorder.received[:4] == ["single", 0, 1, 2]
+        assert utils.load_packet(recorder.received[4]) == (5, b"data")
+
+    def test_stats(self):
+        self.client.publish("a")
+        self.client.publish(object)
+        self.client.batch = {"latency": 10}
+        self.client.publish("b")
+        self.client.publish(lambda: None)
+
+        stats = self.client.stats()
+        assert stats["published"] == 2
+        assert stats["dropped"] == 1
+        assert stats["queued"] == 1
+
+        self.client.flush()
+        assert self.client.stats()["published"] == 3
+
+
+class TestSocketOptions:
+    def setup_method(self):
+        self.context = zmq.Context()
+        self.xsub_url = "inproc://test-options-xsub"
+        self.xpub_url = "inproc://test-options-xpub"
+
+    def teardown_method(self):
+        self.context.destroy(linger=0)
+
+    def test_options(self):
+        options = {"sndhwm": 5, "rcvhwm": 7, "linger": 0}
+        client = Recorder(self.context, self.xsub_url, self.xpub_url, options)
+        assert client.pub.getsockopt(zmq.SNDHWM) == 5
+        assert client.sub.getsockopt(zmq.RCVHWM) == 7
+        assert client.sub.getsockopt(zmq.LINGER) == 0
+        assert not client._conflate
+
+        with pytest.raises(ValueError):
+            Recorder(self.context, self.xsub_url, self.xpub_url, {"hwm": 1})
+
+    def test_conflate(self):
+        pub = self.context.socket(zmq.PUB)
+        pub.bind(self.xpub_url)
+
+        options = {"conflate": True}
+        recorder = Recorder(self.context, self.xsub_url, self.xpub_url, options)
+        recorder.sub.setsockopt(zmq.SUBSCRIBE, b"")
+        gevent.sleep(0.1)
+
+        for n in range(5):
+            pub.send_multipart(utils.encode_message("one", n))
+        pub.send_multipart(utils.encode_message("two", "x"))
+        pub.send_multipart([b"invalid"])
+        frames = [utils.encode_frames(n) for n in range(5, 8)]
+        pub.send_multipart(utils.encode_batch("one", frames))
+        gevent.sleep(0.1)
+
+        recorder.start()
+        gevent.sleep(0.1)
+        recorder.kill()
+
+        assert sorted(recorder.received, key=str) == [7, "x"]
+        stats = recorder.stats()
+        assert stats["received"] == 10
+        assert stats["processed"] == 2
+        assert stats["dropped"] == 8
@@ -3,6 +3,7 @@ import unittest
 from unittest import mock
 
 from ait.core import tlm
+from ait.core.server import utils
 from ait.core.server.handlers import CCSDSPacketHandler
 from ait.core.server.handlers import PacketHandler
 
@@ -46,6 +47,24 @@ class TestCCSDSPacketCheck(unittest.TestCase):
         result = handler.handle(data)
         self.assertEqual(packet_uid, pickle.loads(result)[0])
 
+    # Check binary wire format output is an unpickled TaggedPacket
+    def test_ccsds_packet_binary(self):
+        handler = CCSDSPacketHandler(
+            packet_types={"01011100111": "CCSDS_HEADER"}, wire_format="binary"
+        )
+        data = bytearray(b"\x02\xE7\x40\x00\x00\x00\x01")
+
+        packet_uid = tlm.getDefaultDict()["CCSDS_HEADER"].uid
+        result = handler.handle(data)
+        self.assertIsInstance(result, utils.TaggedPacket)
+        self.assertEqual((packet_uid, b"\x01"), result)
+
+    def test_ccsds_packet_wire_format(self):
+        with self.assertRaises(ValueError):
+            CCSDSPacketHandler(
+                packet_types={"01011100111": "CCSDS_HEADER"}, wire_format="json"
+            )
+
 
 class TestHandlerClassWithInputOutputTypes(object):
     handler = PacketHandler(packet="CCSDS_HEADER", input_type="int", output_type="str")
@@ -79,6 +98,13 @@ class TestHandlerClassWithoutInputOutputTypes(object):
     def test_handler_repr(self):
         assert self.handler.__repr__() == "<handler.PacketHandler>"
 
+    def test_handler_wire_format(self):
+        uid = tlm.getDefaultDict()["CCSDS_HEADER"].uid
+        assert pickle.loads(self.handler.handle(b"data")) == (uid, b"data")
+
+        handler = PacketHandler(packet="CCSDS_HEADER", wire_format="binary")
+        assert handler.handle(b"data") == utils.TaggedPacket(uid, b"data")
+
 
 class TestCCSDSHandlerClassWithInputOutputTypes(object):
     handler = CCSDSPacketHandler(
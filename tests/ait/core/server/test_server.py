@@ -3,6 +3,7 @@ from unittest import mock
 from unittest import TestCase
 
 import pytest
+import zmq.green as zmq
 
 import ait.core.server
 from ait.core import cfg
@@ -357,6 +358,23 @@ class TestStreamCreation(object):
         assert created_stream.inputs == [3333]
         assert created_stream.handlers == []
 
+        # Testing creation of inbound stream with socket options and batching
+        config = {
+            "name": "some_stream",
+            "input": ["some_input"],
+            "socket_options": {"sndhwm": 20, "rcvhwm": 10},
+            "batch": {"count": 5},
+        }
+        created_stream = server._create_inbound_stream(config)
+        assert created_stream.socket_options == {"sndhwm": 20, "rcvhwm": 10}
+        created_stream.pub.setsockopt.assert_any_call(zmq.SNDHWM, 20)
+        created_stream.sub.setsockopt.assert_any_call(zmq.RCVHWM, 10)
+        assert created_stream.batch == {"count": 5}
+
+        server.inbound_streams = [created_stream]
+        stats = server.stats()
+        assert stats["streams"]["some_stream"]["received"] == 0
+
     @mock.patch.object(ait.core.server.server.Server, "_create_handler")
     def test_successful_outbound_stream_creation(
         self, create_handler_mock, server_stream_plugin_mock_mock, broker_class_mock
@@ -0,0 +1,68 @@
+import pickle
+
+from ait.core.server import utils
+
+
+class TestWireFormat:
+    def test_pickle_roundtrip(self):
+        data = {"key": [1, 2, 3]}
+        enc = utils.encode_message("topic", data)
+        assert len(enc) == 2
+        assert utils.decode_message(enc) == ("topic", data)
+
+        # Bytes are only sent raw in the binary wire format
+        enc = utils.encode_message("topic", b"data")
+        assert len(enc) == 2
+        assert utils.decode_message(enc) == ("topic", b"data")
+
+    def test_binary_roundtrip(self):
+        enc = utils.encode_message("topic", b"data", binary=True)
+        assert len(enc) == 3
+        assert enc[2] == b"data"
+        assert utils.decode_message(enc) == ("topic", b"data")
+
+        # Other objects fall back to pickle
+        enc = utils.encode_message("topic", [1, 2], binary=True)
+        assert len(enc) == 2
+        assert utils.decode_message(enc) == ("topic", [1, 2])
+
+    def test_tagged_packet(self):
+        packet = utils.TaggedPacket(42, bytearray(b"\x01\x02"))
+        enc = utils.encode_message("topic", packet)
+        assert len(enc) == 3
+        assert enc[2] is packet.data
+
+        version, mtype, uid, ts_ns = utils.WIRE_HEADER.unpack(enc[1])
+        assert (version, mtype, uid) == (utils.WIRE_VERSION, utils.MSG_PACKET, 42)
+        assert ts_ns > 0
+
+        # Frames as received via recv_multipart()
+        topic, msg = utils.decode_message([bytes(f) for f in enc])
+        assert topic == "topic"
+        assert isinstance(msg, utils.TaggedPacket)
+        assert msg == (42, b"\x01\x02")
+
+    def test_decode_invalid(self):
+        header = utils.WIRE_HEADER.pack(99, utils.MSG_PACKET, 1, 0)
+        assert utils.decode_message([b"topic", header, b""]) == (None, None)
+        assert utils.decode_message([b"topic", b"\x00"]) == (None, None)
+
+    def test_load_packet(self):
+        packet = utils.TaggedPacket(42, b"\x01\x02")
+        assert utils.load_packet(packet) == (42, b"\x01\x02")
+        assert utils.load_packet(utils.pickle_packet(packet)) == (42, b"\x01\x02")
+        assert utils.load_packet(pickle.dumps((42, b"\x01\x02"), 2)) == (
+            42,
+            b"\x01\x02",
+        )
+
+    def test_batch(self):
+        frames = [utils.encode_frames(b"raw", binary=True), utils.encode_frames([1])]
+        enc = utils.encode_batch("topic", frames)
+        assert len(enc) == 6
+        assert utils.decode_messages(enc) == ("topic", [b"raw", [1]])
+
+        # Batches are only accepted by decode_messages()
+        assert utils.decode_message(enc) == (None, None)
+        assert utils.decode_messages(enc[:-1]) == (None, None)
+        assert utils.decode_messages(enc[:4]) == (None, None)
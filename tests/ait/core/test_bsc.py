@@ -148,6 +148,98 @@ class TestSocketStreamCapturer:
         assert transform_mock.called
         logger.write.assert_called_with("transformed data")
 
+    def test_capture_packets(self, tmpdir):
+        h1 = {"name": "h1", "log_dir": str(tmpdir), "recv_batch": 4}
+        h2 = {
+            "name": "h2",
+            "log_dir": str(tmpdir),
+            "rcvbuf": 262144,
+            "pre_write_transforms": [bytes.upper],
+            "queue_size": 16,
+        }
+        sl = bsc.SocketStreamCapturer([h1, h2], ["127.0.0.1", 0], "udp")
+        assert sl.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 262144
+
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for n in range(6):
+            sender.sendto(b"packet %d" % n, sl.socket.getsockname())
+        sender.close()
+
+        gevent.socket.wait_read(sl.socket.fileno(), timeout=1)
+        assert sl.capture_packets() == 4
+        assert sl.capture_packets() == 2
+        assert sl.capture_packets() == 0
+        assert [h["reads"] for h in sl.capture_handlers] == [6, 6]
+        assert sl.truncated == 0
+
+        log_files = [h["logger"]._stream.name for h in sl.capture_handlers]
+        sl.clean_up()
+
+        for log_file, expected in zip(log_files, (b"packet", b"PACKET")):
+            with pcap.open(log_file, "r") as stream:
+                packets = [packet for _, packet in stream]
+            assert packets == [b"%s %d" % (expected, n) for n in range(6)]
+
+    @mock.patch("ait.core.pcap.open")
+    @mock.patch("gevent.socket.socket")
+    def test_capture_queued(self, socket_mock, pcap_open_mock):
+        pcap_open_mock.side_effect = lambda *args, **kwargs: mock.MagicMock()
+
+        def capture(*handlers):
+            sl = bsc.SocketStreamCapturer(list(handlers), ["", 9000], "udp")
+            for h in sl.capture_handlers:
+                h["log_rot_time"] = time.gmtime(time.time() - 60)
+
+            # Nothing is written until the writers run, so the queues fill
+            # (or, for the "block" policy, reading waits for the writer).
+            for n in range(4):
+                sl.socket.recv.return_value = b"data %d" % n
+                sl.capture_packet()
+
+            stats = sl.dump_all_handler_stats()
+            loggers = [h["logger"] for h in sl.capture_handlers]
+            sl.clean_up()
+
+            assert all(logger.close.called for logger in loggers)
+            written = [
+                [d for call in logger.write_many.call_args_list for d in call[0][0]]
+                for logger in loggers
+            ]
+            return stats, written
+
+        stats, written = capture(
+            {
+                "name": "oldest",
+                "log_dir": "/tmp",
+                "queue_size": 2,
+                "queue_overflow": "drop-oldest",
+                "pre_write_transforms": [bytes.upper],
+            },
+            {
+                "name": "newest",
+                "log_dir": "/tmp",
+                "queue_size": 2,
+                "queue_overflow": "drop-newest",
+            },
+        )
+        assert [s["dropped"] for s in stats] == [2, 2]
+        assert [s["queued"] for s in stats] == [2, 2]
+        assert written == [[b"DATA 2", b"DATA 3"], [b"data 0", b"data 1"]]
+
+        stats, written = capture({"name": "block", "log_dir": "/tmp", "queue_size": 2})
+        assert stats[0]["dropped"] == 0
+        assert written == [[b"data %d" % n for n in range(4)]]
+
+        with pytest.raises(ValueError):
+            capture(
+                {
+                    "name": "bad",
+                    "log_dir": "/tmp",
+                    "queue_size": 2,
+                    "queue_overflow": "x",
+                }
+            )
+
     @mock.patch("gevent.socket.socket")
     def test_logger_conf_dump(self, socket_mock):
         handler = {"name": "name", "log_dir": "/tmp", "rotate_log": True}
@@ -238,6 +330,47 @@ class TestSocketStreamCapturer:
         h["log_rot_time"] = new_date.timetuple()
         assert sl._should_rotate_log(h) == True
 
+    @mock.patch("gevent.socket.socket")
+    def test_rotation_time(self, socket_mock):
+        handler = {"name": "name", "log_dir": "/tmp", "rotate_log": True}
+        sl = bsc.SocketStreamCapturer(handler, ["", 9000], "udp")
+        h = sl.capture_handlers[0]
+
+        gmtime = time.gmtime
+        opened = [
+            datetime.datetime(2020, 1, 31, 12, 30, 30),
+            datetime.datetime(2020, 2, 28, 23, 59, 59),
+            datetime.datetime(2021, 12, 31, 23, 59, 59),
+        ]
+
+        for index in ("years", "months", "days", "hours", "minutes", "seconds"):
+            for delta in (1, 2, 40):
+                h["rotate_log_index"] = index
+                h["rotate_log_delta"] = delta
+
+                for when in opened:
+                    h["log_rot_time"] = when.timetuple()
+                    rotation_time = sl._rotation_time(h)
+
+                    # _should_rotate_log() first holds at the rotation time
+                    for now, expected in (
+                        (rotation_time - 1, False),
+                        (rotation_time, True),
+                    ):
+                        with mock.patch("time.gmtime", return_value=gmtime(now)):
+                            assert sl._should_rotate_log(h) == expected
+
+        h["rotate_log_index"] = "days"
+        h["rotate_log_delta"] = 1
+        h["log_rot_time"] = time.gmtime()
+        h["log_rot_deadline"] = sl._rotation_deadline(h)
+        sl._schedule_rotations()
+        assert 0 < sl._next_rotation - time.monotonic() <= 86400
+        assert 0 < sl._wait_timeout() <= 86400
+
+        h["rotate_log"] = False
+        assert sl._rotation_deadline(h) is None
+
     @mock.patch("ait.core.pcap.PCapStream")
     @mock.patch("ait.core.pcap.open")
     @mock.patch("gevent.socket.socket")
@@ -326,6 +459,33 @@ class TestSocketStreamCapturer:
         log_path = sl._get_log_file(handler)
         pcap_open_mock.assert_called_with(log_path, mode="a")
 
+    @mock.patch("ait.core.pcap.open")
+    @mock.patch("gevent.socket.socket")
+    def test_get_buffered_logger(self, socket_mock, pcap_open_mock):
+        handler = {
+            "name": "name",
+            "log_dir": "/tmp",
+            "rotate_log": True,
+            "buffered": True,
+            "flush_npackets": 10,
+        }
+        sl = bsc.SocketStreamCapturer(handler, ["", 9000], "udp")
+        handler = sl.capture_handlers[0]
+        log_path = sl._get_log_file(handler)
+        pcap_open_mock.assert_called_with(
+            log_path, mode="a", buffered=True, flush_npackets=10
+        )
+
+        assert sl._flush_timeout() == 1.0
+        handler["flush_nseconds"] = 0.25
+        assert sl._flush_timeout() == 0.25
+
+        sl._flush_loggers()
+        assert handler["logger"].flush.call_count == 1
+
+        handler["buffered"] = False
+        assert sl._flush_timeout() is None
+
     @mock.patch("ait.core.pcap.open")
     @mock.patch("gevent.socket.socket")
     def test_add_handler(self, socket_mock, pcap_open_mock):
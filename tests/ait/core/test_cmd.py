@@ -39,6 +39,21 @@ CMDDICT_TEST = """
       enum:
         0: DISABLED
         1: ENABLED
+
+- !Command
+  name:      SEQ_SET_DELAY
+  opcode:    0x0043
+  arguments:
+    - !Fixed
+      name:  version
+      type:  U8
+      bytes: 0
+      value: 3
+
+    - !Argument
+      name:  delay
+      type:  MSB_U16
+      bytes: [1, 2]
 """
 
 
@@ -136,6 +151,107 @@ def testCmdDefn():
     assert defn.nargs == 2
 
 
+def testCmdEncode():
+    cmddict = cmd.CmdDict(CMDDICT_TEST)
+
+    encoded = cmddict.create("SEQ_ENABLE_DISABLE", 1234, "ENABLED").encode()
+    assert len(encoded) == 106
+    assert encoded[:6] == struct.pack(">HBHB", 0x0042, 3, 1234, 1)
+    assert encoded[6:] == bytes(100)
+
+    encoded = cmddict.create("SEQ_SET_DELAY", 513).encode(pad=0)
+    assert encoded == struct.pack(">HBBH", 0x0043, 3, 3, 513)
+
+    defn = cmddict["SEQ_SET_DELAY"]
+    encoder = defn.encoder
+    assert defn.encoder is encoder
+    defn.argdefns = list(defn.argdefns)
+    assert defn.encoder is not encoder
+
+
+def testCmdDictEncodeMany():
+    cmddict = cmd.CmdDict(CMDDICT_TEST)
+    cmds = [
+        "SEQ_ENABLE_DISABLE 1234 ENABLED",
+        ("SEQ_SET_DELAY", 513),
+        ["SEQ_SET_DELAY", 514],
+        cmddict.create("SEQ_ENABLE_DISABLE", 7, "DISABLED"),
+        "SEQ_ENABLE_DISABLE 1234 ENABLED",
+    ]
+    expected = [
+        cmddict.create("SEQ_ENABLE_DISABLE", 1234, "ENABLED").encode(pad=0),
+        cmddict.create("SEQ_SET_DELAY", 513).encode(pad=0),
+        cmddict.create("SEQ_SET_DELAY", 514).encode(pad=0),
+        cmddict.create("SEQ_ENABLE_DISABLE", 7, "DISABLED").encode(pad=0),
+        cmddict.create("SEQ_ENABLE_DISABLE", 1234, "ENABLED").encode(pad=0),
+    ]
+
+    encoded = cmddict.encode_many(cmds, pad=0)
+    assert encoded == expected
+    assert all(type(e) is bytearray for e in encoded)
+    assert encoded[0] is not encoded[4]
+
+    assert cmddict.encode_many(cmds, pad=0, contiguous=True) == b"".join(expected)
+    assert cmddict.encode_many(cmds[:1]) == [expected[0] + bytes(100)]
+
+    with pytest.raises(TypeError):
+        cmddict.encode_many(["NO_SUCH_CMD 1"])
+
+    with pytest.raises(ValueError):
+        cmddict.encode_many([("SEQ_SET_DELAY",)])
+
+    # Invalid commands are rejected, even when equal to cached ones.
+    with pytest.raises(ValueError):
+        cmddict.encode_many(["SEQ_ENABLE_DISABLE 1234 ON"])
+
+    assert cmddict.encode_many([("SEQ_SET_DELAY", 1)], pad=0)
+    with pytest.raises(ValueError):
+        cmddict.encode_many([("SEQ_SET_DELAY", 1.0)], pad=0)
+
+
+def testCmdDictDecode():
+    cmddict = cmd.CmdDict(CMDDICT_TEST)
+
+    decoded = cmddict.decode(cmddict.create("SEQ_SET_DELAY", 513).encode())
+    assert decoded.name == "SEQ_SET_DELAY"
+    assert decoded.args == (513,)
+
+    with pytest.raises(TypeError):
+        cmddict.decode(struct.pack(">HB", 0x0099, 0))
+
+
+def testCmdDictDecodeStream():
+    cmddict = cmd.CmdDict(CMDDICT_TEST)
+    cmds = [
+        ("SEQ_ENABLE_DISABLE", 1234, "ENABLED"),
+        ("SEQ_SET_DELAY", 513),
+        ("SEQ_ENABLE_DISABLE", 7, "DISABLED"),
+    ]
+    expected = [(c[0], list(c[1:])) for c in cmds]
+
+    data = cmddict.encode_many(cmds, pad=0, contiguous=True)
+    assert list(cmddict.decode_stream(data, create=False)) == expected
+    view = memoryview(bytes(data))
+    assert list(cmddict.decode_stream(view, 6, create=False)) == expected[1:]
+
+    decoded = list(cmddict.decode_stream(data))
+    assert [(c.name, list(c.args)) for c in decoded] == expected
+
+    names = {"SEQ_SET_DELAY"}
+    decoded = cmddict.decode_stream(data, names=names, create=False)
+    assert list(decoded) == expected[1:2]
+
+    data = cmddict.encode_many(cmds, pad=16, contiguous=True)
+    assert len(data) == 48
+    assert list(cmddict.decode_stream(data, pad=16, create=False)) == expected
+
+    with pytest.raises(ValueError):
+        list(cmddict.decode_stream(data[:-11], pad=16))
+
+    with pytest.raises(TypeError):
+        list(cmddict.decode_stream(struct.pack(">HB", 0x0099, 0)))
+
+
 def testGetDefaultDict():
     cmddict = cmd.getDefaultDict()
 
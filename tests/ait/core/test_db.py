@@ -207,6 +207,13 @@ class TestInfluxDBBackend(unittest.TestCase):
         )
         sqlbackend._conn.reset_mock()
 
+        # Insert several packets with a single write
+        sqlbackend.insert_many([pkt, pkt])
+        assert sqlbackend._conn.write_points.call_count == 1
+        points = sqlbackend._conn.write_points.call_args[0][0]
+        assert len(points) == 2
+        assert all(p["measurement"] == "Packet1" and "time" not in p for p in points)
+
         os.remove(self.test_yaml_file)
 
     @mock.patch("importlib.import_module")
@@ -665,6 +672,13 @@ class TestSQLiteBackend(unittest.TestCase):
         )
         assert (now.strftime(dmc.RFC3339_Format) == sqlbackend._conn.execute.call_args[0][1][1])
 
+        sqlbackend._conn.reset_mock()
+
+        # Test inserting several packets in one transaction
+        sqlbackend.insert_many([pkt, pkt])
+        assert sqlbackend._conn.execute.call_count == 2
+        assert sqlbackend._conn.commit.call_count == 1
+
         os.remove(self.test_yaml_file)
 
     def test_sqlite_query_calldown(self):
@@ -22,7 +22,7 @@ import struct
 
 import pytest
 
-from ait.core import dtype
+from ait.core import dmc, dtype
 
 
 def fpeq(p, q, eps=1e-6):
@@ -156,6 +156,8 @@ def testTIME32():
     assert dt.decode(rawdata) == date
     assert dt.decode(rawdata, raw=True) == sec
     assert dt.encode(date) == rawdata
+    assert dt.unpack_gps(rawdata) == float(sec)
+    assert dt.unpack_gps(b"\x00" + rawdata, 1, ns=True) == sec * 10**9
 
 
 def testTIME40():
@@ -173,6 +175,9 @@ def testTIME40():
     assert dt.decode(rawdata) == expected
     assert dt.decode(rawdata, raw=True) == sec + (fine / 256.0)
     assert dt.encode(expected) == rawdata
+    assert dt.unpack_gps(rawdata) == sec + (fine / 256.0)
+    assert dt.unpack_gps(rawdata, ns=True) == sec * 10**9 + 31250000
+    assert dt.unpack_gps(rawdata, ns=True) == dmc.to_gps_ns(expected)
 
 
 def testTIME64():
@@ -188,6 +193,9 @@ def testTIME64():
     assert dt.decode(rawdata) == date
     assert dt.decode(rawdata, raw=True) == sec + (nsec / 1e9)
     assert dt.encode(date) == rawdata
+    assert dt.unpack_gps(rawdata) == sec + (nsec / 1e9)
+    assert dt.unpack_gps(rawdata, ns=True) == sec * 10**9 + nsec
+    assert dt.unpack_gps(rawdata, ns=True) == dmc.to_gps_ns(date)
 
 
 def testgetdtype():
@@ -248,3 +256,88 @@ def testString():
 
     enc_ba = dt.encode("on-your-left")
     assert enc_ba
+
+
+def testArrayTypeBulk():
+    array = dtype.ArrayType("LSB_I16", 256)
+    values = list(range(-128, 128))
+    data = struct.pack("<256h", *values)
+
+    assert array.encode(*values) == data
+    assert array.encode(*[float(v) for v in values]) == data
+    assert array.decode(data) == values
+    assert array.decode(data, slice(10, 20)) == values[10:20]
+    assert array.decode(data, slice(10, 20, 3)) == values[10:20:3]
+    assert array.decode(data, slice(-2, None)) == values[-2:]
+    assert array.decode(memoryview(data)) == values
+    assert array.decode(data, container="array").tolist() == values
+    assert array.decode(data, container="array").typecode == "h"
+
+    with pytest.raises(IndexError):
+        array.decode(data[:-1])
+
+    with pytest.raises(ValueError):
+        array.decode(data, container="foo")
+
+    with pytest.raises(TypeError):
+        dtype.ArrayType("TIME8", 2).decode(b"\x00\x00", container="array")
+
+
+def testArrayTypeBulkNumPy():
+    numpy = pytest.importorskip("numpy")
+
+    array = dtype.ArrayType("MSB_U32", 4)
+    data = bytearray(struct.pack(">4I", 1, 2, 3, 4))
+    values = array.decode(data, container="numpy")
+
+    assert isinstance(values, numpy.ndarray)
+    assert values.tolist() == [1, 2, 3, 4]
+
+    data[0:4] = struct.pack(">I", 5)
+    assert values[0] == 1
+
+    times = dtype.ArrayType("TIME8", 2).decode(b"\x40\x80", container="numpy")
+    assert times.tolist() == [0.25, 0.5]
+
+
+def testPrimitiveTypePackUnpack():
+    import pickle
+
+    t = dtype.get("MSB_U16")
+    buffer = bytearray(6)
+
+    t.pack_into(buffer, 2, 0x1234)
+    assert buffer == b"\x00\x00\x12\x34\x00\x00"
+    assert t.unpack_from(buffer, 2) == 0x1234
+    assert t.unpack_from(memoryview(bytes(buffer)), 1) == 0x0012
+
+    dtype.get("I8").pack_into(buffer, 0, -1.0)
+    assert buffer[0] == 0xFF
+
+    dtype.get("S3").pack_into(buffer, 3, "ab")
+    assert buffer[3:] == b"ab\x00"
+    assert dtype.get("S3").unpack_from(buffer, 3) == b"ab\x00"
+
+    # ComplexTypes encode and decode through encode() and decode().
+    time8 = dtype.get("TIME8")
+    time8.pack_into(buffer, 5, 0.5)
+    assert buffer[5] == 128
+    assert time8.unpack_from(buffer, 5) == 0.5
+    assert time8.unpack_from(buffer, 5, raw=True) == 128
+
+    copy = pickle.loads(pickle.dumps(t))
+    assert copy == t
+    assert copy.decode(b"\x00\x07") == 7
+
+
+def testPrimitiveTypeNoFormat():
+    import pickle
+
+    # Types without a struct format fail on use, not creation.
+    t = dtype.PrimitiveType("MSB_U24")
+    assert t.format is None
+    assert t.nbytes == 3
+    assert pickle.loads(pickle.dumps(t)) == t
+
+    with pytest.raises(AttributeError):
+        t.encode(1)
@@ -20,6 +20,8 @@ import time
 
 from unittest import mock
 
+import pytest
+
 from gevent import monkey
 
 from ait.core import dmc, pcap
@@ -57,6 +59,10 @@ def testPCapPacketHeader():
     assert header.orig_len == 0
     assert header.pack() == header._data
 
+    header.ts_sec, header.ts_usec = 86400, 1
+    assert header.ts_ns == 86400000001000
+    assert header.ts_ns == dmc.to_unix_ns(header.timestamp)
+
 
 def testReadBigEndian():
     bytes = b"Hello World!"
@@ -177,6 +183,117 @@ def testWriteRead():
     os.unlink(TmpFilename)
 
 
+def testReadMmap():
+    packets = b"When a packet hits a pocket on a socket on a port.".split()
+
+    with pcap.open(TmpFilename, "w") as stream:
+        for p in packets:
+            stream.write(p)
+
+    with pcap.open(TmpFilename, "r") as stream:
+        expected = [(header.pack(), packet) for header, packet in stream]
+
+    with pcap.open(TmpFilename, "r", mmap=True) as stream:
+        assert isinstance(stream, pcap.PCapMmapStream)
+        assert stream.header.magic_number == 0xA1B2C3D4
+        assert stream.header.network == 147
+
+        header, packet = stream[3]
+        assert (header.pack(), packet) == expected[3]
+        assert isinstance(packet, memoryview)
+        assert stream[-1][1] == packets[-1]
+
+        actual = [(header.pack(), packet) for header, packet in stream]
+        assert actual == expected
+        assert len(stream) == len(packets)
+
+        header, packet = stream.read()
+        assert header.incomplete()
+        assert packet is None
+
+        stream.seek(2)
+        assert stream.tell() == 2
+        assert stream.read()[1] == packets[2]
+
+        with pytest.raises(IndexError):
+            stream[len(packets)]
+
+    # A truncated final packet ends the stream
+    with open(TmpFilename, "rb+") as stream:
+        stream.truncate(os.path.getsize(TmpFilename) - 1)
+
+    with pcap.open(TmpFilename, "r", mmap=True) as stream:
+        assert len(stream) == len(packets) - 1
+        assert [packet for _, packet in stream] == packets[:-1]
+
+    os.unlink(TmpFilename)
+
+
+def testReadMmapEmpty():
+    with open(TmpFilename, "wb"):
+        pass
+
+    with pcap.open(TmpFilename, "r", mmap=True) as stream:
+        assert len(stream) == 0
+        assert stream.read()[1] is None
+
+    os.unlink(TmpFilename)
+
+
+def testWriteBuffered():
+    packets = b"When a packet hits a pocket on a socket on a port.".split()
+
+    def written():
+        # Packet bytes written, excluding the global header
+        return max(os.path.getsize(TmpFilename) - 24, 0)
+
+    with pcap.open(TmpFilename, "w", buffered=True, flush_npackets=3) as stream:
+        stream.write(packets[0])
+        stream.write(packets[1])
+        assert written() == 0
+
+        stream.write(packets[2])
+        assert written() == sum(16 + len(p) for p in packets[:3])
+
+        assert stream.write_many(packets[3:5]) == len(packets[3]) + len(packets[4])
+        assert written() == sum(16 + len(p) for p in packets[:3])
+
+        stream.flush()
+        assert written() == sum(16 + len(p) for p in packets[:5])
+
+        stream.write_many(packets[5:])
+
+    with pcap.open(TmpFilename, "r") as stream:
+        assert [packet for _, packet in stream] == packets
+
+    with pcap.open(TmpFilename, "w", buffered=True, flush_nseconds=0) as stream:
+        stream.write(packets[0])
+        assert written() == 16 + len(packets[0])
+
+    os.unlink(TmpFilename)
+
+
+def testWriteMany():
+    packets = b"When a packet hits a pocket on a socket on a port.".split()
+    headers = [pcap.PCapPacketHeader(orig_len=len(p)) for p in packets]
+
+    with pcap.open(TmpFilename, "w") as stream:
+        for packet, header in zip(packets, headers):
+            stream.write(packet, header)
+
+    with open(TmpFilename, "rb") as stream:
+        expected = stream.read()
+
+    with pcap.open(TmpFilename, "w") as stream:
+        nbytes = stream.write_many(zip(packets, headers))
+        assert nbytes == sum(len(p) for p in packets)
+
+    with open(TmpFilename, "rb") as stream:
+        assert stream.read() == expected
+
+    os.unlink(TmpFilename)
+
+
 def testPCapPacketHeaderInit():
     header = pcap.PCapPacketHeader()
     assert header._format == "IIII"
@@ -286,8 +403,10 @@ def testTimes():
 
     times = pcap.times(TmpFilename, 2)
     assert len(times[TmpFilename]) == 2
+    assert pcap.times(TmpFilename, 2, index=False) == times
 
     os.remove(TmpFilename)
+    os.remove(TmpFilename + pcap.PCapIndex.Suffix)
 
 
 def testQuery():
@@ -312,3 +431,212 @@ def testQuery():
 
     os.remove(TmpRes)
     os.remove(TmpFilename)
+    os.remove(TmpFilename + pcap.PCapIndex.Suffix)
+
+
+def writeTimedPackets(filename, times):
+    """Writes a packet for each of the given (ts_sec, ts_usec) times to
+    the given pcap file and returns the packets.
+    """
+    packets = []
+
+    with pcap.open(filename, "w") as stream:
+        for n, (ts_sec, ts_usec) in enumerate(times):
+            packet = b"packet %d" % n
+            header = pcap.PCapPacketHeader(orig_len=len(packet))
+            header.ts_sec, header.ts_usec = ts_sec, ts_usec
+            stream.write(packet, header)
+            packets.append(packet)
+
+    return packets
+
+
+def testPCapIndex():
+    times = [(100, 0), (100, 500000), (101, 0), (105, 0), (105, 1), (110, 0), (111, 0)]
+    writeTimedPackets(TmpFilename, times)
+
+    index = pcap.PCapIndex.build(TmpFilename, interval=2)
+    assert index.npackets == 7
+    assert index.sorted
+    assert index.first_ns == index.min_ns == 100 * 10**9
+    assert index.last_ns == index.max_ns == 111 * 10**9
+    assert list(index.sample_ns) == [
+        100 * 10**9,
+        101 * 10**9,
+        105000001000,
+        111 * 10**9,
+    ]
+    assert list(index.sample_offsets) == [24 + n * 24 for n in (0, 2, 4, 6)]
+    assert index.ranges(2 * 10**9) == [
+        (100 * 10**9, 101 * 10**9),
+        (105 * 10**9, 105000001000),
+        (110 * 10**9, 111 * 10**9),
+    ]
+    assert index.ranges(10 * 10**9) == [(100 * 10**9, 111 * 10**9)]
+
+    with pytest.raises(ValueError):
+        index.ranges(10**8)
+
+    assert index.offset(99 * 10**9) == 24
+    assert index.offset(105 * 10**9) == 24 + 2 * 24
+    assert index.offset(106 * 10**9) == 24 + 4 * 24
+    assert index.overlaps(None, 100 * 10**9)
+    assert not index.overlaps(112 * 10**9, None)
+
+    assert pcap.PCapIndex.load(TmpFilename) is None
+    index.save()
+    loaded = pcap.PCapIndex.load(TmpFilename)
+    assert vars(loaded) == vars(index)
+    assert vars(pcap.get_index(TmpFilename, build=False)) == vars(index)
+
+    # Rewriting the pcap file invalidates its index
+    writeTimedPackets(TmpFilename, times[:3])
+    assert pcap.PCapIndex.load(TmpFilename) is None
+    assert pcap.get_index(TmpFilename, build=False) is None
+    assert pcap.get_index(TmpFilename).npackets == 3
+    assert pcap.PCapIndex.load(TmpFilename).npackets == 3
+
+    os.remove(TmpFilename)
+    os.remove(TmpFilename + pcap.PCapIndex.Suffix)
+
+
+def testPackets():
+    times = [(100, 0), (101, 0), (102, 0), (103, 0), (104, 0), (105, 0)]
+
+    for order in (times, times[3:] + times[:3]):
+        packets = writeTimedPackets(TmpFilename, order)
+        pcap.PCapIndex.Interval, interval = 2, pcap.PCapIndex.Interval
+
+        try:
+            for start, end in (
+                (None, None),
+                (101, 103),
+                (99, 100),
+                (105, None),
+                (106, 107),
+            ):
+                start_ns = start and start * 10**9
+                end_ns = end and end * 10**9
+                expected = [
+                    p
+                    for p, (ts_sec, _) in zip(packets, order)
+                    if (start is None or ts_sec >= start)
+                    and (end is None or ts_sec <= end)
+                ]
+                for index in (True, False):
+                    actual = pcap.packets(TmpFilename, start_ns, end_ns, index)
+                    assert [bytes(p) for _, p in actual] == expected
+        finally:
+            pcap.PCapIndex.Interval = interval
+
+        assert pcap.PCapIndex.load(TmpFilename).sorted == (order == times)
+        os.remove(TmpFilename + pcap.PCapIndex.Suffix)
+
+    os.remove(TmpFilename)
+
+
+def testGetIndexUnwritable(tmpdir):
+    filename = str(tmpdir.join("test.pcap"))
+    times = [(100, 0), (101, 0), (102, 0)]
+    packets = writeTimedPackets(filename, times)
+
+    # Files are scanned instead when their index cannot be saved.
+    with mock.patch("os.access", return_value=False):
+        assert pcap.get_index(filename) is None
+
+    with mock.patch.object(pcap.PCapIndex, "save", side_effect=OSError):
+        assert pcap.get_index(filename) is None
+        actual = pcap.packets(filename, 101 * 10**9, None)
+        assert [bytes(p) for _, p in actual] == packets[1:]
+        assert pcap.times(filename, 2) == pcap.times(filename, 2, index=False)
+
+    assert os.listdir(str(tmpdir)) == ["test.pcap"]
+
+    index = pcap.PCapIndex.build(filename)
+    with mock.patch("os.replace", side_effect=OSError):
+        with pytest.raises(OSError):
+            index.save()
+
+    assert os.listdir(str(tmpdir)) == ["test.pcap"]
+
+
+def testSegmentIndex(tmpdir):
+    times = [(3600 * n, 0) for n in range(4)]
+    writeTimedPackets(TmpFilename, times)
+
+    format = str(tmpdir.join("%H.pcap"))
+    pcap.segment(TmpFilename, format, npackets=2, index=True)
+
+    for name in ("00.pcap", "02.pcap"):
+        filename = str(tmpdir.join(name))
+        index = pcap.PCapIndex.load(filename)
+        assert index is not None
+        assert vars(index) == vars(pcap.PCapIndex.build(filename))
+
+    os.remove(TmpFilename)
+
+
+def testMergeIters():
+    def source(*keys):
+        return keys[0], lambda: [(key, (key, len(keys))) for key in keys]
+
+    sources = [source(1, 4, 6), source(2, 3), source(5), source(1, 9)]
+    merged = list(pcap.merge_iters(sources))
+    assert [key for key, _ in merged] == [1, 1, 2, 3, 4, 5, 6, 9]
+    assert merged[:2] == [(1, 3), (1, 2)]
+    assert list(pcap.merge_iters([])) == []
+
+
+def testQueryJobs(tmpdir):
+    filenames = [str(tmpdir.join("%d.pcap" % n)) for n in range(3)]
+    writeTimedPackets(filenames[0], [(100, 0), (103, 0), (106, 0)])
+    writeTimedPackets(filenames[1], [(101, 0), (104, 0)])
+    writeTimedPackets(filenames[2], [(108, 0), (200, 0)])
+
+    start = datetime.datetime.utcfromtimestamp(101)
+    end = datetime.datetime.utcfromtimestamp(110)
+    output = str(tmpdir.join("output.pcap"))
+
+    for jobs, expected in (
+        (1, [103, 106, 101, 104, 108]),
+        (2, [101, 103, 104, 106, 108]),
+    ):
+        pcap.query(start, end, output, *filenames, jobs=jobs)
+
+        with pcap.open(output, "r") as stream:
+            assert [header.ts_sec for header, _ in stream] == expected
+
+    # Temporary files are removed
+    assert len(os.listdir(str(tmpdir))) == 2 * len(filenames) + 1
+
+    times = pcap.times(filenames, jobs=2)
+    assert times == pcap.times(filenames)
+    assert list(times.keys()) == filenames
+
+
+def testMerge(tmpdir):
+    filenames = [str(tmpdir.join("%d.pcap" % n)) for n in range(3)]
+    writeTimedPackets(filenames[0], [(100, 0), (102, 0)])
+    writeTimedPackets(filenames[1], [(100, 200000), (101, 0), (102, 200000)])
+    writeTimedPackets(filenames[2], [])
+    output = str(tmpdir.join("output.pcap"))
+
+    def merged(**kwargs):
+        pcap.merge(filenames, output, **kwargs)
+        with pcap.open(output, "r") as stream:
+            return [(header.ts_sec, header.ts_usec, p) for header, p in stream]
+
+    assert merged() == [
+        (100, 0, b"packet 0"),
+        (100, 200000, b"packet 0"),
+        (101, 0, b"packet 1"),
+        (102, 0, b"packet 1"),
+        (102, 200000, b"packet 2"),
+    ]
+    assert merged(dedupe=0.1) == merged()
+    assert merged(dedupe=True) == [
+        (100, 0, b"packet 0"),
+        (101, 0, b"packet 1"),
+        (102, 200000, b"packet 2"),
+    ]
+    assert pcap.merge(filenames[2], output) == 0
@@ -17,8 +17,10 @@ import csv
 import os
 import pytest
 import struct
+from unittest import mock
 
 from gevent import monkey
+
 monkey.patch_all()
 
 from ait.core import tlm
@@ -526,3 +528,682 @@ def testSingleItemList():
     assert defn.fieldmap["foo"].nbytes == 1
     assert defn.fieldmap["bar"].bytes == 1
     assert defn.fieldmap["baz"].bytes == [9, 10]
+
+
+def testPacketDecoder():
+    """
+    # This test will use the following TLM dictionary definitions:
+
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+          mask: 0x0FF0
+        - !Field
+          name: B
+          type: U8
+          enum:
+            1: ONE
+            2: TWO
+        - !Field
+          name: C
+          type: LSB_U16
+          dntoeu:
+            equation: raw.C * 2
+            units: none
+        - !Field
+          name: D
+          type: MSB_U16[2]
+        - !Field
+          name: E
+          type: TIME32
+      derivations:
+        - !Derivation
+          name: F
+          equation: A + C
+          type: MSB_U16
+    """
+    defn = tlm.TlmDict(testPacketDecoder.__doc__)["P"]
+    data = struct.pack(">HB", 0x1234, 2) + struct.pack("<H", 5)
+    data += struct.pack(">HHI", 7, 8, 0)
+    packet = tlm.Packet(defn, data)
+    decoder = defn.decoder
+
+    assert defn.decoder is decoder
+    assert decoder["A"].struct is not None
+    assert decoder["D"].struct is None
+    assert decoder["E"].struct is None
+
+    for fd in defn.fields:
+        assert decoder[fd.name].decode(packet._data) == fd.decode(packet._data)
+        assert decoder[fd.name].decode(packet._data, raw=True) == fd.decode(
+            packet._data, raw=True
+        )
+
+    assert packet.A == 0x23
+    assert packet.B == "TWO"
+    assert packet.raw.B == 2
+    assert packet.C == 10
+    assert packet.raw.C == 5
+    assert packet.D == [7, 8]
+    assert packet.F == 0x23 + 10
+    assert packet.toJSON()["B"] == "TWO"
+
+    with pytest.raises(AttributeError):
+        packet.G
+
+
+class ReversedFieldDefinition(tlm.FieldDefinition):
+    """A FieldDefinition extension that decodes bytes in reverse."""
+
+    __slots__ = []
+
+    def decode(self, data, raw=False, index=None):
+        return super().decode(bytes(data)[::-1], raw, index)
+
+
+def testPacketDecoderExtension():
+    fields = [
+        ReversedFieldDefinition(name="A", type="MSB_U16", bytes=[0, 1]),
+        tlm.FieldDefinition(name="B", type="MSB_U16", bytes=[0, 1]),
+    ]
+    defn = tlm.PacketDefinition(name="P", fields=fields)
+    packet = tlm.Packet(defn, struct.pack(">H", 0x1234))
+
+    assert defn.decoder["A"].override
+    assert defn.decoder["A"].struct is None
+    assert not defn.decoder["B"].override
+
+    assert packet.A == 0x3412
+    assert packet.raw.A == 0x3412
+    assert packet.B == 0x1234
+    assert packet.decode_all() == {"A": 0x3412, "B": 0x1234}
+
+    pytest.importorskip("numpy")
+    columns = tlm.PacketColumnDecoder(defn).decode([packet._data])
+    assert list(columns["A"]) == [0x3412]
+
+
+def testPacketDecoderPickle():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+    """
+    import pickle
+
+    defn = tlm.TlmDict(testPacketDecoderPickle.__doc__)["P"]
+    assert defn.decoder is not None
+
+    defn = pickle.loads(pickle.dumps(defn))
+    assert tlm.Packet(defn, struct.pack(">H", 42)).A == 42
+
+
+def testDecodeAll():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: U8
+          mask: 0xF0
+        - !Field
+          name: B
+          type: U8
+          bytes: '@prev'
+          mask: 0x0F
+        - !Field
+          name: C
+          type: MSB_U16
+          enum:
+            1: ONE
+        - !Field
+          name: D
+          type: MSB_U16
+          dntoeu:
+            equation: raw.D / 2.0
+            units: none
+        - !Field
+          name: E
+          type: MSB_U16[2]
+        - !Field
+          name: F
+          type: U8
+          when: A == 1
+        - !Field
+          name: G
+          type: LSB_U16
+      derivations:
+        - !Derivation
+          name: H
+          equation: raw.C + G
+          type: MSB_U16
+    """
+    defn = tlm.TlmDict(testDecodeAll.__doc__)["P"]
+    data = struct.pack(">BHHHHB", 0x12, 1, 9, 3, 4, 7) + struct.pack("<H", 300)
+    packet = tlm.Packet(defn, data)
+
+    # Bit fields sharing byte 0 and the LSB field are decoded individually.
+    bulk = [fd.name for fd in defn.decoder._bulkfields]
+    assert bulk == ["A", "C", "D"]
+
+    eu = packet.decode_all()
+    assert eu == {name: getattr(packet, name) for name in defn.fieldmap}
+    assert eu["C"] == "ONE"
+    assert eu["D"] == 4.5
+    assert eu["F"] == 7
+    assert eu["G"] == 300
+
+    raw = packet.decode_all(values="raw")
+    assert raw == {name: getattr(packet.raw, name) for name in defn.fieldmap}
+    assert raw["C"] == 1
+
+    both = packet.decode_all(values="both", derivations=True)
+    assert both["D"] == (9, 4.5)
+    assert both["H"] == (301, 301)
+
+    assert packet.decode_all(astuple=True)[:4] == (1, 2, "ONE", 4.5)
+    assert defn.decode_all(data, values="raw") == raw
+
+    with pytest.raises(ValueError):
+        packet.decode_all(values="dn")
+
+
+def testPacketColumnDecoder():
+    """
+    - !Packet
+      name: P
+      functions:
+        Half(dn): dn / 2.0
+      fields:
+        - !Field
+          name: A
+          type: U8
+          mask: 0xF0
+        - !Field
+          name: B
+          type: U8
+          bytes: '@prev'
+          mask: 0x0F
+          enum:
+            1: ONE
+        - !Field
+          name: C
+          type: MSB_U16
+          dntoeu:
+            equation: Half(raw.C)
+            units: none
+        - !Field
+          name: D
+          type: LSB_U16[2]
+        - !Field
+          name: T
+          type: TIME64
+        - !Field
+          name: E
+          type: U8
+          when: A == 1
+        - !Field
+          name: Z
+          type: MSB_U16
+          dntoeu:
+            equation: 10 / raw.Z
+            units: none
+      derivations:
+        - !Derivation
+          name: S
+          equation: raw.A + C
+          type: MSB_U16
+    """
+    import datetime
+
+    np = pytest.importorskip("numpy")
+
+    defn = tlm.TlmDict(testPacketColumnDecoder.__doc__)["P"]
+    packets = []
+
+    for n in range(4):
+        data = struct.pack(">BH", 0x10 * (n % 2) + 1, 10 + n)
+        data += struct.pack("<HH", n, 2 * n)
+        data += struct.pack(">IIBH", 1000 + n, 500000000, n, n)
+        packets.append(data)
+
+    decoder = tlm.PacketColumnDecoder(defn)
+    assert decoder.dtype.itemsize == defn.nbytes
+    assert "D" in decoder.dtype.names
+
+    eu = decoder.decode(packets, derivations=True)
+    raw = decoder.decode(b"".join(packets), raw=True, derivations=True)
+
+    assert list(eu["C"]) == [5.0, 5.5, 6.0, 6.5]
+    assert list(eu["E"]) == [None, 1, None, 3]
+    assert eu["T"].dtype == np.dtype("datetime64[us]")
+    assert raw["D"].shape == (4, 2)
+
+    for n, data in enumerate(packets):
+        packet = tlm.Packet(defn, data)
+
+        for name in list(defn.fieldmap) + ["S"]:
+            value, rawvalue = eu[name][n], raw[name][n]
+
+            if isinstance(value, np.datetime64):
+                value = value.astype(datetime.datetime)
+            elif isinstance(value, np.ndarray):
+                value, rawvalue = list(value), list(rawvalue)
+
+            assert value == getattr(packet, name)
+            assert rawvalue == getattr(packet.raw, name)
+
+    with pytest.raises(ValueError):
+        decoder.decode(b"".join(packets)[:-1])
+
+
+def testPacketColumnDecoderUnsigned():
+    """
+    - !Packet
+      name: P
+      functions:
+        CurrA_Fx(dn): (dn - 2) / 1234.0
+        Difference(x,y): x - y
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+        - !Field
+          name: B
+          type: MSB_U16
+        - !Field
+          name: C
+          type: U8
+          dntoeu:
+            equation: CurrA_Fx(raw.C)
+            units: amperes
+        - !Field
+          name: Q
+          type: MSB_U64
+          dntoeu:
+            equation: raw.Q * 2 - 1
+            units: none
+        - !Field
+          name: T40
+          type: TIME40
+        - !Field
+          name: T64
+          type: TIME64
+      derivations:
+        - !Derivation
+          name: Diff
+          equation: Difference(A, B)
+          type: MSB_U16
+    """
+    import datetime
+
+    pytest.importorskip("numpy")
+
+    defn = tlm.TlmDict(testPacketColumnDecoderUnsigned.__doc__)["P"]
+    packets = [
+        struct.pack(">HHBQ", 1, 2, 0, 2**63),
+        struct.pack(">HHBQ", 5, 3, 1, 0),
+        struct.pack(">HHBQ", 0, 65535, 4, 1),
+    ]
+
+    # GPS seconds of 2024-01-01 12:00:00 overflow uint32 microseconds
+    for n, data in enumerate(packets):
+        sec = 1388145618 + n
+        packets[n] = data + struct.pack(">IBII", sec, 128, sec, 250000000)
+
+    eu = tlm.PacketColumnDecoder(defn).decode(packets, derivations=True)
+
+    assert list(eu["Diff"]) == [-1, 2, -65535]
+    assert list(eu["C"]) == [-2 / 1234.0, -1 / 1234.0, 2 / 1234.0]
+    assert list(eu["Q"]) == [2**64 - 1, -1, 1]
+
+    for n, data in enumerate(packets):
+        packet = tlm.Packet(defn, data)
+
+        for name in ("C", "Q", "Diff"):
+            assert eu[name][n] == getattr(packet, name)
+
+        for name in ("T40", "T64"):
+            value = eu[name][n].astype(datetime.datetime)
+            assert value == getattr(packet, name)
+            assert value.year == 2024
+
+
+def testPacketExpressionBind():
+    """
+    - !Packet
+      name: P
+      constants:
+        Scale: 3
+      history:
+        - A
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+        - !Field
+          name: B
+          type: MSB_U16
+          dntoeu:
+            equation: raw.B * Scale
+            units: none
+            when: A > 0
+      derivations:
+        - !Derivation
+          name: Ratio
+          equation: 10 / A
+          type: MSB_F32
+        - !Derivation
+          name: Sum
+          equation: sum([A for A in (B, 1)]) + history.A
+          type: MSB_U16
+    """
+    import pickle
+
+    defn = tlm.TlmDict(testPacketExpressionBind.__doc__)["P"]
+    packet = tlm.Packet(defn, struct.pack(">HH", 2, 5))
+    expr = defn.derivationmap["Ratio"].equation
+
+    assert defn in expr._funcs
+    assert packet.B == 15
+    assert packet.Ratio == 5.0
+    assert packet.Sum == 15 + 1 + 2
+
+    packet = tlm.Packet(defn, struct.pack(">HH", 0, 5))
+    assert packet.B is None
+    assert packet.Ratio is None
+
+    expr = pickle.loads(pickle.dumps(expr))
+    assert expr._funcs == {}
+    assert expr.eval(tlm.Packet(defn, struct.pack(">HH", 4, 5))) == 2.5
+
+
+def testPacketExpressionShared():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+    - !Packet
+      name: Q
+      fields:
+        - !Field
+          name: B
+          type: U8
+        - !Field
+          name: A
+          type: MSB_U16
+    """
+    tlmdict = tlm.TlmDict(testPacketExpressionShared.__doc__)
+    expr = tlm.PacketExpression("A * 2")
+    p = tlm.Packet(tlmdict["P"], struct.pack(">H", 3))
+    q = tlm.Packet(tlmdict["Q"], struct.pack(">BH", 1, 4))
+
+    assert expr.eval(p) == 6
+    assert expr.eval(q) == 8
+
+    with mock.patch.object(tlm.PacketExpression, "bind") as bind:
+        for n in range(3):
+            assert expr.eval(p) == 6
+            assert expr.eval(q) == 8
+
+    assert not bind.called
+
+
+def testPacketCache():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+        - !Field
+          name: B
+          type: MSB_U16
+          dntoeu:
+            equation: raw.B + A
+            units: none
+    """
+    import pickle
+
+    defn = tlm.TlmDict(testPacketCache.__doc__)["P"]
+    packet = tlm.Packet(defn, struct.pack(">HH", 1, 2), cache=True)
+
+    assert packet.B == 3
+    assert packet._cache == {("A", False): 1, ("B", True): 2, ("B", False): 3}
+
+    packet.A = 10
+    assert packet._cache == {}
+    assert packet.B == 12
+
+    packet._data[0:2] = struct.pack(">H", 20)
+    assert packet._cache == {}
+    assert packet.B == 22
+
+    packet._data.extend(b"\x00")
+    assert packet._cache == {}
+
+    data = pickle.loads(pickle.dumps(packet._data))
+    assert type(data) is bytearray
+    assert data == packet._data
+
+    assert tlm.Packet(defn, struct.pack(">HH", 1, 2))._cache is None
+
+
+def testPacketLayout():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+        - !Field
+          name: B
+          type: U8
+          mask: 0xF0
+        - !Field
+          name: C
+          type: U8
+          bytes: "@prev"
+          mask: 0x0F
+        - !Field
+          name: D
+          type: U8
+          bytes: 4
+    """
+    defn = tlm.TlmDict(testPacketLayout.__doc__)["P"]
+    layout = defn.layout
+
+    assert defn.layout is layout
+    assert defn.decoder.layout is layout
+    assert len(layout) == defn.nbytes == 5
+    assert layout["A"] == slice(0, 2)
+    assert layout["C"] == slice(2, 3)
+    assert "D" in layout and "E" not in layout
+    assert layout.occupancy == (("A",), ("A",), ("B", "C"), (), ("D",))
+    assert layout.gaps() == [slice(3, 4)]
+
+    # Changing a field in another packet leaves this one as is.
+    decoder = defn.decoder
+    other = tlm.TlmDict(testPacketLayout.__doc__)["P"]
+    other.fieldmap["D"].bytes = 3
+    assert defn.layout is layout
+    assert defn.decoder is decoder
+
+    # Changing a field's position rebuilds the layout and decoder,
+    # including for existing packets.
+    before = tlm.Packet(defn, bytes(range(6)))
+    assert before.D == 4
+    defn.fieldmap["D"].bytes = 5
+    assert defn.layout is not layout
+    assert defn.nbytes == 6
+    assert defn.decoder.layout is defn.layout
+    assert defn.layout.gaps() == [slice(3, 5)]
+    assert before.D == 5
+    assert before.raw.D == 5
+
+    packet = tlm.Packet(defn)
+    packet.D = 7
+    assert packet._data[5] == 7
+    assert packet.D == 7
+
+    # So does reassigning fields.
+    layout = defn.layout
+    defn.fields = defn.fields[:1]
+    assert defn.layout is not layout
+    assert defn.nbytes == 2
+    assert "B" not in defn.decoder
+
+
+def testPacketReadOnlyData():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+        - !Field
+          name: B
+          type: U8
+          mask: 0x0F
+        - !Field
+          name: C
+          type: U8[2]
+        - !Field
+          name: T
+          type: TIME32
+    """
+    defn = tlm.TlmDict(testPacketReadOnlyData.__doc__)["P"]
+    frame = bytearray(struct.pack(">HBBBI", 1, 0xF2, 3, 4, 5))
+
+    for data in bytes(frame), memoryview(frame), memoryview(bytes(frame)):
+        for cache in False, True:
+            packet = tlm.Packet(defn, data, cache=cache)
+
+            assert packet.readonly
+            assert packet._data is data
+            assert packet.A == 1
+            assert packet.B == 2
+            assert packet.C == [3, 4]
+            assert packet.raw.T == 5
+
+            packet.B = 7
+            assert not packet.readonly
+            assert packet._data is not data
+            assert packet.B == 7
+            assert packet.raw.B == 7
+            assert packet._data[2] == 0xF7
+            assert data[2] == 0xF2
+
+    data = bytearray(frame)
+    packet = tlm.Packet(defn, data)
+    assert not packet.readonly
+    packet.A = 2
+    assert data[:2] == b"\x00\x02"
+
+
+def testPacketAccessors():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: A
+          type: MSB_U16
+          enum:
+            1: ONE
+        - !Field
+          name: nbytes
+          type: U8
+        - !Field
+          name: C
+          type: U8[2]
+    """
+    import pickle
+
+    defn = tlm.TlmDict(testPacketAccessors.__doc__)["P"]
+    packet = tlm.Packet(defn, struct.pack(">HBBB", 1, 2, 3, 4))
+
+    assert isinstance(packet, tlm.Packet)
+    assert type(packet) is defn.decoder.packet_class
+    assert type(packet) is type(tlm.Packet(defn))
+    assert not hasattr(packet, "__dict__")
+    assert isinstance(type(packet).A, property)
+
+    assert packet.A == "ONE"
+    assert packet.raw.A == 1
+    assert packet.raw is packet.raw
+    assert isinstance(packet.raw, tlm.RawPacket)
+    assert packet.C == [3, 4]
+    assert list(packet.C) == [3, 4]
+    assert type(packet.toJSON()["C"]) is list
+
+    # Packet attributes take precedence over fields of the same name.
+    assert packet.nbytes == 5
+
+    with pytest.raises(AttributeError):
+        packet.D
+
+    copy = pickle.loads(pickle.dumps(packet))
+    assert type(copy) is copy._defn.decoder.packet_class
+    assert copy._data == packet._data
+    assert copy.A == "ONE"
+
+    packet = tlm.Packet(defn, struct.pack(">HBBB", 1, 2, 3, 4), cache=True)
+    assert packet.C is packet.C
+
+
+def testPacketHelperFields():
+    """
+    - !Packet
+      name: P
+      fields:
+        - !Field
+          name: history
+          type: U8
+        - !Field
+          name: readonly
+          type: U8
+        - !Field
+          name: decode_all
+          type: U8
+    """
+    defn = tlm.TlmDict(testPacketHelperFields.__doc__)["P"]
+
+    # Fields take precedence over Packet helpers of the same name.
+    packet = tlm.Packet(defn, [1, 2, 3])
+    assert isinstance(packet._data, bytearray)
+    assert (packet.history, packet.readonly, packet.decode_all) == (1, 2, 3)
+    assert (packet.raw.history, packet.raw.readonly) == (1, 2)
+    assert packet._getattr("history") == 1
+
+
+def testPacketDefinitionCacheSlots():
+    """
+    - !Packet
+      name: P
+      decoder: decoder
+      layout: layout
+      generation: 7
+      fields:
+        - !Field
+          name: A
+          type: U8
+    """
+    defn = tlm.TlmDict(testPacketDefinitionCacheSlots.__doc__)["P"]
+
+    assert isinstance(defn.decoder, tlm.PacketDecoder)
+    assert isinstance(defn.layout, tlm.PacketLayout)
+    assert tlm.Packet(defn, b"\x05").A == 5